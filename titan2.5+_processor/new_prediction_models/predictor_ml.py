@@ -23,6 +23,9 @@ import os
 import sys  # Add this import for sys.exit
 import time
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utilities.nrl_dataset import read_table
+
 print('--- TITAN 2.5+ NRL Prediction Model: Script Started ---')
 
 # ==========================================================
@@ -56,7 +59,8 @@ print('  fixtures_path:', fixtures_path)
 print('  weather_impact_path:', weather_impact_path)
 
 try:
-    matches = pd.read_csv(matches_path)
+    # Parquet dataset, imported from the CSV when that is newer
+    matches = read_table('normalised_matches', source_csv=matches_path)
     print(f'[DEBUG] Loaded matches from {matches_path}, shape: {matches.shape}')
     print(f'[DEBUG] Columns: {matches.columns.tolist()}')
     print(f'[DEBUG] Head:\n{matches.head()}')
@@ -91,7 +95,7 @@ except Exception as e:
     print(f'[ERROR] Failed to load matches: {e}')
     sys.exit()
 try:
-    players = pd.read_csv(players_path)
+    players = read_table('players', source_csv=players_path)
     print(f'[DEBUG] Loaded players from {players_path}, shape: {players.shape}')
     print(f'[DEBUG] Columns: {players.columns.tolist()}')
     print(f'[DEBUG] Head:\n{players.head()}')
@@ -99,7 +103,7 @@ except Exception as e:
     print(f'[ERROR] Failed to load players: {e}')
     players = pd.DataFrame()
 try:
-    detailed_matches = pd.read_csv(detailed_matches_path)
+    detailed_matches = read_table('detailed_matches', source_csv=detailed_matches_path)
     print(f'[DEBUG] Loaded detailed_matches from {detailed_matches_path}, shape: {detailed_matches.shape}')
     print(f'[DEBUG] Columns: {detailed_matches.columns.tolist()}')
     print(f'[DEBUG] Head:\n{detailed_matches.head()}')
@@ -264,17 +264,14 @@ try:
 
     # Step 5: Flatten Data
     if current_stage >= start_stage and prompt_step("Flatten Data") == "y":
-        flatten_script = os.path.join(os.path.dirname(base_dir), "flatten_nrl_data.py")
-        flatten_player_stats_script = os.path.join(base_dir, "flatten_player_stats.py")
-        # Run match flattening
-        print_info(f"[INFO] Running: {sys.executable} {flatten_script}")
-        time_step("Flatten Match Data", subprocess.run, [sys.executable, flatten_script], check=True)
-        # Run player stats flattening (ensures player_stats_2025.csv is created in the correct location)
-        print_info(f"[INFO] Running: {sys.executable} {flatten_player_stats_script}")
-        time_step("Flatten Player Stats", subprocess.run, [sys.executable, flatten_player_stats_script], check=True)
+        # Match, detailed match and player tables for every year, one pass per season file
+        flatten_script = os.path.join(base_dir, "utilities", "flatten_all.py")
+        cmd = [sys.executable, flatten_script, "--years", "2019-2025", "--type", COMP_TYPE]
+        print_info(f"[INFO] Running: {' '.join(cmd)}")
+        time_step("Flatten Data", subprocess.run, cmd, check=True)
         # Debug output files
-        debug_file_info(os.path.join(base_dir, 'titan2.5+_processor', 'outputs', 'all_matches_2019_2025.csv'))
-        debug_file_info(os.path.join(base_dir, 'titan2.5+_processor', 'outputs', 'player_stats_2025.csv'))
+        debug_file_info(os.path.join(base_dir, 'outputs', 'all_matches_2019_2025.csv'))
+        debug_file_info(os.path.join(base_dir, 'outputs', 'all_players_2019_2025.csv'))
         print(Fore.MAGENTA + "\n🏉-------------------🏉\n" + Style.RESET_ALL)
         print(Fore.GREEN + "✅ Step 5 complete! Moving to Step 6..." + Style.RESET_ALL)
     elif current_stage >= start_stage and prompt_step("Flatten Data") == "exit":
@@ -7,16 +7,50 @@ for a given year and saving them as JSON files.
 Requires:
     - requests
     - BeautifulSoup from bs4
+    - aiohttp (optional, for the concurrent ``--async`` mode)
+
+Responses go through the shared on-disk HTTP cache, so rounds that are
+already complete are never downloaded twice.
 """
 
 import sys
 import os
-import requests
+import random
+import asyncio
 import json
 from typing import List
+from urllib.parse import urlsplit
+
+from utilities.http_cache import get_cached_session, fixtures_are_final
+from utilities import page_archive
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import ENVIRONMENT_VARIABLES as EV
+
+# Optional: For the async downloader
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
 
 NRL_API_URL = "https://www.nrl.com/draw/data?competition=111&season={year}"
 
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Accept': 'application/json'
+}
+
+MAX_ROUNDS = 31  # NRL has up to 31 rounds (including finals)
+
+# Async mode: requests in flight at once, request starts per second per host,
+# retries for 429/5xx/connection errors and the base backoff in seconds
+DEFAULT_CONCURRENCY = 16
+DEFAULT_RATE_PER_HOST = 8
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF = 1.0
+REQUEST_TIMEOUT = 30
+
 
 class NRLDownloader:
     """
@@ -32,9 +66,11 @@ class NRLDownloader:
         Local directory to store downloaded fixtures
     directory_path : str
         Full path to save files for the given competition and year
+    session : CachedSession
+        Session used for requests (default is the shared on-disk cache)
     """
 
-    def __init__(self, year, comp_type='NRL', base_path=None):
+    def __init__(self, year, comp_type='NRL', base_path=None, session=None):
         """
         Initialize the downloader for a specific year.
 
@@ -46,6 +82,8 @@ class NRLDownloader:
             Competition type (default is 'NRL')
         base_path : str, optional
             Path to save downloaded files (default is titan2.5+_processor/outputs)
+        session : CachedSession, optional
+            Session used for requests (default is the shared on-disk cache)
         """
         if base_path is None:
             # Set default to titan2.5+_processor/outputs
@@ -54,31 +92,69 @@ class NRLDownloader:
         self.comp_type = comp_type
         self.base_path = base_path
         self.directory_path = os.path.join(base_path, comp_type, str(year))
+        self.competition_id = EV.COMPETITION.get(comp_type, '111')
+        self.session = session or get_cached_session()
         os.makedirs(self.directory_path, exist_ok=True)
 
+    def round_url(self, round_num):
+        return f"https://www.nrl.com/draw/data?competition={self.competition_id}&season={self.year}&round={round_num}"
+
+    def _round_fixtures(self, url, data):
+        fixtures = data.get('fixtures', [])
+        if isinstance(fixtures, dict):
+            fixtures = [fixtures]
+        if fixtures_are_final(fixtures) and hasattr(self.session, 'pin'):
+            # A completed round never changes, so keep it out of TTL expiry
+            self.session.pin(url)
+        return fixtures
+
     def fetch_and_save_fixtures(self):
         """
         Fetch the NRL.com API for the specified year,
         and save the fixtures as a JSON file.
         """
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
-            'Accept': 'application/json'
-        }
         all_fixtures = []
-        for round_num in range(1, 32):  # NRL has up to 31 rounds (including finals)
-            url = f"https://www.nrl.com/draw/data?competition=111&season={self.year}&round={round_num}"
+        for round_num in range(1, MAX_ROUNDS + 1):
+            url = self.round_url(round_num)
             print(f"[INFO] Fetching round {round_num} from {url}")
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=HEADERS)
             if response.status_code == 200:
-                data = response.json()
-                fixtures = data.get('fixtures', [])
-                if isinstance(fixtures, dict):
-                    fixtures = [fixtures]
+                fixtures = self._round_fixtures(url, response.json())
                 if fixtures:
                     all_fixtures.extend(fixtures)
             else:
                 print(f"[WARN] Could not fetch round {round_num} (status {response.status_code})")
+        self.save_fixtures(all_fixtures)
+
+    async def fetch_round_async(self, http, semaphore, limiter, round_num, retries=DEFAULT_RETRIES):
+        """
+        Fetch one round with ``aiohttp``, serving fresh rounds from the cache.
+
+        Returns
+        -------
+        list
+            The round's fixtures (empty if the round could not be fetched)
+        """
+        url = self.round_url(round_num)
+        if page_archive.active():
+            # Record/replay goes through the archived session
+            response = await asyncio.to_thread(self.session.get, url, headers=HEADERS)
+            return self._round_fixtures(url, response.json()) if response.status_code == 200 else []
+        cached = self.session.get_fresh(url) if hasattr(self.session, 'get_fresh') else None
+        if cached is not None:
+            return self._round_fixtures(url, cached.json())
+        status, headers, body = await fetch_with_retry(http, semaphore, limiter, url, retries)
+        if status != 200:
+            print(f"[WARN] Could not fetch {self.year} round {round_num} (status {status})")
+            return []
+        if hasattr(self.session, 'put'):
+            self.session.put(url, status, headers, body)
+        return self._round_fixtures(url, json.loads(body))
+
+    def save_fixtures(self, all_fixtures):
+        """
+        Flatten the raw fixtures and save them as ``NRL_fixtures_{year}.json``.
+        """
         print(f"[INFO] Total fixtures found for {self.year}: {len(all_fixtures)}")
         if not all_fixtures:
             print(f"[WARN] No fixtures found for {self.year}. Skipping file save to avoid overwriting existing data.")
@@ -103,13 +179,93 @@ class NRLDownloader:
         print(f"[SUCCESS] Saved fixtures to {output_file}")
 
 
+class HostRateLimiter:
+    """
+    Spaces out request starts so each host sees at most ``rate`` per second.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_PER_HOST):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = {}
+
+    async def wait(self, host):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def fetch_with_retry(http, semaphore, limiter, url, retries=DEFAULT_RETRIES):
+    """
+    GET ``url`` under the global concurrency cap and per-host rate limit.
+
+    429, 5xx and connection errors are retried with jittered exponential backoff.
+
+    Returns
+    -------
+    tuple
+        (status, headers, body); status is None if every attempt failed
+    """
+    host = urlsplit(url).hostname
+    status, headers, body = None, {}, b""
+    for attempt in range(retries + 1):
+        await limiter.wait(host)
+        try:
+            async with semaphore:
+                async with http.get(url, headers=HEADERS) as response:
+                    status, headers, body = response.status, dict(response.headers), await response.read()
+            if status != 429 and status < 500:
+                return status, headers, body
+        except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+            print(f"[WARN] Request failed for {url}: {ex}")
+        if attempt < retries:
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt + random.uniform(0, RETRY_BACKOFF))
+    return status, headers, body
+
+
+async def download_seasons_async(years, comp_types=('NRL',), base_path=None, concurrency=DEFAULT_CONCURRENCY,
+                                 rate_per_host=DEFAULT_RATE_PER_HOST, retries=DEFAULT_RETRIES):
+    """
+    Fetch every round of every requested year and competition concurrently,
+    then save each season exactly as ``fetch_and_save_fixtures`` would.
+    """
+    if not AIOHTTP_AVAILABLE:
+        raise ImportError("aiohttp is required for the async downloader (pip install aiohttp)")
+    downloaders = [NRLDownloader(year, comp_type, base_path) for comp_type in comp_types for year in years]
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = HostRateLimiter(rate_per_host)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+        rounds = await asyncio.gather(*[
+            asyncio.gather(*[d.fetch_round_async(http, semaphore, limiter, round_num, retries)
+                             for round_num in range(1, MAX_ROUNDS + 1)])
+            for d in downloaders
+        ])
+    for downloader, season in zip(downloaders, rounds):
+        print(f"\n=== Saving fixtures for {downloader.comp_type} {downloader.year} ===")
+        # Rounds are concatenated in order so the output matches the serial downloader
+        downloader.save_fixtures([fixture for fixtures in season for fixture in fixtures])
+
+
+def download_seasons(years, comp_types=('NRL',), base_path=None, **kwargs):
+    """Blocking wrapper around ``download_seasons_async``."""
+    asyncio.run(download_seasons_async(years, comp_types, base_path, **kwargs))
+
+
 if __name__ == "__main__":
     import argparse
     from datetime import datetime
     parser = argparse.ArgumentParser(description="Download NRL.com fixtures for a range of years.")
     current_year = datetime.now().year
     parser.add_argument('--years', type=str, required=False, default='2019-2025', help='Year(s) of the fixtures, e.g. 2025 or 2019-2025')
-    parser.add_argument('--type', type=str, default='NRL')
+    parser.add_argument('--type', type=str, default='NRL', help='Competition type(s), e.g. NRL or NRL,NRLW')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Fetch all rounds, years and competitions concurrently')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Maximum requests in flight (async mode)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_PER_HOST, help='Maximum requests per second per host (async mode)')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES, help='Retries per request with backoff (async mode)')
     args = parser.parse_args()
 
     # Parse years argument
@@ -118,8 +274,13 @@ if __name__ == "__main__":
         years = list(range(start, end + 1))
     else:
         years = [int(args.years)]
+    comp_types = [t.strip() for t in args.type.split(',') if t.strip()]
 
-    for year in years:
-        print(f"\n=== Downloading fixtures for {args.type} {year} ===")
-        downloader = NRLDownloader(year, args.type)
-        downloader.fetch_and_save_fixtures()
+    if args.use_async:
+        download_seasons(years, comp_types, concurrency=args.concurrency, rate_per_host=args.rate, retries=args.retries)
+    else:
+        for comp_type in comp_types:
+            for year in years:
+                print(f"\n=== Downloading fixtures for {comp_type} {year} ===")
+                downloader = NRLDownloader(year, comp_type)
+                downloader.fetch_and_save_fixtures()
@@ -2,7 +2,9 @@ import json
 import pandas as pd
 import numpy as np
 from utilities.get_detailed_match_data import get_detailed_nrl_data
-from utilities.set_up_driver import set_up_driver
+from utilities.driver_pool import DriverPool, DEFAULT_RECYCLE_AFTER, discard_driver
+from selenium.common.exceptions import WebDriverException
+from utilities.checkpoint_log import CheckpointLog
 import sys
 
 sys.path.append("..")
@@ -13,12 +15,16 @@ import ENVIRONMENT_VARIABLES as EV
 # SELECT_YEAR = 2024
 # SELECT_ROUND = 1
 
-def match_data_detailed_select(SELECT_YEAR, SELECT_ROUND, SELECTION_TYPE):
-    
+def match_data_detailed_select(SELECT_YEAR, SELECT_ROUND, SELECTION_TYPE, WORKERS=None, RECYCLE_AFTER=DEFAULT_RECYCLE_AFTER, RESUME=False):
+    # WORKERS: number of concurrent headless drivers (default: CPU count)
+    # RECYCLE_AFTER: pages each driver serves before it is restarted
+    # RESUME: skip matches already in the checkpoint log from an interrupted run
+
         
     VARIABLES = ["Year", "Win", "Defense", "Attack", "Margin", "Home", "Versus", "Round"]
     JSON_FILE_PATH = f"../data/{SELECTION_TYPE}/{SELECT_YEAR}/{SELECTION_TYPE}_data_{SELECT_YEAR}.json"
     OUTPUT_FILE_PATH = f"../data/{SELECTION_TYPE}/{SELECT_YEAR}/{SELECTION_TYPE}_detailed_match_data_{SELECT_YEAR}.json"
+    CHECKPOINT_PATH = f"../data/{SELECTION_TYPE}/{SELECT_YEAR}/{SELECTION_TYPE}_detailed_match_data_{SELECT_YEAR}.ndjson"
 
 
     # ============================================
@@ -57,9 +63,11 @@ def match_data_detailed_select(SELECT_YEAR, SELECT_ROUND, SELECTION_TYPE):
     # Create DataFrame with appropriate columns
     df = pd.DataFrame(columns=[f"{team} {variable}" for team in TEAMS for variable in VARIABLES])
 
+    # ** Each completed match is appended to an NDJSON log, compacted into the JSON file at the end **
+    checkpoint = CheckpointLog(CHECKPOINT_PATH, resume=RESUME)
 
     # ** Function to Fetch Data for a Single Match (Using Persistent WebDriver) **
-    def fetch_match_data(driver, game, round_num):
+    def fetch_match_data(driver, game, round_num, order):
         h_team, a_team = game["Home"], game["Away"]
 
         # Try fetching data twice before failing
@@ -72,37 +80,42 @@ def match_data_detailed_select(SELECT_YEAR, SELECT_ROUND, SELECTION_TYPE):
                     driver=driver, nrl_website=WEBSITE  # **Pass persistent WebDriver**
                 )
                 if "match" in game_data:
-                    return {f"{h_team} v {a_team}": game_data}  
+                    checkpoint.append(round_num + 1, order, f"{h_team} v {a_team}", game_data)
+                    return {f"{h_team} v {a_team}": game_data}
+            except WebDriverException as ex:
+                # Crashed browser: retry (and later matches) on a fresh one
+                print(f"Attempt {attempt + 1} failed for {h_team} vs {a_team}: {ex}")
+                discard_driver(driver)
             except Exception as ex:
                 print(f"Attempt {attempt + 1} failed for {h_team} vs {a_team}: {ex}")
 
         return None 
 
 
-    # ** Keep Selenium WebDriver Open **
-    driver = set_up_driver()  # **Initialize WebDriver once**
-    match_json_datas = []
-
-    for round_num in range(SELECT_ROUND):
-        try:
-            round_data = years_arr[SELECT_YEAR][round_num][str(round_num + 1)]
-            round_data_scores = []
-
-            for game in round_data:
-                match_data = fetch_match_data(driver, game, round_num)
-                if match_data:
-                    round_data_scores.append(match_data)
-
-            match_json_datas.append({round_num + 1: round_data_scores})
-
-            # ** Save JSON after each round to avoid losing data **
-            with open(OUTPUT_FILE_PATH, "w") as file:
-                json.dump({f"{SELECTION_TYPE}": match_json_datas}, file, indent=4)
-            print(f"✅ Round {round_num + 1} data saved.")
+    # ** Pool of reusable WebDrivers, matches are fetched in parallel **
+    with DriverPool(size=WORKERS, recycle_after=RECYCLE_AFTER) as pool:
+        # Queue every match up front so workers stay busy across round boundaries
+        round_jobs = []
+        for round_num in range(SELECT_ROUND):
+            try:
+                round_data = years_arr[SELECT_YEAR][round_num][str(round_num + 1)]
+                round_jobs.append((round_num, [
+                    pool.submit(fetch_match_data, game, round_num, order)
+                    for order, game in enumerate(round_data)
+                    if (round_num + 1, f"{game['Home']} v {game['Away']}") not in checkpoint
+                ]))
+            except Exception as ex:
+                print(f"Error processing round {round_num + 1}: {ex}")
 
-        except Exception as ex:
-            print(f"Error processing round {round_num + 1}: {ex}")
+        for round_num, futures in round_jobs:
+            try:
+                for future in futures:
+                    future.result()
+                print(f"✅ Round {round_num + 1} data checkpointed.")
+            except Exception as ex:
+                print(f"Error processing round {round_num + 1}: {ex}")
 
-    # ** Close WebDriver after all rounds are processed **
-    driver.quit()
-    print(f"Final player statistics saved to {OUTPUT_FILE_PATH}")
+    # ** Compact the log into the nested layout the flatteners read, in fixture order **
+    match_json_datas = [{round_number: matches} for round_number, matches in checkpoint.rounds([r + 1 for r, _ in round_jobs])]
+    checkpoint.finalize({OUTPUT_FILE_PATH: {f"{SELECTION_TYPE}": match_json_datas}})
+    print(f"Final detailed match data saved to {OUTPUT_FILE_PATH}")
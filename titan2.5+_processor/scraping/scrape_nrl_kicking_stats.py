@@ -1,5 +1,8 @@
 import os
-import time
+import json
+from urllib.parse import urlsplit, parse_qsl, urlencode, urlunsplit
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -8,57 +11,252 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from utilities.page_archive import open_driver
+from utilities.http_cache import cached_get
+
 # URL for NRL player kicking stats
 URL = "https://www.foxsports.com.au/nrl/nrl-premiership/stats/players?wpa=BB44D82C3D7223D393F2AE47579FB5EA6791ABE4&editiondata=none&fromakamai=true&pt=none&device=DESKTOP&category=kicking&sortBy=attackingKicks"
 
 # Output path
 output_csv = os.path.join(os.path.dirname(__file__), "..", "outputs", "nrl_kicking_stats_2025.csv")
 
-chrome_options = Options()
-chrome_options.add_argument('--headless')
-chrome_options.add_argument('--no-sandbox')
-chrome_options.add_argument('--disable-dev-shm-usage')
+max_pages = 20
+
+# Pages of the stats API fetched at once in capture mode
+FETCH_WORKERS = 8
 
-# Start Selenium WebDriver
-driver = webdriver.Chrome(options=chrome_options)
-driver.get(URL)
+# Query parameters the stats API may use for the page number
+PAGE_PARAMS = ("page", "pageNumber", "pageNo", "p")
 
-all_data = []
-page = 1
-max_pages = 20
+# Keys that may hold the total number of pages in a stats API response
+TOTAL_PAGES_KEYS = ("total_pages", "totalPages", "pages", "page_count", "pageCount")
 
-while page <= max_pages:
-    print(f"[INFO] Scraping page {page} of {max_pages}")
-    time.sleep(2)  # Wait for page to load
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    all_tables = soup.find_all('table')
-    main_table = max(all_tables, key=lambda t: len(t.find_all('tr')), default=None)
-    if main_table:
-        rows = main_table.find_all('tr')
-        headers_row = [th.get_text(strip=True) for th in rows[0].find_all(['th', 'td'])]
-        for row in rows[1:]:
-            cols = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
-            if len(cols) == len(headers_row):
-                all_data.append(cols)
-    else:
-        print(f"[WARN] No main table found on page {page}")
-    # Try to click the next page button
+
+def make_driver():
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    # Network events are read back from the performance log in capture mode
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return open_driver(lambda: webdriver.Chrome(options=chrome_options))
+
+
+# ---------------------------------------------------------------------------
+# Capture mode: read the JSON behind the table, then fetch every page directly
+# ---------------------------------------------------------------------------
+
+def _records(payload):
+    """The largest list of flat-ish dicts in a JSON payload (the table rows)."""
+    best = []
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            if node and all(isinstance(item, dict) for item in node) and len(node) > len(best):
+                best = node
+            stack.extend(node)
+        elif isinstance(node, dict):
+            stack.extend(node.values())
+    return best
+
+
+def _total_pages(payload):
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key in TOTAL_PAGES_KEYS:
+                if isinstance(node.get(key), int):
+                    return node[key]
+            stack.extend(node.values())
+    return None
+
+
+def capture_stats_requests(driver):
+    """
+    Stats JSON responses the page fetched while loading, from Chrome's performance log.
+
+    :return: list of (url, payload) for JSON responses that contain table rows
+    """
+    WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table tbody tr")))
+    captured = []
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message.get("method") != "Network.responseReceived":
+            continue
+        response = message["params"]["response"]
+        if "json" not in response.get("mimeType", ""):
+            continue
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": message["params"]["requestId"]})
+            payload = json.loads(body["body"])
+        except Exception:
+            continue
+        if _records(payload):
+            captured.append((response["url"], payload))
+    return captured
+
+
+def page_url(url, page):
+    """``url`` with its page-number parameter set to ``page``."""
+    parts = urlsplit(url)
+    query = [(key, str(page) if key in PAGE_PARAMS else value) for key, value in parse_qsl(parts.query)]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def fetch_stats_page(url):
+    response = cached_get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def _cell(value):
+    """Comparable form of a table cell or API value (``1,234`` and ``1234.0`` are equal)."""
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return ""
+    text = str(value).strip().replace(",", "")
     try:
-        next_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, ".fiso-lab-pagination__button--next"))
-        )
-        driver.execute_script("arguments[0].click();", next_btn)
-        page += 1
-    except Exception as e:
-        print(f"[INFO] No more pages or error navigating: {e}")
-        break
-
-driver.quit()
-
-if all_data:
-    # Use the last headers_row found
-    df = pd.DataFrame(all_data, columns=headers_row)
-    df.to_csv(output_csv, index=False)
-    print(f"[SUCCESS] Scraped {len(df)} player kicking stats to {output_csv}")
-else:
-    print("[ERROR] No player stats found across all pages.")
+        return float(text)
+    except ValueError:
+        return text.lower()
+
+
+def header_fields(headers, table_rows, records):
+    """
+    The captured field behind each table column, in header order.
+
+    A column maps to the first unused field whose values equal the column's
+    cells in every row of the rendered first page; None where none does.
+    """
+    flat = pd.json_normalize(records[:len(table_rows)])
+    n = min(len(table_rows), len(flat))
+    values = {column: [_cell(value) for value in flat[column].iloc[:n]] for column in flat.columns}
+    fields, used = [], set()
+    for i in range(len(headers)):
+        cells = [_cell(row[i]) for row in table_rows[:n]]
+        field = next((column for column in flat.columns if column not in used and values[column] == cells), None) if n else None
+        fields.append(field)
+        used.add(field)
+    return fields
+
+
+def scrape_by_capture(driver):
+    """
+    Find the stats API request behind the table and fetch all of its pages concurrently.
+
+    Captured fields are renamed to the table's headers, in header order, so
+    the CSV has the same columns as ``scrape_by_clicking`` writes.
+
+    :return: DataFrame, or None if no paginated stats request was captured
+        or its fields could not all be matched to the table's columns
+    """
+    captured = [(url, payload) for url, payload in capture_stats_requests(driver)
+                if any(key in PAGE_PARAMS for key, _ in parse_qsl(urlsplit(url).query))]
+    if not captured:
+        print("[INFO] No paginated stats API request captured.")
+        return None
+    # The table's request is the one returning the most rows
+    url, first_payload = max(captured, key=lambda item: len(_records(item[1])))
+    headers_row, table_rows = _table_rows(driver.page_source)
+    fields = header_fields(headers_row or [], table_rows, _records(first_payload))
+    missing = [header for header, field in zip(headers_row or [], fields) if field is None]
+    if not headers_row or missing:
+        print(f"[INFO] Captured stats fields do not match the table columns {missing or headers_row}.")
+        return None
+    first_page = next(int(value) for key, value in parse_qsl(urlsplit(url).query) if key in PAGE_PARAMS)
+    total = min(_total_pages(first_payload) or max_pages, max_pages)
+    print(f"[INFO] Captured stats API request, fetching {total} pages concurrently: {url}")
+
+    pages = list(range(first_page + 1, first_page + total))
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        payloads = [first_payload] + list(executor.map(lambda page: fetch_stats_page(page_url(url, page)), pages))
+
+    rows = []
+    for payload in payloads:
+        records = _records(payload)
+        if not records:
+            # Past the last page
+            break
+        rows.extend(records)
+    df = pd.json_normalize(rows).reindex(columns=fields)
+    df.columns = headers_row
+    return df
+
+
+# ---------------------------------------------------------------------------
+# Fallback: click through the table's pagination
+# ---------------------------------------------------------------------------
+
+def _table_rows(html):
+    soup = BeautifulSoup(html, "html.parser")
+    main_table = max(soup.find_all('table'), key=lambda t: len(t.find_all('tr')), default=None)
+    if not main_table:
+        return None, []
+    rows = main_table.find_all('tr')
+    headers_row = [th.get_text(strip=True) for th in rows[0].find_all(['th', 'td'])]
+    data = []
+    for row in rows[1:]:
+        cols = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+        if len(cols) == len(headers_row):
+            data.append(cols)
+    return headers_row, data
+
+
+def scrape_by_clicking(driver):
+    """Page through the rendered table, waiting for each new page instead of sleeping."""
+    all_data = []
+    headers_row = None
+    page = 1
+    WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table tbody tr")))
+    while page <= max_pages:
+        print(f"[INFO] Scraping page {page} of {max_pages}")
+        page_headers, data = _table_rows(driver.page_source)
+        if page_headers:
+            headers_row = page_headers
+            all_data.extend(data)
+        else:
+            print(f"[WARN] No main table found on page {page}")
+        # Try to click the next page button
+        try:
+            next_btn = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, ".fiso-lab-pagination__button--next"))
+            )
+            first_row = driver.find_element(By.CSS_SELECTOR, "table tbody tr").text
+            driver.execute_script("arguments[0].click();", next_btn)
+            # The next page has loaded once the first row changes
+            WebDriverWait(driver, 10).until(
+                lambda d: d.find_element(By.CSS_SELECTOR, "table tbody tr").text != first_row
+            )
+            page += 1
+        except Exception as e:
+            print(f"[INFO] No more pages or error navigating: {e}")
+            break
+    if not all_data:
+        return None
+    return pd.DataFrame(all_data, columns=headers_row)
+
+
+def main():
+    driver = make_driver()
+    try:
+        driver.get(URL)
+        df = None
+        try:
+            df = scrape_by_capture(driver)
+        except Exception as e:
+            print(f"[WARN] Stats API capture failed, falling back to clicking through pages: {e}")
+        if df is None or df.empty:
+            df = scrape_by_clicking(driver)
+    finally:
+        driver.quit()
+
+    if df is not None and not df.empty:
+        df.to_csv(output_csv, index=False)
+        print(f"[SUCCESS] Scraped {len(df)} player kicking stats to {output_csv}")
+    else:
+        print("[ERROR] No player stats found across all pages.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,14 @@
 Optimized Web Scraper for NRL Team Statistics
 """
 
-import requests
 from bs4 import BeautifulSoup
 import sys
 
 sys.path.append("../../nrl_data_main")
 import ENVIRONMENT_VARIABLES as EV
-import requests
 import json
 from bs4 import BeautifulSoup
+from utilities.http_cache import cached_get, get_cached_session, fixtures_are_final
 
 def get_nrl_data(round=1, year=2024, competition = '111'):
     url = f"https://www.nrl.com/draw/?competition={competition}&round={round}&season={year}"
@@ -18,7 +17,7 @@ def get_nrl_data(round=1, year=2024, competition = '111'):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
     }
     
-    response = requests.get(url, headers=headers)
+    response = cached_get(url, headers=headers)
     if response.status_code != 200:
         print("Failed to fetch data")
         return None
@@ -39,7 +38,10 @@ def get_nrl_data(round=1, year=2024, competition = '111'):
     data = json.loads(raw_json)
 
     fixtures = data.get("fixtures", [])
-    
+    if fixtures_are_final(fixtures):
+        # A completed round never changes, so keep it out of TTL expiry
+        get_cached_session().pin(url)
+
     matches_json = []
     for fixture in fixtures:
         if fixture["type"] == "Match":
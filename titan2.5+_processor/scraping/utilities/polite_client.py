@@ -0,0 +1,313 @@
+"""
+Shared "polite" HTTP client for the scrapers.
+
+``PoliteSession`` is a ``requests.Session`` that every request goes through
+with:
+
+- connection pooling (one pool per host, ``pool_size`` connections);
+- a default timeout, so a stalled server can never hang a run;
+- a per-host token bucket (``HOST_RATES``), shared by every session in the
+  process, so concurrent callers together stay under a polite request rate;
+- retries with full-jitter exponential backoff on connection errors, 429
+  and 5xx (honouring ``Retry-After``);
+- a per-host circuit breaker: after ``BREAKER_THRESHOLD`` consecutive
+  failures requests to that host fail fast with ``CircuitOpenError`` for
+  ``BREAKER_COOLDOWN`` seconds, then a single trial request is let through.
+
+The on-disk cache (``http_cache``) sits on top of it, so ``cached_get`` and
+``CachedSession`` only reach the network through this client. Every request
+is recorded to ``scrape_metrics`` with its DNS, connect, time-to-first-byte
+and download times, size and retries.
+"""
+
+import time
+import socket
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+try:
+    from utilities import scrape_metrics
+except ImportError:
+    # Run directly as a script from the utilities folder
+    import scrape_metrics
+
+# (connect, read) seconds applied when a caller passes no timeout
+DEFAULT_TIMEOUT = (10, 30)
+
+# Requests per second and burst size per host
+DEFAULT_RATE = (4.0, 8)
+HOST_RATES = {
+    "www.nrl.com": (8.0, 16),
+    "api.open-meteo.com": (5.0, 10),
+    "archive-api.open-meteo.com": (2.0, 4),
+}
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 60
+
+POOL_SIZE = 16
+
+# Host -> (TokenBucket, CircuitBreaker), shared by every PoliteSession
+_hosts = {}
+_hosts_lock = threading.Lock()
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of contacting a host whose circuit breaker is open."""
+
+
+class TokenBucket:
+    """Blocking token bucket: ``rate`` tokens per second, holding at most ``capacity``."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host."""
+
+    def __init__(self, host, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Raise ``CircuitOpenError`` unless a request to the host may go ahead."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.cooldown or self._trial:
+                raise CircuitOpenError(f"Circuit open for {self.host} after {self._failures} consecutive failures")
+            # Half-open: let one trial request through
+            self._trial = True
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logging.info(f"Circuit closed for {self.host}.")
+            self._failures, self._opened_at, self._trial = 0, None, False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or (self._opened_at is None and self._failures >= self.threshold):
+                logging.warning(f"Circuit opened for {self.host} for {self.cooldown}s.")
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+# DNS/connect seconds spent opening connections for the current thread's request
+_timing = threading.local()
+
+
+def _add_timing(key, seconds):
+    current = getattr(_timing, "current", None)
+    if current is not None:
+        current[key] = current.get(key, 0) + seconds
+
+
+class _TimedConnectionMixin:
+    """Times DNS resolution separately from TCP/TLS set-up when a new connection is opened."""
+
+    def connect(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except OSError:
+            # Let urllib3 resolve again and raise its own error
+            address = host
+        resolved = time.perf_counter()
+        _add_timing("dns_s", resolved - start)
+        try:
+            # TLS still verifies and sends SNI for self.host
+            self._dns_host = address
+            super().connect()
+        except NewConnectionError:
+            if address == host:
+                raise
+            # The first address failed; let urllib3 try all of them
+            self._dns_host = host
+            super().connect()
+        finally:
+            self._dns_host = host
+            _add_timing("connect_s", time.perf_counter() - resolved)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Pooled adapter whose connections report DNS and connect times."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Full-jitter exponential backoff for retry ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after(response):
+    """Seconds requested by a ``Retry-After`` header, or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class PoliteSession(requests.Session):
+    """
+    ``requests.Session`` with rate limiting, retries, circuit breaking and default timeouts.
+
+    Attributes
+    ----------
+    rates : dict
+        Host -> (requests per second, burst) overriding ``default_rate``
+    retries : int
+        Retries after the first attempt on connection errors, 429 and 5xx
+    timeout : float or tuple
+        Timeout used when a request does not pass one
+    """
+
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE, retries=MAX_RETRIES, timeout=DEFAULT_TIMEOUT,
+                 pool_size=POOL_SIZE):
+        super().__init__()
+        self.rates = dict(HOST_RATES if rates is None else rates)
+        self.default_rate = default_rate
+        self.retries = retries
+        self.timeout = timeout
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def _host_state(self, host):
+        with _hosts_lock:
+            if host not in _hosts:
+                _hosts[host] = (TokenBucket(*self.rates.get(host, self.default_rate)), CircuitBreaker(host))
+            return _hosts[host]
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        host = urlsplit(url).hostname or ""
+        bucket, breaker = self._host_state(host)
+        for attempt in range(self.retries + 1):
+            try:
+                breaker.allow()
+            except CircuitOpenError as e:
+                scrape_metrics.record("http", host=host, url=url, retries=attempt, error=type(e).__name__)
+                raise
+            bucket.acquire()
+            _timing.current = timing = {"dns_s": 0, "connect_s": 0}
+            start = time.perf_counter()
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.record_failure()
+                if attempt == self.retries:
+                    self._record(url, host, attempt, timing, start, error=type(e).__name__)
+                    raise
+                delay = backoff_delay(attempt)
+                reason = type(e).__name__
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    self._record(url, host, attempt, timing, start, response)
+                    return response
+                breaker.record_failure()
+                if attempt == self.retries:
+                    self._record(url, host, attempt, timing, start, response)
+                    return response
+                delay = retry_after(response)
+                delay = backoff_delay(attempt) if delay is None else min(delay, BACKOFF_CAP)
+                reason = f"HTTP {response.status_code}"
+                response.close()
+            finally:
+                _timing.current = None
+            logging.warning(f"{reason} from {host}, retry {attempt + 1}/{self.retries} in {delay:.1f}s: {url}")
+            time.sleep(delay)
+
+    @staticmethod
+    def _record(url, host, retries, timing, start, response=None, error=None):
+        total = time.perf_counter() - start
+        event = {"host": host, "url": url, "retries": retries, "total_s": round(total, 6),
+                 "dns_s": round(timing["dns_s"], 6), "connect_s": round(timing["connect_s"], 6)}
+        if response is not None:
+            # elapsed runs from sending the request until the headers were parsed
+            elapsed = response.elapsed.total_seconds()
+            event.update(status=response.status_code, bytes=len(response.content),
+                         ttfb_s=round(max(0.0, elapsed - timing["dns_s"] - timing["connect_s"]), 6),
+                         download_s=round(max(0.0, total - elapsed), 6))
+        if error:
+            event["error"] = error
+        scrape_metrics.record("http", **event)
+
+
+_polite_session = None
+_polite_session_lock = threading.Lock()
+
+
+def get_polite_session():
+    """Return the process-wide ``PoliteSession``."""
+    global _polite_session
+    with _polite_session_lock:
+        if _polite_session is None:
+            _polite_session = PoliteSession()
+    return _polite_session
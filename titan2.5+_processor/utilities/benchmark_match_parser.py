@@ -0,0 +1,137 @@
+"""
+Micro-benchmark for the match-centre HTML parser backends.
+
+Times tree building + extraction for every installed BeautifulSoup backend,
+with and without the ``SoupStrainer`` that only builds the target elements,
+and compares the single-walk ``collect_targets`` against one ``find_all``
+per target class on the same tree. Checks every combination extracts the
+same data as ``html.parser`` on the full tree.
+
+Usage:
+    python utilities/benchmark_match_parser.py --pages "saved_pages/*.html" --repeat 20
+    python utilities/benchmark_match_parser.py --archive data/page_archive/pages.sqlite
+
+``--archive`` uses the match-centre pages recorded by ``page_archive``.
+Without either a synthetic match-centre page is used.
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+import statistics
+
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utilities.page_archive import PageArchive
+from utilities.get_detailed_match_data import (
+    BARS_DATA, TARGET_CLASSES, MATCH_CENTRE_STRAINER, collect_targets, parse_detailed_match_soup
+)
+
+BACKENDS = ["html.parser", "lxml", "html5lib"]
+
+
+def available_backends():
+    backends = []
+    for backend in BACKENDS:
+        try:
+            BeautifulSoup("<p></p>", backend)
+            backends.append(backend)
+        except Exception:
+            continue
+    return backends
+
+
+def synthetic_match_page(filler_rows=400):
+    """A match-centre-shaped page with every target class plus unrelated markup around it."""
+    bars = "".join(
+        f'<dl><dt>{name}</dt><dd class="stats-bar-chart__label stats-bar-chart__label--home">{i}</dd>'
+        f'<dd class="stats-bar-chart__label stats-bar-chart__label--away">{i + 1}</dd></dl>'
+        for i, name in enumerate(BARS_DATA)
+    )
+    donuts = "".join(f'<p class="donut-chart-stat__value">{70 + i}</p>' for i in range(8))
+    summary = "".join(
+        f'<div><span class="match-centre-summary-group__name">{word}</span>'
+        f'<span class="match-centre-summary-group__value"><span>{i}</span></span>'
+        f'<span class="match-centre-summary-group__value"><span>{i + 1}</span></span></div>'
+        for i, word in enumerate(['Tries', 'Conversions', 'Penalty Goals', 'Half Time'])
+    )
+    tries = ('<ul class="match-centre-summary-group__list--home"><li>Player One 12\'</li><li>Player Two 48\'</li></ul>'
+             '<ul class="match-centre-summary-group__list--away"><li>Player Three 30\'</li></ul>')
+    refs = "".join(
+        f'<a class="card-team-mate" href="#"><h3 class="card-team-mate__name">Ref {i}</h3>'
+        f'<p class="card-team-mate__position">Position {i}</p></a>'
+        for i in range(4)
+    )
+    weather = ('<p class="match-weather__text">Weather: <span>Fine</span></p>'
+               '<p class="match-weather__text">Ground Conditions: <span>Good</span></p>')
+    possession = ('<p class="match-centre-card-donut__value match-centre-card-donut__value--home">52%</p>'
+                  '<p class="match-centre-card-donut__value match-centre-card-donut__value--away">48%</p>')
+    filler = "".join(
+        f'<tr class="table-tbody__tr"><td class="table__cell">{i}</td><td class="table__cell">x</td>'
+        f'<td><a class="link" href="/p/{i}">Player {i}</a></td></tr>'
+        for i in range(filler_rows)
+    )
+    return (f'<html><head><script>var x = 1;</script></head><body><nav>{"<a href=#>link</a>" * 200}</nav>'
+            f'<main>{possession}{bars}{donuts}{tries}{summary}{refs}{weather}<table>{filler}</table></main></body></html>')
+
+
+def time_it(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def find_all_per_target(soup):
+    return {css_class: soup.find_all(tag, class_=css_class) for css_class, tag in TARGET_CLASSES.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark match-centre HTML parser backends")
+    parser.add_argument('--pages', type=str, default=None, help='Glob of saved match-centre pages (default: synthetic page)')
+    parser.add_argument('--archive', type=str, default=None, help='Page archive recorded with TITAN_PAGE_ARCHIVE_MODE=record')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    pages = [open(path, encoding="utf-8").read() for path in sorted(glob.glob(args.pages))] if args.pages else []
+    if args.archive:
+        pages += [body.decode("utf-8") for _, _, body in PageArchive(args.archive).pages("rendered", "/draw/")]
+    if not pages:
+        print("[INFO] No saved pages given, using a synthetic match-centre page.")
+        pages = [synthetic_match_page()]
+    print(f"[INFO] Benchmarking {len(pages)} page(s), median of {args.repeat} runs.")
+
+    expected = [parse_detailed_match_soup(BeautifulSoup(html, "html.parser"), "home", "away") for html in pages]
+    results = {}
+    for backend in available_backends():
+        for strained in (False, True):
+            label = f"{backend}{' + strainer' if strained else ''}"
+            kwargs = {"parse_only": MATCH_CENTRE_STRAINER} if strained else {}
+
+            def run():
+                return [parse_detailed_match_soup(BeautifulSoup(html, backend, **kwargs), "home", "away") for html in pages]
+
+            if run() != expected:
+                print(f"[WARN] {label} extracted different data, skipping.")
+                continue
+            results[label] = time_it(run, args.repeat)
+
+    baseline = results["html.parser"]
+    print(f"\n{'backend':<28}{'ms/page':>10}{'speedup':>10}")
+    for label, seconds in sorted(results.items(), key=lambda item: item[1]):
+        print(f"{label:<28}{seconds * 1000 / len(pages):>10.2f}{baseline / seconds:>9.1f}x")
+
+    soups = [BeautifulSoup(html, "html.parser") for html in pages]
+    multi = time_it(lambda: [find_all_per_target(soup) for soup in soups], args.repeat)
+    single = time_it(lambda: [collect_targets(soup) for soup in soups], args.repeat)
+    print(f"\nExtraction on a full tree: {len(TARGET_CLASSES)} x find_all {multi * 1000 / len(pages):.2f} ms/page, "
+          f"single walk {single * 1000 / len(pages):.2f} ms/page ({multi / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
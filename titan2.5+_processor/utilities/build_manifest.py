@@ -0,0 +1,129 @@
+"""
+Content-hash manifest of the pipeline's inputs and the partitions built from them.
+
+For every partition a stage builds (e.g. ``flatten`` / ``matches/NRL/2024``)
+the manifest records the SHA-256 of each input it read and the outputs it
+wrote. Before rebuilding, a stage asks ``is_current`` with the hashes of
+its inputs now; a partition whose inputs are unchanged and whose outputs
+still exist is reused as it is:
+
+    manifest = BuildManifest()
+    inputs = {json_path: manifest.file_hash(json_path)}
+    if not manifest.is_current("flatten", "matches/NRL/2024", inputs, outputs):
+        ...  # rebuild the partition
+        manifest.record("flatten", "matches/NRL/2024", inputs, outputs)
+    manifest.save()
+
+Flatten hashes the season JSON files; later stages hash the Parquet season
+partitions they read (``partition_hashes``), whose bytes only change when
+their data does, so a change to one season's source reaches only the
+partitions downstream of it. File hashes are cached by size and
+modification time, so unchanged files are not read again.
+
+The manifest lives next to the Parquet dataset (``data/dataset/_manifest.json``);
+deleting the dataset resets it.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+
+try:
+    from utilities.nrl_dataset import DATASET_ROOT, DEFAULT_COMP, season_path, seasons
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from nrl_dataset import DATASET_ROOT, DEFAULT_COMP, season_path, seasons
+
+MANIFEST_FILE = "_manifest.json"
+MANIFEST_PATH = os.path.join(DATASET_ROOT, MANIFEST_FILE)
+
+HASH_CHUNK = 1 << 20
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Input hashes and outputs of every partition built, per stage, saved as JSON."""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self._files = {}
+        self._stages = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                self._files, self._stages = data.get("files", {}), data.get("stages", {})
+            except (ValueError, OSError) as e:
+                logging.warning(f"Could not read build manifest {path}, rebuilding everything: {e}")
+
+    def file_hash(self, path):
+        """Content hash of ``path``, reusing the cached hash while its size and modification time are unchanged."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        cached = self._files.get(path)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha256"]
+        digest = file_hash(path)
+        self._files[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def tree_hash(self, directory):
+        """Hash of every file under ``directory`` and its relative path, or None if it does not exist."""
+        if not os.path.isdir(directory):
+            return None
+        digest = hashlib.sha256()
+        for current, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(current, name)
+                digest.update(os.path.relpath(path, directory).replace(os.sep, "/").encode())
+                digest.update(self.file_hash(path).encode())
+        return digest.hexdigest()
+
+    def is_current(self, stage, key, inputs, outputs=()):
+        """True if ``key`` was built from exactly ``inputs`` and its outputs (recorded and given) all exist."""
+        entry = self._stages.get(stage, {}).get(key)
+        if entry is None or entry["inputs"] != inputs:
+            return False
+        return all(os.path.exists(path) for path in list(entry["outputs"]) + list(outputs))
+
+    def record(self, stage, key, inputs, outputs=()):
+        self._stages.setdefault(stage, {})[key] = {
+            "inputs": inputs, "outputs": [os.path.abspath(path) for path in outputs], "built_at": time.time(),
+        }
+
+    def forget(self, stage, key=None):
+        """Drop one partition's entry, or the whole stage, so it is rebuilt next run."""
+        if key is None:
+            self._stages.pop(stage, None)
+        else:
+            self._stages.get(stage, {}).pop(key, None)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"files": self._files, "stages": self._stages}, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+
+def partition_key(name, comp, year):
+    return f"{name}/{comp}/{year}"
+
+
+def partition_hashes(manifest, name, comp=DEFAULT_COMP, years=None, root=DATASET_ROOT):
+    """``{partition_key: tree hash}`` of a table's season partitions (all seasons present by default)."""
+    years = seasons(name, comp, root) if years is None else years
+    return {partition_key(name, comp, year): manifest.tree_hash(season_path(name, comp, year, root)) for year in years}
@@ -10,8 +10,17 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score
 import os
+import argparse
 import logging
 from colorama import init, Fore, Style
+
+try:
+    from utilities.nrl_dataset import PYARROW_AVAILABLE, ensure_current, read_table
+    from utilities.build_manifest import BuildManifest, partition_hashes
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from nrl_dataset import PYARROW_AVAILABLE, ensure_current, read_table
+    from build_manifest import BuildManifest, partition_hashes
 init(autoreset=True)
 
 log_path = 'outputs/player_impact_scores.log'
@@ -44,8 +53,8 @@ OUTPUT_PATH = os.path.join(PROJECT_ROOT, "titan2.5+_processor", "outputs", "play
 def load_data():
     print_info("[INFO] Loading player stats from: " + PLAYER_STATS_PATH)
     print_info("[INFO] Loading match data from: " + MATCH_DATA_PATH)
-    player_stats = pd.read_csv(PLAYER_STATS_PATH)
-    match_data = pd.read_csv(MATCH_DATA_PATH)
+    player_stats = read_table("players", source_csv=PLAYER_STATS_PATH)
+    match_data = read_table("matches", source_csv=MATCH_DATA_PATH)
     print_info(f"[DEBUG] Player stats shape: {player_stats.shape}")
     print_info(f"[DEBUG] Player stats columns: {player_stats.columns.tolist()}")
     print_info(f"[DEBUG] Player stats head:\n{player_stats.head(3)}")
@@ -176,8 +185,24 @@ def save_impact_scores(impact_scores, output_path):
     impact_scores.to_csv(output_path, index=False)
     print_success(f"[SUCCESS] Saved player impact scores to {output_path}")
 
+# 6. Skip the build when no player or match partition changed since the scores were saved
+def impact_inputs(manifest):
+    """Hashes of every player and match season partition (the model is fitted across all seasons)."""
+    players_root = ensure_current("players", PLAYER_STATS_PATH)
+    matches_root = ensure_current("matches", MATCH_DATA_PATH)
+    return {**partition_hashes(manifest, "players", root=players_root),
+            **partition_hashes(manifest, "matches", root=matches_root)}
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build player impact scores from player stats and match outcomes.")
+    parser.add_argument('--force', action='store_true', help='Rebuild even if no player or match season changed')
+    args = parser.parse_args()
     print_info("[START] Building player impact scores...")
+    manifest = BuildManifest() if PYARROW_AVAILABLE else None
+    inputs = impact_inputs(manifest) if manifest is not None else None
+    if inputs and not args.force and manifest.is_current("impact", "player_impact_scores", inputs, [OUTPUT_PATH]):
+        print_success(f"[INFO] No player or match season changed, keeping {OUTPUT_PATH}")
+        exit(0)
     try:
         player_stats, match_data = load_data()
         if player_stats.empty or match_data.empty:
@@ -190,6 +215,9 @@ if __name__ == "__main__":
         model, feature_cols = train_team_impact_model(merged, agg_cols)
         impact_scores = calculate_player_impact_scores(model, agg_cols)
         save_impact_scores(impact_scores, OUTPUT_PATH)
+        if inputs:
+            manifest.record("impact", "player_impact_scores", inputs, [OUTPUT_PATH])
+            manifest.save()
         print_success("[COMPLETE] Player impact score build finished.")
         print_info("[SAMPLE OUTPUT]")
         print_info(str(impact_scores.head()))
@@ -0,0 +1,106 @@
+"""
+Append-only NDJSON checkpoint log for the match scrapers.
+
+Each completed match is appended as one JSON line and fsynced, so a crash
+loses at most the match being written (a torn last line is ignored on
+resume). Nothing is re-serialised while scraping; ``finalize`` compacts the
+log into the nested JSON layouts the flatteners read, writes them atomically
+(temp file + ``os.replace``) and then removes the log.
+"""
+
+import os
+import json
+import logging
+import threading
+
+
+def write_json_atomic(path, document, indent=4):
+    """Write ``document`` to ``path`` via a temp file so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(document, file, indent=indent)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class CheckpointLog:
+    """
+    One NDJSON record per completed match: ``{"round", "order", "key", "data"}``.
+
+    Attributes
+    ----------
+    path : str
+        Location of the ``.ndjson`` log
+    resume : bool
+        Keep (and skip) matches already in the log instead of starting afresh
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.resume = resume
+        self._lock = threading.Lock()
+        self._records = {}
+        if resume:
+            self._load()
+        elif os.path.exists(path):
+            os.remove(path)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        if self._records:
+            logging.info(f"Resuming from {len(self._records)} checkpointed matches in {path}")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash; the match is simply fetched again
+                    continue
+                self._records[(record["round"], record["key"])] = record
+
+    def __contains__(self, round_and_key):
+        return round_and_key in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+    def append(self, round_number, order, key, data):
+        """Durably record one completed match (safe to call from worker threads)."""
+        record = {"round": round_number, "order": order, "key": key, "data": data}
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with self._lock:
+            os.write(self._fd, line)
+            os.fsync(self._fd)
+            self._records[(round_number, key)] = record
+
+    def rounds(self, round_numbers=None):
+        """
+        Group the logged matches by round in fixture order.
+
+        :param round_numbers: rounds to include even if nothing was logged for them
+        :return: list of (round number, [{key: data}, ...]) sorted by round
+        """
+        grouped = {round_number: [] for round_number in (round_numbers or [])}
+        for record in sorted(self._records.values(), key=lambda r: (r["round"], r["order"])):
+            grouped.setdefault(record["round"], []).append({record["key"]: record["data"]})
+        return sorted(grouped.items())
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def finalize(self, outputs):
+        """
+        Atomically write each compacted document, then delete the log.
+
+        :param outputs: dict of output path -> JSON document
+        """
+        for path, document in outputs.items():
+            write_json_atomic(path, document)
+        self.close()
+        os.remove(self.path)
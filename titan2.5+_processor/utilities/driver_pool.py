@@ -0,0 +1,153 @@
+"""
+Bounded pool of reusable headless Chrome drivers.
+
+Scraping jobs are dispatched across a fixed number of worker threads. Each
+worker owns one driver from ``set_up_driver()`` and quits/replaces it after
+``recycle_after`` pages to cap Chrome's memory growth over long backfills.
+Drivers are only launched the first time a job actually uses one, so jobs
+served over plain HTTP never start Chrome. A job that catches a crashed
+browser's ``WebDriverException`` itself calls ``discard_driver(driver)``,
+so its next attempt (or the worker's next job) gets a fresh one.
+"""
+
+import os
+import queue
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+from utilities.set_up_driver import set_up_driver
+from utilities.scrape_metrics import record, timed
+
+# Default number of concurrent drivers (one per CPU)
+DEFAULT_POOL_SIZE = os.cpu_count() or 1
+
+# Pages a driver serves before it is quit and replaced
+DEFAULT_RECYCLE_AFTER = 50
+
+
+class _LazyDriver:
+    """Proxy that launches the real driver on first use."""
+
+    def __init__(self, driver_factory):
+        self._driver_factory = driver_factory
+        self._driver = None
+
+    @property
+    def started(self):
+        return self._driver is not None
+
+    def __getattr__(self, name):
+        if self._driver is None:
+            with timed("driver_start"):
+                self._driver = self._driver_factory()
+        return getattr(self._driver, name)
+
+    def quit(self):
+        if self._driver is not None:
+            driver, self._driver = self._driver, None
+            driver.quit()
+
+    def discard(self):
+        """Quit a crashed browser; the next use launches a new one."""
+        if self._driver is not None:
+            record("driver_restart", reason="crash")
+            driver, self._driver = self._driver, None
+            try:
+                driver.quit()
+            except Exception as ex:
+                logging.warning(f"Error quitting driver: {ex}")
+
+
+def discard_driver(driver):
+    """Drop a crashed pool driver so it is replaced on next use (other drivers are left as they are)."""
+    if isinstance(driver, _LazyDriver):
+        driver.discard()
+
+
+class DriverPool:
+    """
+    A pool of N reusable Selenium drivers that jobs are dispatched to.
+
+    Jobs are callables taking the driver as their first argument, e.g.
+    ``pool.submit(fetch_match_data, game, round_num)`` runs
+    ``fetch_match_data(driver, game, round_num)`` on a free worker.
+
+    Attributes
+    ----------
+    size : int
+        Number of drivers (and worker threads) in the pool
+    recycle_after : int
+        Pages a driver serves before being recycled (0 disables recycling)
+    driver_factory : callable
+        Function returning a new WebDriver (default is ``set_up_driver``)
+    """
+
+    def __init__(self, size=None, recycle_after=DEFAULT_RECYCLE_AFTER, driver_factory=set_up_driver):
+        self.size = max(1, size or DEFAULT_POOL_SIZE)
+        self.recycle_after = recycle_after
+        self.driver_factory = driver_factory
+        # One slot per worker: [driver, pages served by Chrome]
+        self._slots = queue.Queue()
+        for _ in range(self.size):
+            self._slots.put([None, 0])
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="driver-pool")
+        logging.info(f"Driver pool started with {self.size} workers (recycle after {recycle_after} pages).")
+
+    def _new_driver(self):
+        return _LazyDriver(self.driver_factory)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as ex:
+            logging.warning(f"Error quitting driver: {ex}")
+
+    def _run(self, func, *args, **kwargs):
+        slot = self._slots.get()
+        try:
+            if slot[0] is None:
+                slot[0], slot[1] = self._new_driver(), 0
+            elif self.recycle_after and slot[1] >= self.recycle_after:
+                logging.info(f"Recycling driver after {slot[1]} pages.")
+                record("driver_restart", reason="recycle", pages=slot[1])
+                self._quit(slot[0])
+                slot[0], slot[1] = self._new_driver(), 0
+            result = func(slot[0], *args, **kwargs)
+            if slot[0].started:
+                slot[1] += 1
+            return result
+        except WebDriverException:
+            # A crashed browser is discarded so the next job starts a fresh one
+            if slot[0] is not None and slot[0].started:
+                record("driver_restart", reason="crash", pages=slot[1])
+                self._quit(slot[0])
+            slot[0], slot[1] = None, 0
+            raise
+        finally:
+            self._slots.put(slot)
+
+    def submit(self, func, *args, **kwargs):
+        """Queue ``func(driver, *args, **kwargs)`` and return its Future."""
+        return self._executor.submit(self._run, func, *args, **kwargs)
+
+    def map(self, func, jobs):
+        """Run ``func(driver, *job)`` for each job tuple, returning results in job order."""
+        futures = [self.submit(func, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Wait for queued jobs, then quit every driver."""
+        self._executor.shutdown(wait=True)
+        while not self._slots.empty():
+            driver, _ = self._slots.get()
+            if driver is not None:
+                self._quit(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
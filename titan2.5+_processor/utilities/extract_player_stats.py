@@ -1,10 +1,18 @@
-import json
-import csv
-import math
 import os
 import argparse
 import pandas as pd
 
+try:
+    from utilities.json_stream import ITEMS, KEYS, ChunkedCSVWriter, iter_path
+    from utilities.nrl_dataset import write_table
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from json_stream import ITEMS, KEYS, ChunkedCSVWriter, iter_path
+    from nrl_dataset import write_table
+
+FIXED_FIELDS = ('Name', 'Number', 'Position')
+EXCEL_MAX_ROWS = 1048576
+
 # Function to flatten the nested JSON structure
 def flatten_json(nested_json, parent_key='', sep='_'):
     """Recursively flattens a nested JSON structure into a flat dictionary."""
@@ -30,31 +38,40 @@ def flatten_json(nested_json, parent_key='', sep='_'):
     
     return dict(items)
 
-# Function to process and extract fixed fields (static fields)
-def process_fixed_fields(player_data):
-    """Extract fixed fields from the player data."""
-    fixed_fields = {}
-    # Extract the first player's fixed fields, assuming all players have the same fixed structure
-    if player_data:
-        player = player_data[0]
-        fixed_fields['Name'] = player.get('Name', '')
-        fixed_fields['Number'] = player.get('Number', '')
-        fixed_fields['Position'] = player.get('Position', '')
-    return fixed_fields
-
-# Function to process and extract dynamic fields (game stats)
-def process_dynamic_fields(player_data):
-    """Extract dynamic fields from the player data (e.g., stats per game)."""
-    dynamic_fields = []
-    for player in player_data:
-        # Extract stats per game
-        for year, games in player.items():
-            if isinstance(games, list):
-                for game in games:
-                    for game_key, stats in game.items():
-                        flattened_stats = flatten_json(stats)  # Flatten stats for each game
-                        dynamic_fields.append(flattened_stats)
-    return dynamic_fields
+# Function to stream the fixed fields and dynamic fields (game stats) from the player data
+def iter_dynamic_fields(input_file, fixed_fields):
+    """
+    Yield the flattened stats of each game, streamed from the PlayerStats file.
+
+    ``fixed_fields`` is filled in with the first Name/Number/Position values
+    found next to the per-year game lists.
+    """
+    seen = set()
+
+    def on_scalar(keys, value):
+        if len(keys) == 1 and keys[0] in FIXED_FIELDS and keys[0] not in seen:
+            seen.add(keys[0])
+            fixed_fields[keys[0]] = value
+
+    # { "PlayerStats": [ { year: [ { game_key: stats } ] } ] }
+    for _, stats in iter_path(input_file, ["PlayerStats", ITEMS, KEYS, ITEMS, KEYS], on_scalar=on_scalar):
+        yield flatten_json(stats)  # Flatten stats for each game
+
+# Function to stream one record per player per match from a harvested season file
+def player_match_records(input_file, year):
+    """
+    Yield the cleaned stats of each player in each match, streamed from a PlayerStats season file.
+
+    Name, Number and Position are kept as harvested; the stats are cleaned
+    like the per-game records of ``main``.
+    """
+    # { "PlayerStats": [ { year: [ { round: [ { match_key: [ player, ... ] } ] } ] } ] }, rounds keyed from 0
+    steps = ["PlayerStats", ITEMS, str(year), ITEMS, KEYS, ITEMS, KEYS, ITEMS]
+    for (round_key, match_key), player in iter_path(input_file, steps):
+        stats = flatten_json(player)
+        fixed = {field: stats.pop(field, '') for field in FIXED_FIELDS}
+        round_num = int(round_key) + 1 if str(round_key).isdigit() else round_key
+        yield {'Year': year, 'Round': round_num, 'MatchKey': match_key, **fixed, **clean_and_convert_data([stats])[0]}
 
 # Function to replace "-" with "0" in the data
 def replace_dashes_with_zero(data):
@@ -96,22 +113,22 @@ def clean_and_convert_data(data_list):
     return data_list
 
 # Function to write data to multiple CSV files if it exceeds Excel's row limit
-def write_to_multiple_csv_files(data, fieldnames, base_filename='output_file'):
-    """Write data to multiple CSV files to avoid Excel's row limit."""
-    max_rows = 1048576  # Excel's row limit
-    num_files = math.ceil(len(data) / max_rows)
-
-    for i in range(num_files):
-        output_file = f"{base_filename}_{i + 1}.csv"
-        start_index = i * max_rows
-        end_index = min((i + 1) * max_rows, len(data))
-
-        with open(output_file, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data[start_index:end_index])
-
-        print(f"Data successfully written to {output_file}")
+def write_to_multiple_csv_files(records, base_filename='output_file', max_rows=EXCEL_MAX_ROWS):
+    """Stream records into numbered CSV files to avoid Excel's row limit."""
+    writer, index, total = None, 0, 0
+    for record in records:
+        if writer is None or total == index * max_rows:
+            if writer is not None:
+                writer.close()
+                print(f"Data successfully written to {writer.path}")
+            index += 1
+            writer = ChunkedCSVWriter(f"{base_filename}_{index}.csv")
+        writer.write(record)
+        total += 1
+    if writer is not None:
+        writer.close()
+        print(f"Data successfully written to {writer.path}")
+    return total
 
 # Main function to extract player stats and write to CSV
 def main():
@@ -135,55 +152,40 @@ def main():
     else:
         print(f"[INFO] Output directory exists: {output_dir}")
 
+    # Stream the JSON one game at a time: clean, combine with the fixed fields and write each record
+    fixed_fields = {field: '' for field in FIXED_FIELDS}
+    summary = {}
+
+    def combined_records():
+        for idx, dynamic in enumerate(iter_dynamic_fields(input_file, fixed_fields)):
+            # Replace "-" with "0" and convert to numeric
+            dynamic = clean_and_convert_data([dynamic])[0]
+            for key, value in dynamic.items():
+                if isinstance(value, (int, float)):
+                    count, total, low, high = summary.get(key, (0, 0.0, value, value))
+                    summary[key] = (count + 1, total + value, min(low, value), max(high, value))
+            combined_entry = {**fixed_fields, **dynamic}  # Merge fixed and dynamic fields
+            if idx < 3:
+                print(f"[DEBUG] Sample combined record {idx+1}: {combined_entry}")
+            yield combined_entry
+
+    # Write to multiple CSV files
     try:
-        with open(input_file, 'r') as f:
-            json_data = json.load(f)
-        print(f"[SUCCESS] JSON file loaded successfully from {input_file}.")
+        print("[INFO] Streaming, cleaning and writing player stats to CSV file(s)...")
+        written = write_to_multiple_csv_files(combined_records(), base_filename=output_file)
+        print(f"[INFO] Fixed Fields Extracted: {fixed_fields}")
+        print(f"[SUCCESS] {written} records written to CSV file(s).")
     except Exception as e:
-        print(f"[ERROR] Failed to load JSON file: {e}")
+        print(f"[ERROR] Error extracting player stats from {input_file}: {e}")
         return
 
-    # Extract fixed and dynamic fields from the JSON data
-    player_data = json_data.get('PlayerStats', [])
-    print(f"[INFO] Found {len(player_data)} player entries in JSON root.")
-
-    # Process fixed fields
-    fixed_fields = process_fixed_fields(player_data)
-    print(f"[INFO] Fixed Fields Extracted: {fixed_fields}")
-
-    # Process dynamic fields (game stats)
-    print("[INFO] Extracting dynamic (game stats) fields for each player...")
-    dynamic_fields = process_dynamic_fields(player_data)
-    print(f"[INFO] Dynamic Fields Extracted: {len(dynamic_fields)} entries")
-
-    # Replace "-" with "0" in dynamic fields and convert to numeric
-    print("[INFO] Cleaning and converting all dynamic fields to numeric...")
-    dynamic_fields = clean_and_convert_data(dynamic_fields)
-    print("[INFO] Replacement and conversion complete.")
-
     # Print summary stats for verification
-    if dynamic_fields:
-        df_check = pd.DataFrame(dynamic_fields)
+    if summary:
         print("[SUMMARY] Column means after cleaning:")
-        print(df_check.describe().T[['mean', 'min', 'max']])
-
-    # Combine fixed and dynamic fields
-    print("[INFO] Combining fixed and dynamic fields for each record...")
-    combined_data = []
-    for idx, dynamic in enumerate(dynamic_fields):
-        combined_entry = {**fixed_fields, **dynamic}  # Merge fixed and dynamic fields
-        combined_data.append(combined_entry)
-        if idx < 3:
-            print(f"[DEBUG] Sample combined record {idx+1}: {combined_entry}")
-    print(f"[INFO] Data successfully combined. {len(combined_data)} records to write.")
-
-    # Write to multiple CSV files
-    try:
-        print("[INFO] Writing combined data to CSV file(s)...")
-        write_to_multiple_csv_files(combined_data, fieldnames=combined_data[0].keys(), base_filename=output_file)
-        print("[SUCCESS] All data written to CSV file(s).")
-    except Exception as e:
-        print(f"[ERROR] Error writing to CSV: {e}")
+        print(pd.DataFrame(
+            [(total / count, low, high) for count, total, low, high in summary.values()],
+            index=list(summary), columns=['mean', 'min', 'max']
+        ))
 
     print("[COMPLETE] Player stats extraction and flattening finished.")
 
@@ -206,6 +208,7 @@ def main():
     if all_dfs:
         combined_df = pd.concat(all_dfs, ignore_index=True)
         combined_df.to_csv(combined_csv_path, index=False)
+        write_table("players", combined_df, source_csv=combined_csv_path)
         print(f"[SUCCESS] Combined player stats CSV written to {combined_csv_path} ({len(combined_df)} rows)")
     else:
         print("[FATAL] No player stats CSVs found to combine. all_players_2019_2025.csv not created.")
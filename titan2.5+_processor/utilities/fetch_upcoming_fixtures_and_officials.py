@@ -17,11 +17,21 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 import shutil
 import subprocess
 import importlib.util
 import platform
+import threading
+try:
+    from utilities.page_archive import open_driver
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from page_archive import open_driver
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utilities.driver_pool import DriverPool, discard_driver
+from utilities.scrape_metrics import host_of, timed
 
 init(autoreset=True)
 
@@ -48,172 +58,226 @@ def print_error(msg):
 
 NRL_DRAW_URL = "https://www.nrl.com/draw/?season={year}&round={round}"
 
+# Match centre pages crawled in parallel, one Chrome each
+DEFAULT_WORKERS = 4
+
+TEAM_LIST_SELECTOR = ".team-list-profile__name, .team-list__player-name, .squads__player-name"
+OFFICIALS_SELECTOR = ".l-news-grid .card-team-mate"
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+def make_driver():
+    """Headless Chrome (installed once per run), honouring the page archive mode."""
+    def launch():
+        global _chromedriver_path
+        with _chromedriver_lock:
+            if _chromedriver_path is None:
+                _chromedriver_path = ChromeDriverManager().install()
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--window-size=1920,1080')
+        return webdriver.Chrome(service=Service(_chromedriver_path), options=chrome_options)
+
+    return open_driver(launch)
+
 def ensure_selenium():
     if importlib.util.find_spec('selenium') is None:
         print_info('[INFO] selenium not found, installing...')
         subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'selenium'])
         print_info('[INFO] selenium installed.')
 
-def fetch_fixtures_and_officials_and_teams(year, round_number, output_path):
+def parse_match_card(match):
+    """Home, away and date/time from a match card on the draw page."""
+    home = match.select_one(".match-team__name--home")
+    home = home.text.strip() if home else ""
+    away = match.select_one(".match-team__name--away")
+    away = away.text.strip() if away else ""
+    date_elem = match.select_one(".match-header__title")
+    date = date_elem.text.strip() if date_elem else ""
+    time_elem = match.select_one("time")
+    time_str = time_elem.text.strip() if time_elem else ""
+    date_time = f"{date} {time_str}".strip()
+    return home, away, date_time
+
+def open_team_lists(driver):
+    """Select the Team Lists tab of a loaded match centre page and wait until the players are rendered."""
+    try:
+        # Try to find the Team Lists tab by ID first
+        team_lists_tab = None
+        try:
+            team_lists_tab = driver.find_element(By.CSS_SELECTOR, "#tab-team-lists")
+            debug_msg = "Found Team Lists tab by ID."
+        except Exception:
+            # Fallback: find by visible text
+            tabs = driver.find_elements(By.CSS_SELECTOR, '[role="tab"], .tabs__tab, .tab, button')
+            for tab in tabs:
+                if 'team lists' in tab.text.lower():
+                    team_lists_tab = tab
+                    break
+            if team_lists_tab:
+                debug_msg = "Found Team Lists tab by text."
+            else:
+                debug_msg = "Could not find Team Lists tab by ID or text."
+        print_info(debug_msg)
+        # Only click if tab is found and not already selected
+        if team_lists_tab:
+            is_selected = team_lists_tab.get_attribute('aria-selected') == 'true' or 'active' in (team_lists_tab.get_attribute('class') or '').lower()
+            if not is_selected:
+                driver.execute_script("arguments[0].click();", team_lists_tab)
+                print_info("[DEBUG] Clicked Team Lists tab.")
+            else:
+                print_info("[DEBUG] Team Lists tab already active.")
+            # Wait for team list player names to appear
+            WebDriverWait(driver, 20).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, TEAM_LIST_SELECTOR))
+            )
+        else:
+            print_warn("[WARN] Team Lists tab not found for this match.")
+    except Exception as e:
+        print_warn(f"[WARN] Timeout or error waiting for/clicking team lists tab or content: {e}")
+    try:
+        # Officials render with the rest of the page; returns as soon as they are present
+        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, OFFICIALS_SELECTOR)))
+    except Exception:
+        print_warn("[WARN] Officials not rendered for this match.")
+
+def parse_match_centre(html):
+    """Venue, officials and team lists from a rendered match centre page."""
+    match_soup = BeautifulSoup(html, "html.parser")
+    venue = ""
+    venue_elem = match_soup.select_one('p.match-venue.o-text')
+    if venue_elem:
+        venue = venue_elem.get_text(strip=True).replace('Venue:', '').strip()
+    # Officials extraction
+    officials = []
+    officials_grid = match_soup.select(OFFICIALS_SELECTOR)
+    for official in officials_grid:
+        name_elem = official.select_one('.card-team-mate__name')
+        pos_elem = official.select_one('.card-team-mate__position')
+        if name_elem and pos_elem:
+            officials.append(f"{name_elem.text.strip()} ({pos_elem.text.strip()})")
+    officials_str = '; '.join(officials)
+    # Assign to fields
+    referee = ''
+    bunker = ''
+    for official in officials:
+        if 'Referee' in official and not referee:
+            referee = official
+        if 'Senior Review Official' in official or 'Bunker' in official:
+            bunker = official
+    # Team lists (home/away) - improved for new HTML structure, now with position and jersey number
+    home_teamlist = []
+    away_teamlist = []
+    team_rows = match_soup.select('.team-list.team-list--match-centre')
+    for row in team_rows:
+        profiles = row.select('.team-list-profile')
+        positions = row.select('.team-list-position')
+        if len(profiles) == 2 and len(positions) == 2:
+            # Home player
+            home_name_elem = profiles[0].select_one('.team-list-profile-content .team-list-profile__name')
+            home_number_elem = positions[0].select_one('.team-list-position__number')
+            home_pos_elem = positions[0].select_one('.team-list-position__text')
+            if home_name_elem:
+                home_name = ' '.join([t.strip() for t in home_name_elem.stripped_strings])
+                home_number = home_number_elem.text.strip() if home_number_elem else ''
+                home_position = home_pos_elem.text.strip() if home_pos_elem else ''
+                home_teamlist.append(f"{home_number} - {home_name} ({home_position})")
+            # Away player
+            away_name_elem = profiles[1].select_one('.team-list-profile-content .team-list-profile__name')
+            away_number_elem = positions[1].select_one('.team-list-position__number')
+            away_pos_elem = positions[1].select_one('.team-list-position__text')
+            if away_name_elem:
+                away_name = ' '.join([t.strip() for t in away_name_elem.stripped_strings])
+                away_number = away_number_elem.text.strip() if away_number_elem else ''
+                away_position = away_pos_elem.text.strip() if away_pos_elem else ''
+                away_teamlist.append(f"{away_number} - {away_name} ({away_position})")
+    # Fallback to old logic if lists are empty
+    if not home_teamlist or not away_teamlist:
+        squads = match_soup.select('.squads__team')
+        if squads and len(squads) == 2:
+            for idx2, squad in enumerate(squads):
+                players = [p.text.strip() for p in squad.select('.squads__player-name')]
+                if idx2 == 0:
+                    home_teamlist = players
+                else:
+                    away_teamlist = players
+    return venue, referee, bunker, officials_str, home_teamlist, away_teamlist
+
+def fetch_match_fixture(driver, idx, total, match):
+    """Build one fixture row from its draw-page card and match centre page."""
+    print_info(f"[PROGRESS] Processing match {idx+1} of {total}...")
+    home, away, date_time = parse_match_card(match)
+    venue = ""
+    print_info(f"[DEBUG] Home: {home}, Away: {away}, DateTime: {date_time}, Venue: {venue}")
+    match_url = match.get('href')
+    referee = bunker = ""
+    home_teamlist = []
+    away_teamlist = []
+    officials_str = ""
+    if match_url:
+        full_match_url = "https://www.nrl.com" + match_url
+        print_info(f"[INFO] Fetching match centre page with Selenium: {full_match_url}")
+        try:
+            with timed("render", host=host_of(full_match_url), url=full_match_url):
+                driver.get(full_match_url)
+                open_team_lists(driver)
+            with timed("parse", stage="match_centre_html"):
+                venue, referee, bunker, officials_str, home_teamlist, away_teamlist = parse_match_centre(driver.page_source)
+        except WebDriverException as e:
+            # Crashed browser: the worker's next match starts a fresh one
+            print_error(f"[ERROR] Failed to load match centre for {home} v {away}: {e}")
+            discard_driver(driver)
+        except Exception as e:
+            print_error(f"[ERROR] Failed to load match centre for {home} v {away}: {e}")
+        print_info(f"[DEBUG] {home} v {away} Venue: {venue}")
+        print_info(f"[DEBUG] {home} v {away} Officials: {officials_str}")
+        print_info(f"[DEBUG] {home} v {away} Referee: {referee}, Bunker: {bunker}")
+        print_info(f"[DEBUG] {home} v {away} Home team list: {home_teamlist}")
+        print_info(f"[DEBUG] {home} v {away} Away team list: {away_teamlist}")
+    else:
+        print_warn(f"[WARN] No match centre link found for this match.")
+    return {
+        "HomeTeam": home,
+        "AwayTeam": away,
+        "Date": date_time,
+        "Venue": venue,
+        "Referee": referee,
+        "Bunker": bunker,
+        "Officials": officials_str,
+        "HomeTeamList": ", ".join(home_teamlist),
+        "AwayTeamList": ", ".join(away_teamlist)
+    }
+
+def fetch_fixtures_and_officials_and_teams(year, round_number, output_path, workers=DEFAULT_WORKERS):
     print_info(f"[START] Fetching NRL fixtures, officials, and team lists for Year: {year}, Round: {round_number}")
     url = NRL_DRAW_URL.format(year=year, round=round_number)
     print_info(f"[INFO] Fetching main draw page with Selenium: {url}")
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--window-size=1920,1080')
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.get(url)
+    with timed("driver_start"):
+        driver = make_driver()
     try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "a.match--highlighted, a.match-upcoming"))
-        )
+        with timed("render", host=host_of(url), url=url):
+            driver.get(url)
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "a.match--highlighted, a.match-upcoming"))
+            )
+        draw_html = driver.page_source
     except Exception as e:
         print_error(f"[ERROR] Timeout waiting for match cards: {e}")
-        driver.quit()
         return
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    finally:
+        driver.quit()
+    soup = BeautifulSoup(draw_html, "html.parser")
     match_cards = soup.select("a.match--highlighted, a.match-upcoming")
     print_info(f"[INFO] Found {len(match_cards)} match cards on the page.")
     if not match_cards:
         print_warn("[WARN] No match cards found. The page structure may have changed or no matches are scheduled.")
-    fixtures = []
-    # Reuse the same driver for all match centre pages
-    for idx, match in enumerate(match_cards):
-        print_info(f"[PROGRESS] Processing match {idx+1} of {len(match_cards)}...")
-        home = match.select_one(".match-team__name--home")
-        home = home.text.strip() if home else ""
-        away = match.select_one(".match-team__name--away")
-        away = away.text.strip() if away else ""
-        date_elem = match.select_one(".match-header__title")
-        date = date_elem.text.strip() if date_elem else ""
-        time_elem = match.select_one("time")
-        time_str = time_elem.text.strip() if time_elem else ""
-        date_time = f"{date} {time_str}".strip()
-        venue = ""
-        print_info(f"[DEBUG] Home: {home}, Away: {away}, DateTime: {date_time}, Venue: {venue}")
-        match_url = match.get('href')
-        referee = bunker = ""
-        home_teamlist = []
-        away_teamlist = []
-        officials_str = ""
-        if match_url:
-            full_match_url = "https://www.nrl.com" + match_url
-            print_info(f"[INFO] Fetching match centre page with Selenium: {full_match_url}")
-            driver.get(full_match_url)
-            try:
-                # Try to find the Team Lists tab by ID first
-                team_lists_tab = None
-                try:
-                    team_lists_tab = driver.find_element(By.CSS_SELECTOR, "#tab-team-lists")
-                    debug_msg = "Found Team Lists tab by ID."
-                except Exception:
-                    # Fallback: find by visible text
-                    tabs = driver.find_elements(By.CSS_SELECTOR, '[role="tab"], .tabs__tab, .tab, button')
-                    for tab in tabs:
-                        if 'team lists' in tab.text.lower():
-                            team_lists_tab = tab
-                            break
-                    if team_lists_tab:
-                        debug_msg = "Found Team Lists tab by text."
-                    else:
-                        debug_msg = "Could not find Team Lists tab by ID or text."
-                print_info(debug_msg)
-                # Only click if tab is found and not already selected
-                if team_lists_tab:
-                    is_selected = team_lists_tab.get_attribute('aria-selected') == 'true' or 'active' in team_lists_tab.get_attribute('class').lower()
-                    if not is_selected:
-                        driver.execute_script("arguments[0].click();", team_lists_tab)
-                        print_info("[DEBUG] Clicked Team Lists tab.")
-                    else:
-                        print_info("[DEBUG] Team Lists tab already active.")
-                    # Wait for team list player names to appear
-                    WebDriverWait(driver, 20).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ".team-list-profile__name, .team-list__player-name, .squads__player-name"))
-                    )
-                else:
-                    print_warn("[WARN] Team Lists tab not found for this match.")
-            except Exception as e:
-                print_warn(f"[WARN] Timeout or error waiting for/clicking team lists tab or content: {e}")
-            time.sleep(1)  # Allow for JS rendering
-            match_soup = BeautifulSoup(driver.page_source, "html.parser")
-            venue_elem = match_soup.select_one('p.match-venue.o-text')
-            if venue_elem:
-                venue = venue_elem.get_text(strip=True).replace('Venue:', '').strip()
-            # Officials extraction
-            officials = []
-            officials_grid = match_soup.select('.l-news-grid .card-team-mate')
-            for official in officials_grid:
-                name_elem = official.select_one('.card-team-mate__name')
-                pos_elem = official.select_one('.card-team-mate__position')
-                if name_elem and pos_elem:
-                    officials.append(f"{name_elem.text.strip()} ({pos_elem.text.strip()})")
-            officials_str = '; '.join(officials)
-            # Assign to fields
-            referee = ''
-            bunker = ''
-            for official in officials:
-                if 'Referee' in official and not referee:
-                    referee = official
-                if 'Senior Review Official' in official or 'Bunker' in official:
-                    bunker = official
-            # Team lists (home/away) - improved for new HTML structure, now with position and jersey number
-            home_teamlist = []
-            away_teamlist = []
-            team_rows = match_soup.select('.team-list.team-list--match-centre')
-            for row in team_rows:
-                profiles = row.select('.team-list-profile')
-                positions = row.select('.team-list-position')
-                if len(profiles) == 2 and len(positions) == 2:
-                    # Home player
-                    home_name_elem = profiles[0].select_one('.team-list-profile-content .team-list-profile__name')
-                    home_number_elem = positions[0].select_one('.team-list-position__number')
-                    home_pos_elem = positions[0].select_one('.team-list-position__text')
-                    if home_name_elem:
-                        home_name = ' '.join([t.strip() for t in home_name_elem.stripped_strings])
-                        home_number = home_number_elem.text.strip() if home_number_elem else ''
-                        home_position = home_pos_elem.text.strip() if home_pos_elem else ''
-                        home_teamlist.append(f"{home_number} - {home_name} ({home_position})")
-                    # Away player
-                    away_name_elem = profiles[1].select_one('.team-list-profile-content .team-list-profile__name')
-                    away_number_elem = positions[1].select_one('.team-list-position__number')
-                    away_pos_elem = positions[1].select_one('.team-list-position__text')
-                    if away_name_elem:
-                        away_name = ' '.join([t.strip() for t in away_name_elem.stripped_strings])
-                        away_number = away_number_elem.text.strip() if away_number_elem else ''
-                        away_position = away_pos_elem.text.strip() if away_pos_elem else ''
-                        away_teamlist.append(f"{away_number} - {away_name} ({away_position})")
-            # Fallback to old logic if lists are empty
-            if not home_teamlist or not away_teamlist:
-                squads = match_soup.select('.squads__team')
-                if squads and len(squads) == 2:
-                    for idx2, squad in enumerate(squads):
-                        players = [p.text.strip() for p in squad.select('.squads__player-name')]
-                        if idx2 == 0:
-                            home_teamlist = players
-                        else:
-                            away_teamlist = players
-            print_info(f"[DEBUG] Venue: {venue}")
-            print_info(f"[DEBUG] Officials: {officials_str}")
-            print_info(f"[DEBUG] Referee: {referee}, Bunker: {bunker}")
-            print_info(f"[DEBUG] Home team list: {home_teamlist}")
-            print_info(f"[DEBUG] Away team list: {away_teamlist}")
-        else:
-            print_warn(f"[WARN] No match centre link found for this match.")
-        fixtures.append({
-            "HomeTeam": home,
-            "AwayTeam": away,
-            "Date": date_time,
-            "Venue": venue,
-            "Referee": referee,
-            "Bunker": bunker,
-            "Officials": officials_str,
-            "HomeTeamList": ", ".join(home_teamlist),
-            "AwayTeamList": ", ".join(away_teamlist)
-        })
-    driver.quit()
+    # Match centre pages are crawled across a pool of drivers; results come back in card order
+    jobs = [(idx, len(match_cards), match) for idx, match in enumerate(match_cards)]
+    with DriverPool(size=min(workers, len(jobs)) or 1, recycle_after=0, driver_factory=make_driver) as pool:
+        fixtures = pool.map(fetch_match_fixture, jobs)
     # Ensure output is always in C:/Users/slangston1/TITAN/titan2.5+_processor/outputs
     output_dir = r"C:/Users/slangston1/TITAN/titan2.5+_processor/outputs"
     os.makedirs(output_dir, exist_ok=True)
@@ -247,6 +311,7 @@ if __name__ == "__main__":
     parser.add_argument('--year', type=int, required=False)
     parser.add_argument('--round', type=int, required=False)
     parser.add_argument('--output', type=str, default=None)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Match centre pages crawled in parallel')
     args = parser.parse_args()
 
     # Prompt for missing arguments
@@ -264,4 +329,4 @@ if __name__ == "__main__":
             sys.exit(1)
 
     output_file = args.output or f"outputs/upcoming_fixtures_and_officials_{args.year}_round{args.round}.csv"
-    fetch_fixtures_and_officials_and_teams(args.year, args.round, output_file)
+    fetch_fixtures_and_officials_and_teams(args.year, args.round, output_file, workers=args.workers)
@@ -0,0 +1,230 @@
+"""
+Flatten every season file into the match, detailed-match and player tables in one run.
+
+Each (competition, year, file kind) is one job: the season file is streamed
+once by the kind's record generator and returned as a DataFrame. Jobs run
+across a ``ProcessPoolExecutor``, and the per-year frames are concatenated
+in memory and written once per table, as the combined CSV and the Parquet
+dataset, with no per-year intermediate CSVs:
+
+    python utilities/flatten_all.py --years 2019-2025 --type NRL --workers 4
+
+Season files are read from ``nrl_data_main/data/<comp>/<year>/``. Files
+whose content hash matches the build manifest (``build_manifest``) are not
+flattened again: their seasons are read back from the Parquet dataset, and
+only changed seasons are rewritten (``--force`` flattens everything).
+
+When any season changed, the embedded store (``nrl_store``) is rebuilt
+from the dataset afterwards (``--no-store`` skips it).
+"""
+
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+try:
+    from utilities.json_stream import records_to_frame
+    from utilities.nrl_dataset import (DATASET_ROOT, DEFAULT_COMP, TABLES, drop_season, mark_current, read_table,
+                                       season_path, write_table)
+    from utilities.build_manifest import MANIFEST_FILE, BuildManifest, partition_key
+    from utilities.flatten_nrl_data import match_records
+    from utilities.flatten_detailed_nrl_data import detailed_records
+    from utilities.extract_player_stats import player_match_records
+    from utilities.nrl_store import build_store, store_exists
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from json_stream import records_to_frame
+    from nrl_dataset import (DATASET_ROOT, DEFAULT_COMP, TABLES, drop_season, mark_current, read_table,
+                             season_path, write_table)
+    from build_manifest import MANIFEST_FILE, BuildManifest, partition_key
+    from flatten_nrl_data import match_records
+    from flatten_detailed_nrl_data import detailed_records
+    from extract_player_stats import player_match_records
+    from nrl_store import build_store, store_exists
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'nrl_data_main', 'data'))
+T2P_OUTPUTS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'outputs'))
+ROOT_OUTPUTS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'outputs'))
+
+# Table -> season file name, combined CSV (directory, name) and record generator (path, comp, year)
+FILE_KINDS = {
+    "matches": {
+        "file": "{comp}_data_{year}.json",
+        "csv": (T2P_OUTPUTS, "all_matches_{first}_{last}.csv"),
+        "records": lambda path, comp, year: match_records(path, year, comp),
+    },
+    # Raw layout (match/home/away sections as text); the per-side detailed_matches table is built elsewhere
+    "detailed_raw": {
+        "file": "{comp}_detailed_match_data_{year}.json",
+        "csv": (ROOT_OUTPUTS, "all_detailed_matches_{first}_{last}.csv"),
+        "records": lambda path, comp, year: detailed_records(path, comp, year),
+    },
+    "players": {
+        "file": "{comp}_player_statistics_{year}.json",
+        "csv": (T2P_OUTPUTS, "all_players_{first}_{last}.csv"),
+        "records": lambda path, comp, year: player_match_records(path, year),
+    },
+}
+
+
+def season_file(kind, comp, year, data_dir=DATA_DIR):
+    return os.path.join(data_dir, comp, str(year), FILE_KINDS[kind]["file"].format(comp=comp, year=year))
+
+
+def flatten_file(kind, comp, year, path):
+    """Stream one season file into a DataFrame; returns (kind, comp, year, DataFrame, seconds)."""
+    start = time.perf_counter()
+    df = records_to_frame(FILE_KINDS[kind]["records"](path, comp, year))
+    return kind, comp, year, df, time.perf_counter() - start
+
+
+def plan_jobs(years, comps, kinds, data_dir=DATA_DIR):
+    jobs = []
+    for comp in comps:
+        for year in years:
+            for kind in kinds:
+                path = season_file(kind, comp, year, data_dir)
+                if os.path.exists(path):
+                    jobs.append((kind, comp, year, path))
+                else:
+                    print(f"[WARN] No {kind} file for {comp} {year}: {path}")
+    return jobs
+
+
+def run_jobs(jobs, workers=None):
+    """Run the jobs (in worker processes unless ``workers`` is 1); returns {(kind, comp): {year: DataFrame}}."""
+    frames = {}
+
+    def collect(result):
+        kind, comp, year, df, seconds = result
+        print(f"[INFO] {comp} {year} {kind}: {len(df)} rows in {seconds:.1f}s")
+        frames.setdefault((kind, comp), {})[year] = df
+
+    if workers == 1:
+        for job in jobs:
+            collect(flatten_file(*job))
+        return frames
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(flatten_file, *job): job for job in jobs}
+        for future in as_completed(futures):
+            kind, comp, year, path = futures[future]
+            try:
+                collect(future.result())
+            except Exception as e:
+                print(f"[ERROR] Could not flatten {kind} for {comp} {year} from {path}: {e}")
+    return frames
+
+
+def read_season(kind, comp, year, root=DATASET_ROOT):
+    """
+    One season of a table read back from the dataset, as it was flattened.
+
+    Rounds come back in partition directory order and integer columns
+    holding nulls as floats, so rows are put back in round order and
+    declared integer columns kept whole.
+    """
+    df = read_table(kind, years=[year], comp=comp, root=root)
+    for column, arrow_type in TABLES[kind]["types"].items():
+        if arrow_type.startswith("int") and column in df.columns:
+            df[column] = df[column].astype("Int64")
+    return df.sort_values(TABLES[kind]["round"], kind="stable", ignore_index=True)
+
+
+def write_outputs(frames, jobs, years, root=DATASET_ROOT):
+    """
+    Write each table's combined CSV and its rebuilt seasons to the Parquet dataset.
+
+    The CSV concatenates, in year order, the seasons just flattened and the
+    unchanged seasons read back from the dataset.
+    """
+    tables = {}
+    for kind, comp, year, _ in jobs:
+        tables.setdefault((kind, comp), []).append(year)
+    for (kind, comp), table_years in sorted(tables.items()):
+        built = frames.get((kind, comp), {})
+        directory, name = FILE_KINDS[kind]["csv"]
+        name = name.format(first=years[0], last=years[-1])
+        if comp != DEFAULT_COMP:
+            name = f"{comp}_{name}"
+        csv_path = os.path.join(directory, name)
+        if not built and os.path.exists(csv_path):
+            print(f"[INFO] {kind} for {comp} unchanged, keeping {csv_path}")
+            continue
+        parts = []
+        for year in sorted(table_years):
+            if year in built:
+                parts.append(built[year])
+            elif os.path.exists(season_path(kind, comp, year, root)):
+                parts.append(read_season(kind, comp, year, root))
+        parts = [part for part in parts if not part.empty]
+        if not parts:
+            print(f"[WARN] No {kind} rows for {comp}, {csv_path} not written.")
+            continue
+        df = pd.concat(parts, ignore_index=True)
+        os.makedirs(directory, exist_ok=True)
+        df.to_csv(csv_path, index=False)
+        # The dataset is written after its CSV, so readers do not import the CSV back over it
+        for year in built:
+            drop_season(kind, comp, year, root)
+        rebuilt = [df for df in built.values() if not df.empty]
+        if rebuilt:
+            write_table(kind, pd.concat(rebuilt, ignore_index=True), comp=comp, replace=False, root=root,
+                        source_csv=csv_path)
+        else:
+            mark_current(kind, root, source_csv=csv_path, comp=comp)
+        print(f"[SUCCESS] {kind} for {comp} written to {csv_path} ({len(df)} rows, "
+              f"{len(built)} of {len(table_years)} seasons flattened)")
+
+
+def flatten_all(years, comps=(DEFAULT_COMP,), kinds=tuple(FILE_KINDS), workers=None, data_dir=DATA_DIR,
+                force=False, root=DATASET_ROOT, store=True):
+    years = list(years)
+    jobs = plan_jobs(years, comps, kinds, data_dir)
+    if not jobs:
+        print(f"[FATAL] No season files found under {data_dir}.")
+        return {}
+    start = time.perf_counter()
+    manifest = BuildManifest(os.path.join(root, MANIFEST_FILE))
+    inputs = {job: {job[3]: manifest.file_hash(job[3])} for job in jobs}
+    changed = [job for job in jobs if force or not manifest.is_current(
+        "flatten", partition_key(*job[:3]), inputs[job], [season_path(*job[:3], root)])]
+    print(f"[INFO] {len(jobs) - len(changed)} of {len(jobs)} season files unchanged since they were last flattened.")
+    frames = run_jobs(changed, workers)
+    write_outputs(frames, jobs, years, root)
+    for job in changed:
+        kind, comp, year, _ = job
+        df = frames.get((kind, comp), {}).get(year)
+        if df is not None:
+            outputs = [] if df.empty else [season_path(kind, comp, year, root)]
+            manifest.record("flatten", partition_key(kind, comp, year), inputs[job], outputs)
+    manifest.save()
+    print(f"[INFO] Flattened {len(changed)} of {len(jobs)} files in {time.perf_counter() - start:.1f}s")
+    if store and (changed or not store_exists()):
+        build_store(years, comps, root=root)
+    return frames
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flatten match, detailed match and player season files in one pass.")
+    parser.add_argument('--years', type=str, default='2019-2025', help='Year(s) of the data, e.g. 2025 or 2019-2025')
+    parser.add_argument('--type', type=str, default=DEFAULT_COMP, help='Competition type(s), comma separated (e.g. NRL,HOSTPLUS)')
+    parser.add_argument('--kinds', type=str, default=','.join(FILE_KINDS), help='Tables to build, comma separated')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default one per CPU, 1 runs in this process)')
+    parser.add_argument('--data-dir', type=str, default=DATA_DIR, help='Base directory of the season files')
+    parser.add_argument('--force', action='store_true', help='Flatten every file, even if unchanged since the last run')
+    parser.add_argument('--no-store', action='store_true', help='Do not rebuild the embedded store afterwards')
+    args = parser.parse_args()
+    if '-' in args.years:
+        start, end = map(int, args.years.split('-'))
+        years = list(range(start, end + 1))
+    else:
+        years = [int(args.years)]
+    kinds = [kind for kind in args.kinds.split(',') if kind]
+    unknown = sorted(set(kinds) - set(FILE_KINDS))
+    if unknown:
+        parser.error(f"unknown kinds {unknown}, expected some of {list(FILE_KINDS)}")
+    flatten_all(years, [comp for comp in args.type.split(',') if comp], kinds, args.workers, args.data_dir, args.force,
+                store=not args.no_store)
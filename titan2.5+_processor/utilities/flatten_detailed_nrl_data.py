@@ -1,7 +1,32 @@
 import os
-import json
 import pandas as pd
 
+try:
+    from utilities.json_stream import ITEMS, KEYS, ChunkedCSVWriter, iter_path
+    from utilities.nrl_dataset import write_table
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from json_stream import ITEMS, KEYS, ChunkedCSVWriter, iter_path
+    from nrl_dataset import write_table
+
+def _detailed_row(year, round_key, match_key, match_info):
+    flat = {'Year': year, 'Round': round_key, 'MatchKey': match_key}
+    if isinstance(match_info, dict):
+        flat.update(match_info)
+    return flat
+
+def detailed_records(file_path, comp_type, year=None):
+    """Yield one flat row per match, streamed from a detailed match data file."""
+    # { comp: [ { year: [ { round: [ { match_key: match_info } ] } ] } ] }, or as harvested without the
+    # year level: { comp: [ { round: [ { match_key: match_info } ] } ] } (``year`` fills the Year column)
+    for (outer_key, inner_key), value in iter_path(file_path, [comp_type, ITEMS, KEYS, ITEMS, KEYS]):
+        if isinstance(value, list):
+            for match in value:
+                for match_key, match_info in match.items():
+                    yield _detailed_row(outer_key, inner_key, match_key, match_info)
+        else:
+            yield _detailed_row(year, outer_key, inner_key, value)
+
 def flatten_detailed_json(year, comp_type, input_dir=None, output_dir=None):
     if input_dir is None:
         input_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'nrl_data_main', 'data', comp_type, str(year)))
@@ -12,29 +37,14 @@ def flatten_detailed_json(year, comp_type, input_dir=None, output_dir=None):
         print(f"[WARN] No detailed match JSON found for {comp_type} {year} in {input_dir}.")
         return None
     file_path = os.path.join(input_dir, files[0])
+    output_file = os.path.join(output_dir, f"flattened_{comp_type}_detailed_data_{year}.csv")
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with ChunkedCSVWriter(output_file) as writer:
+            writer.write_all(detailed_records(file_path, comp_type, year))
     except Exception as e:
         print(f"[ERROR] Could not read {file_path}: {e}")
         return None
-    # Flatten the JSON structure
-    records = []
-    for season_data in data.get(comp_type, []):
-        for year_key, rounds in season_data.items():
-            for round_group in rounds:
-                for round_key, round_data in round_group.items():
-                    for match in round_data:
-                        for match_key, match_info in match.items():
-                            flat = {'Year': year_key, 'Round': round_key, 'MatchKey': match_key}
-                            if isinstance(match_info, dict):
-                                for k, v in match_info.items():
-                                    flat[k] = v
-                            records.append(flat)
-    df = pd.DataFrame(records)
-    output_file = os.path.join(output_dir, f"flattened_{comp_type}_detailed_data_{year}.csv")
-    df.to_csv(output_file, index=False)
-    print(f"[INFO] Flattened detailed match data for {year} to {output_file} ({len(df)} rows)")
+    print(f"[INFO] Flattened detailed match data for {year} to {output_file} ({writer.rows} rows)")
     return output_file
 
 def combine_detailed_csvs(years, comp_type):
@@ -57,6 +67,7 @@ def combine_detailed_csvs(years, comp_type):
     if all_dfs:
         combined_df = pd.concat(all_dfs, ignore_index=True)
         combined_df.to_csv(combined_csv_path, index=False)
+        write_table("detailed_raw", combined_df, comp=comp_type, source_csv=combined_csv_path)
         print(f"[SUCCESS] Combined detailed CSV written to {combined_csv_path} ({len(combined_df)} rows)")
     else:
         print("[FATAL] No detailed yearly CSVs found to combine. all_detailed_matches_2019_2025.csv not created.")
@@ -1,53 +1,61 @@
 import os
-import json
-import pandas as pd
+
+try:
+    from utilities.json_stream import ChunkedCSVWriter, iter_season
+    from utilities.nrl_dataset import import_csv
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from json_stream import ChunkedCSVWriter, iter_season
+    from nrl_dataset import import_csv
+
+def match_row(year, round_num, match):
+    """One flat row for a match, or None if its round is not numeric."""
+    if not str(round_num).isdigit():
+        return None
+    return {
+        'Year': year,
+        'Round': int(round_num),
+        'HomeTeam': match.get('Home', ''),
+        'HomeScore': match.get('Home_Score', match.get('HomeScore', '')),
+        'AwayTeam': match.get('Away', ''),
+        'AwayScore': match.get('Away_Score', match.get('AwayScore', '')),
+        'Venue': match.get('Venue', ''),
+        'Date': match.get('Date', ''),
+        'MatchCentreURL': match.get('Match_Centre_URL', match.get('MatchCentreURL', ''))
+    }
+
+def match_records(json_path, year, comp='NRL'):
+    """Yield one flat row per match with a numeric round, streamed from a season file."""
+    # Structure: { "NRL": [ { "2019": [ { "1": [ {match1}, ... ] }, ... ] } ] } or unwrapped { "2019": [...] }
+    for _, round_num, match in iter_season(json_path, comp, year):
+        # Drop matches without a numeric round
+        row = match_row(year, round_num, match)
+        if row is not None:
+            yield row
 
 def flatten_nrl_match_data(input_base_dir, output_csv_path, years=range(2019, 2026)):
-    all_matches = []
-    for year in years:
-        json_path = os.path.join(input_base_dir, 'NRL', str(year), f'NRL_data_{year}.json')
-        if not os.path.exists(json_path):
-            print(f"[WARN] No match data file found for {year}: {json_path}")
-            continue
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        # Structure: { "NRL": [ { "2019": [ { "1": [ {match1}, ... ] }, ... ] } ] }
-        # Fix: handle both wrapped and unwrapped structures
-        year_data = None
-        if 'NRL' in data and isinstance(data['NRL'], list) and data['NRL'] and str(year) in data['NRL'][0]:
-            year_data = data['NRL'][0][str(year)]
-        elif str(year) in data:
-            year_data = data[str(year)]
-        else:
-            print(f"[ERROR] Could not find year {year} in {json_path}")
-            continue
-        for round_block in year_data:
-            for round_num, matches in round_block.items():
-                for match in matches:
-                    all_matches.append({
-                        'Year': year,
-                        'Round': int(round_num) if str(round_num).isdigit() else None,
-                        'HomeTeam': match.get('Home', ''),
-                        'HomeScore': match.get('Home_Score', match.get('HomeScore', '')),
-                        'AwayTeam': match.get('Away', ''),
-                        'AwayScore': match.get('Away_Score', match.get('AwayScore', '')),
-                        'Venue': match.get('Venue', ''),
-                        'Date': match.get('Date', ''),
-                        'MatchCentreURL': match.get('Match_Centre_URL', match.get('MatchCentreURL', ''))
-                    })
-    if not all_matches:
+    # Matches are streamed from each season file straight into the CSV
+    with ChunkedCSVWriter(output_csv_path) as writer:
+        for year in years:
+            json_path = os.path.join(input_base_dir, 'NRL', str(year), f'NRL_data_{year}.json')
+            if not os.path.exists(json_path):
+                print(f"[WARN] No match data file found for {year}: {json_path}")
+                continue
+            found = False
+            for _, round_num, match in iter_season(json_path, 'NRL', year):
+                found = True
+                row = match_row(year, round_num, match)
+                if row is not None:
+                    writer.write(row)
+            if not found:
+                print(f"[ERROR] Could not find year {year} in {json_path}")
+    rows = writer.rows
+    if not rows:
+        os.remove(output_csv_path)
         print("[FATAL] No matches found in any year. Exiting flattening.")
         return
-    df = pd.DataFrame(all_matches)
-    # Fix: Drop rows with missing or NaN Round and Year, and ensure both are int
-    df = df.dropna(subset=['Round', 'Year'])
-    df['Round'] = df['Round'].astype(int)
-    df['Year'] = df['Year'].astype(int)
-    print("[DEBUG] DataFrame info before saving:")
-    print(df.info())
-    print(df.head())
-    df.to_csv(output_csv_path, index=False)
-    print(f"[SUCCESS] Flattened all matches to {output_csv_path} ({len(df)} rows)")
+    import_csv("matches", output_csv_path)
+    print(f"[SUCCESS] Flattened all matches to {output_csv_path} ({rows} rows)")
 
 if __name__ == "__main__":
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
@@ -2,8 +2,10 @@
 Optimized Web Scraper for Finding NRL Team Statistics
 """
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from utilities.set_up_driver import set_up_driver
+from utilities.match_centre_http import fetch_match_centre_json, parse_detailed_match
+from utilities.scrape_metrics import host_of, timed
 import sys
 
 sys.path.append("..")
@@ -34,19 +36,83 @@ DONUT_DATA_2_WORDS = [
     '1 POINT FIELD GOALS', '2 POINT FIELD GOALS', 'HALF TIME'
 ]
 
+# Every element the extractor reads, by class -> tag name
+TARGET_CLASSES = {
+    'match-centre-card-donut__value--home': 'p',
+    'match-centre-card-donut__value--away': 'p',
+    'stats-bar-chart__label--home': 'dd',
+    'stats-bar-chart__label--away': 'dd',
+    'donut-chart-stat__value': 'p',
+    'match-centre-summary-group__list--home': 'ul',
+    'match-centre-summary-group__list--away': 'ul',
+    'match-centre-summary-group__name': 'span',
+    'match-centre-summary-group__value': 'span',
+    'card-team-mate': 'a',
+    'match-weather__text': 'p',
+}
+
+# Fastest installed tree builder (lxml is several times quicker than html.parser)
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+def _is_target_class(css_class):
+    # Called with each class and with the whole class string, depending on the bs4 version
+    return css_class is not None and any(c in TARGET_CLASSES for c in css_class.split())
+
+
+# Only the target elements (and their children) are built into the tree
+MATCH_CENTRE_STRAINER = SoupStrainer(class_=_is_target_class)
+
 
-def get_detailed_nrl_data(round: int, year: int, home_team: str, away_team: str, driver=None, nrl_website=EV.NRL_WEBSITE):
+def collect_targets(soup):
+    """Collect every target element in document order with a single walk of the tree."""
+    found = {css_class: [] for css_class in TARGET_CLASSES}
+    for tag in soup.find_all(class_=True):
+        for css_class in tag.get("class", []):
+            if TARGET_CLASSES.get(css_class) == tag.name:
+                found[css_class].append(tag)
+    return found
+
+
+def get_detailed_nrl_data(round: int, year: int, home_team: str, away_team: str, driver=None, nrl_website=EV.NRL_WEBSITE, use_http=True):
     home_team, away_team = [x.replace(" ", "-") for x in [home_team, away_team]]
 
     url = f"{nrl_website}{year}/round-{round}/{home_team}-v-{away_team}/"
     print(f"Fetching data: {url}")
 
+    # Read the match-centre JSON over plain HTTP first, Selenium is only a fallback
+    if use_http:
+        payload = fetch_match_centre_json(url)
+        with timed("parse", stage="detailed_match_json"):
+            match_data = parse_detailed_match(payload, home_team, away_team)
+        if match_data:
+            return match_data
+        print(f"No embedded match data, falling back to Selenium: {url}")
+
     # Webscrape the NRL website
     if driver is None:
-        driver = set_up_driver()  # Only create a new driver if one isn't provided
+        with timed("driver_start"):
+            driver = set_up_driver()  # Only create a new driver if one isn't provided
     
-    driver.get(url)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    with timed("render", host=host_of(url), url=url):
+        driver.get(url)
+    with timed("parse", stage="detailed_match_html"):
+        return parse_detailed_match_html(driver.page_source, home_team, away_team)
+
+
+def parse_detailed_match_html(html, home_team: str, away_team: str, parser=HTML_PARSER):
+    """Parse a rendered match-centre page, building only the elements the extractor reads."""
+    soup = BeautifulSoup(html, parser, parse_only=MATCH_CENTRE_STRAINER)
+    return parse_detailed_match_soup(soup, home_team, away_team)
+
+
+def parse_detailed_match_soup(soup, home_team: str, away_team: str):
+    """Extract team stats, try scorers, referees and conditions from a rendered match-centre page."""
+    targets = collect_targets(soup)
 
     # Initialize match data structures
     home_bars, away_bars = BARS_DATA.copy(), BARS_DATA.copy()
@@ -55,9 +121,9 @@ def get_detailed_nrl_data(round: int, year: int, home_team: str, away_team: str,
     
     # **Extract Team Possession**
     try:
-        home_possession = soup.find('p', class_='match-centre-card-donut__value--home').text.strip()
-        away_possession = soup.find('p', class_='match-centre-card-donut__value--away').text.strip()
-    except AttributeError:
+        home_possession = targets['match-centre-card-donut__value--home'][0].text.strip()
+        away_possession = targets['match-centre-card-donut__value--away'][0].text.strip()
+    except IndexError:
         home_possession, away_possession = None, None
         print("Error: Missing possession data.")
 
@@ -67,14 +133,14 @@ def get_detailed_nrl_data(round: int, year: int, home_team: str, away_team: str,
             bars_dict[bar_name] = item.get_text(strip=True)
 
     try:
-        extract_bars(soup.find_all('dd', class_="stats-bar-chart__label--home"), home_bars)
-        extract_bars(soup.find_all('dd', class_="stats-bar-chart__label--away"), away_bars)
+        extract_bars(targets["stats-bar-chart__label--home"], home_bars)
+        extract_bars(targets["stats-bar-chart__label--away"], away_bars)
     except Exception:
         print("Error: Issue extracting bar statistics.")
 
     # **Extract Donut Statistics**
     try:
-        elements = soup.find_all("p", class_="donut-chart-stat__value")
+        elements = targets["donut-chart-stat__value"]
         numbers = [el.get_text(strip=True) for el in elements]
         home_donut.update(dict(zip(home_donut.keys(), numbers[::2])))
         away_donut.update(dict(zip(away_donut.keys(), numbers[1::2])))
@@ -84,10 +150,10 @@ def get_detailed_nrl_data(round: int, year: int, home_team: str, away_team: str,
     # **Extract Try Scorers & Times**
     def extract_try_scorers(team_class):
         try:
-            tries = soup.find("ul", class_=team_class).find_all("li")
+            tries = targets[team_class][0].find_all("li")
             names, times = zip(*[(t.get_text(strip=True).rsplit(" ", 1)) for t in tries])
             return list(names), list(times)
-        except (AttributeError, ValueError):
+        except (IndexError, ValueError):
             return [], []
 
     home_try_names, home_try_minutes = extract_try_scorers("match-centre-summary-group__list--home")
@@ -105,14 +171,14 @@ def get_detailed_nrl_data(round: int, year: int, home_team: str, away_team: str,
     overall_first_try_scorer, overall_first_try_minute, overall_first_scorer_team = determine_first_scorer()
 
     # **Check Missing Data for DONUT_DATA_2**
-    span_elements = {span.text.strip().upper() for span in soup.find_all('span', class_='match-centre-summary-group__name')}
+    span_elements = {span.text.strip().upper() for span in targets['match-centre-summary-group__name']}
     for word in DONUT_DATA_2_WORDS:
         if word not in span_elements:
             DONUT_DATA_2[word.lower().replace(" ", "_")] = -1
 
     # **Extract Match Summary Data**
     try:
-        stats = [el.span.get_text(strip=True) for el in soup.find_all("span", class_="match-centre-summary-group__value")]
+        stats = [el.span.get_text(strip=True) for el in targets["match-centre-summary-group__value"]]
         home_game_stats.update(dict(zip(home_game_stats.keys(), stats[::2])))
         away_game_stats.update(dict(zip(away_game_stats.keys(), stats[1::2])))
     except Exception:
@@ -120,7 +186,7 @@ def get_detailed_nrl_data(round: int, year: int, home_team: str, away_team: str,
 
     # **Extract Referee Data**
     try:
-        refs = soup.find_all("a", class_="card-team-mate")
+        refs = targets["card-team-mate"]
         ref_names = [r.find("h3", class_="card-team-mate__name").get_text(strip=True) for r in refs]
         ref_positions = [r.find("p", class_="card-team-mate__position").get_text(strip=True) for r in refs]
         main_ref_name = ref_names[0] if ref_names else None
@@ -131,7 +197,7 @@ def get_detailed_nrl_data(round: int, year: int, home_team: str, away_team: str,
     # **Extract Ground & Weather Conditions**
     ground_condition, weather_condition = None, None
     try:
-        conditions = {p.get_text(strip=True).split(":")[0].strip(): p.span.get_text(strip=True) for p in soup.find_all("p", class_="match-weather__text")}
+        conditions = {p.get_text(strip=True).split(":")[0].strip(): p.span.get_text(strip=True) for p in targets["match-weather__text"]}
         ground_condition = conditions.get("Ground Conditions", None)
         weather_condition = conditions.get("Weather", None)
     except Exception:
@@ -0,0 +1,130 @@
+"""
+Manifest of what is already harvested for a season.
+
+Loads the existing detailed match and player statistics files, works out
+which completed fixtures are missing or still incomplete, and merges newly
+fetched matches back into the existing nested layouts in place.
+"""
+
+import os
+import json
+from datetime import datetime, timedelta, timezone
+
+# A fixture is treated as final this long after kick-off
+MATCH_DURATION = timedelta(hours=3)
+
+
+def load_detailed_rounds(path, selection_type):
+    """Return the round list of an existing detailed match data file (empty if missing)."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r") as file:
+            return json.load(file).get(selection_type, [])
+    except (json.JSONDecodeError, AttributeError):
+        return []
+
+
+def load_player_stats(path, year):
+    """Return an existing player statistics file (empty structure if missing)."""
+    player_stats = {"PlayerStats": [{str(year): []}]}
+    if not os.path.exists(path):
+        return player_stats
+    try:
+        with open(path, "r") as file:
+            existing = json.load(file)
+        existing["PlayerStats"][0].setdefault(str(year), [])
+        return existing
+    except (json.JSONDecodeError, KeyError, IndexError, TypeError, AttributeError):
+        return player_stats
+
+
+def detailed_key(game):
+    return f"{game['Home']} v {game['Away']}"
+
+
+def player_key(year, round_number, game):
+    return f"{year}-{round_number}-{game['Home'].replace(' ', '-')}-v-{game['Away'].replace(' ', '-')}"
+
+
+def fixture_completed(game, now=None):
+    """True if the fixture has kicked off long enough ago to be final (or has no date)."""
+    date = game.get("Date")
+    if not date:
+        return True
+    try:
+        kickoff = datetime.fromisoformat(str(date).replace("Z", "+00:00"))
+    except ValueError:
+        return True
+    if kickoff.tzinfo is None:
+        kickoff = kickoff.replace(tzinfo=timezone.utc)
+    return kickoff + MATCH_DURATION <= (now or datetime.now(timezone.utc))
+
+
+def detailed_is_complete(match_data):
+    """A detailed match is final once it has a main referee and no unscraped (-1) scores or stats."""
+    if not isinstance(match_data, dict) or not match_data.get("match", {}).get("main_ref"):
+        return False
+    for side in ("home", "away"):
+        stats = match_data.get(side, {})
+        if str(stats.get("tries", -1)) == "-1" or str(stats.get("all_runs", -1)) == "-1":
+            return False
+    return True
+
+
+def players_are_complete(players_info):
+    return bool(players_info) and all(player.get("Name") for player in players_info)
+
+
+def build_manifest(detailed_rounds, player_stats, year):
+    """
+    Index the harvested matches.
+
+    :return: dict mapping (round number, detailed key or player key) -> True if complete
+    """
+    manifest = {}
+    for round_block in detailed_rounds:
+        for round_key, matches in round_block.items():
+            for match in matches:
+                for key, match_data in match.items():
+                    manifest[(int(round_key), key)] = detailed_is_complete(match_data)
+    for round_block in player_stats["PlayerStats"][0].get(str(year), []):
+        for round_key, matches in round_block.items():
+            for match in matches:
+                for key, players_info in match.items():
+                    # Player rounds are keyed from 0
+                    manifest[(int(round_key) + 1, key)] = players_are_complete(players_info)
+    return manifest
+
+
+def needs_harvest(manifest, year, round_number, game):
+    """True if either payload for this fixture is missing or incomplete."""
+    return not (manifest.get((round_number, detailed_key(game)))
+                and manifest.get((round_number, player_key(year, round_number, game))))
+
+
+def _merge(round_blocks, round_key, entries, sort_key):
+    block = next((b for b in round_blocks if str(next(iter(b))) == round_key), None)
+    if block is None:
+        round_blocks.append({round_key: list(entries)})
+        round_blocks.sort(key=sort_key)
+        return
+    matches = block[next(iter(block))]
+    positions = {next(iter(m)): i for i, m in enumerate(matches)}
+    for entry in entries:
+        key = next(iter(entry))
+        if key in positions:
+            matches[positions[key]] = entry
+        else:
+            positions[key] = len(matches)
+            matches.append(entry)
+
+
+def merge_detailed(detailed_rounds, round_number, entries):
+    """Replace or append ``entries`` ({"Home v Away": data}) in the round's block."""
+    _merge(detailed_rounds, str(round_number), entries, lambda b: int(next(iter(b))))
+
+
+def merge_players(player_stats, year, round_number, entries):
+    """Replace or append ``entries`` ({match key: players}) in the round's block."""
+    _merge(player_stats["PlayerStats"][0][str(year)], str(round_number - 1), entries, lambda b: int(next(iter(b))))
@@ -0,0 +1,286 @@
+"""
+Persistent on-disk HTTP cache shared by the scrapers.
+
+Responses are stored zlib-compressed in a single SQLite file together with
+their ETag/Last-Modified validators. Fresh entries are served without
+touching the network; stale entries are revalidated with a conditional
+request and refreshed on ``304 Not Modified``. Each domain has its own TTL
+(``DOMAIN_POLICIES``), entries can be pinned permanently (pages for finished
+matches never change), and the least recently used entries are evicted once
+the cache grows past ``max_bytes``.
+
+Scrapers opt in by swapping ``requests.get`` for ``cached_get`` or by using a
+``CachedSession`` in place of a ``requests.Session``. Network requests go
+through the shared ``PoliteSession`` (rate limits, retries, timeouts). When a page archive
+mode is set (see ``page_archive``) the cache is bypassed so every request is
+recorded to, or replayed from, the archive.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+
+try:
+    from utilities import page_archive
+except ImportError:
+    # Run directly as a script from the utilities folder
+    import page_archive
+try:
+    from utilities.polite_client import get_polite_session
+    from utilities.scrape_metrics import record as record_metric
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from polite_client import get_polite_session
+    from scrape_metrics import record as record_metric
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "TITAN_HTTP_CACHE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'http_cache'))
+)
+
+# Cache is bounded to this many compressed bytes (least recently used evicted first)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Seconds a response stays fresh when its domain has no policy
+DEFAULT_TTL = 60 * 60
+
+# Seconds a response stays fresh, per domain (None = never expires)
+DOMAIN_POLICIES = {
+    "www.nrl.com": 6 * 60 * 60,
+    "api.open-meteo.com": 60 * 60,
+    "archive-api.open-meteo.com": None,
+    "www.foxsports.com.au": 15 * 60,
+    "www.news.com.au": 15 * 60,
+    "wwos.nine.com.au": 15 * 60,
+    "www.zerotackle.com": 15 * 60,
+    "www.dailytelegraph.com.au": 15 * 60,
+}
+
+# matchState of a finished fixture in the NRL.com draw / match-centre data
+FINAL_MATCH_STATE = "FullTime"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+def cache_key(url, params=None):
+    """Key for a GET request (the URL with its query parameters in a stable order)."""
+    prepared = requests.Request("GET", url, params=sorted((params or {}).items())).prepare()
+    return hashlib.sha256(prepared.url.encode("utf-8")).hexdigest(), prepared.url
+
+
+def _build_response(url, status, headers, body):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.headers.update(headers)
+    response._content = body
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+
+class CachedSession:
+    """
+    A drop-in for ``requests.Session.get`` backed by the on-disk cache.
+
+    Attributes
+    ----------
+    cache_dir : str
+        Directory holding ``http_cache.sqlite``
+    max_bytes : int
+        Size bound for the stored (compressed) bodies
+    policies : dict
+        Domain -> TTL in seconds (None never expires)
+    session : requests.Session
+        Underlying session used for network requests (default is the shared ``PoliteSession``)
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, policies=None, session=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.policies = dict(DOMAIN_POLICIES if policies is None else policies)
+        self.session = page_archive.wrap_session(session or get_polite_session())
+        self.headers = self.session.headers
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, "http_cache.sqlite"), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def ttl_for(self, url):
+        """TTL for ``url`` from its domain policy (None means it never expires)."""
+        host = urlsplit(url).hostname or ""
+        for domain, ttl in self.policies.items():
+            if host == domain or host.endswith("." + domain):
+                return ttl
+        return DEFAULT_TTL
+
+    def _lookup(self, key):
+        with self._lock:
+            return self._db.execute(
+                "SELECT url, status, headers, body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+    def _touch(self, key, expires_at=False):
+        with self._lock, self._db:
+            if expires_at is False:
+                self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            else:
+                self._db.execute("UPDATE responses SET last_access = ?, expires_at = ? WHERE key = ?",
+                                 (time.time(), expires_at, key))
+
+    def _store(self, key, response, expires_at):
+        body = zlib.compress(response.content)
+        headers = {k: v for k, v in response.headers.items()
+                   if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, response.status_code, json.dumps(headers), body, len(body),
+                 response.headers.get("ETag"), response.headers.get("Last-Modified"), now, expires_at, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        evicted = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if total - freed <= self.max_bytes:
+                break
+            evicted.append((key,))
+            freed += size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logging.info(f"HTTP cache evicted {len(evicted)} entries ({freed} bytes).")
+
+    def _expiry(self, url, ttl, permanent):
+        if permanent:
+            return None
+        ttl = self.ttl_for(url) if ttl is None else ttl
+        return None if ttl is None else time.time() + ttl
+
+    def get(self, url, params=None, headers=None, ttl=None, permanent=False, **kwargs):
+        """
+        GET ``url`` through the cache.
+
+        :param ttl: seconds the response stays fresh (default: the domain policy)
+        :param permanent: never expire this entry (e.g. a finished match)
+        :return: requests.Response (``from_cache`` is True when served from disk)
+        """
+        key, full_url = cache_key(url, params)
+        if page_archive.active():
+            return self.session.get(full_url, headers=headers, **kwargs)
+        row = self._lookup(key)
+        if row:
+            cached_url, status, cached_headers, body, etag, last_modified, expires_at = row
+            if permanent and expires_at is not None:
+                self._touch(key, None)
+                expires_at = None
+            if expires_at is None or expires_at > time.time():
+                self._touch(key)
+                record_metric("http", host=urlsplit(full_url).hostname or "", url=full_url, status=status, cache=True)
+                return _build_response(cached_url, status, json.loads(cached_headers), zlib.decompress(body))
+            # Stale: revalidate with the stored validators
+            conditional = dict(headers or {})
+            if etag:
+                conditional["If-None-Match"] = etag
+            if last_modified:
+                conditional["If-Modified-Since"] = last_modified
+            response = self.session.get(full_url, headers=conditional, **kwargs)
+            if response.status_code == 304:
+                self._touch(key, self._expiry(full_url, ttl, permanent))
+                return _build_response(cached_url, status, json.loads(cached_headers), zlib.decompress(body))
+        else:
+            response = self.session.get(full_url, headers=headers, **kwargs)
+        response.from_cache = False
+        if response.status_code == 200:
+            self._store(key, response, self._expiry(full_url, ttl, permanent))
+        return response
+
+    def get_fresh(self, url, params=None):
+        """Return the cached response for ``url`` if it is still fresh, else None (never touches the network)."""
+        key, _ = cache_key(url, params)
+        if page_archive.active():
+            return None
+        row = self._lookup(key)
+        if not row or (row[6] is not None and row[6] <= time.time()):
+            return None
+        self._touch(key)
+        cached_url, status, cached_headers, body = row[:4]
+        return _build_response(cached_url, status, json.loads(cached_headers), zlib.decompress(body))
+
+    def put(self, url, status, headers, body, params=None, ttl=None, permanent=False):
+        """Store a response fetched by another client (e.g. an async downloader)."""
+        key, full_url = cache_key(url, params)
+        if status == 200:
+            response = _build_response(full_url, status, dict(headers), body)
+            self._store(key, response, self._expiry(full_url, ttl, permanent))
+
+    def pin(self, url, params=None):
+        """Mark a cached response as permanent (e.g. once the match it describes is final)."""
+        key, _ = cache_key(url, params)
+        self._touch(key, None)
+
+    def invalidate(self, url, params=None):
+        """Drop a cached response so the next request goes to the network."""
+        key, _ = cache_key(url, params)
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def mount(self, prefix, adapter):
+        self.session.mount(prefix, adapter)
+
+    def close(self):
+        self.session.close()
+        with self._lock:
+            self._db.close()
+
+
+_cached_session = None
+_cached_session_lock = threading.Lock()
+
+
+def get_cached_session():
+    """Return the process-wide ``CachedSession``."""
+    global _cached_session
+    with _cached_session_lock:
+        if _cached_session is None:
+            _cached_session = CachedSession()
+    return _cached_session
+
+
+def cached_get(url, params=None, headers=None, ttl=None, permanent=False, **kwargs):
+    """Drop-in replacement for ``requests.get`` that goes through the shared cache."""
+    return get_cached_session().get(url, params=params, headers=headers, ttl=ttl, permanent=permanent, **kwargs)
+
+
+def fixtures_are_final(fixtures):
+    """True if every fixture in an NRL.com draw payload has finished (its pages will not change)."""
+    matches = [f for f in fixtures if isinstance(f, dict) and f.get("type", "Match") == "Match"]
+    return bool(matches) and all(f.get("matchState") == FINAL_MATCH_STATE for f in matches)
@@ -0,0 +1,293 @@
+"""
+Streaming reader and chunked writers for the nested season JSON files.
+
+Season files nest their records several levels deep, e.g.
+``{"NRL": [{"2025": [{"1": [match, ...]}, ...]}]}`` (player files under
+``"PlayerStats"``). ``iter_path`` walks that nesting with an incremental
+parser (``ijson``) and yields one record at a time, so a season is never
+held in memory as a whole; the records go straight into a
+``ChunkedCSVWriter`` (or ``JSONArrayWriter``), which holds at most
+``chunk_size`` rows at once:
+
+    with ChunkedCSVWriter(output_csv) as writer:
+        for year, round_key, match in iter_season(path, "NRL", 2025):
+            writer.write({"Year": year, "Round": round_key, **match})
+
+Without ``ijson`` the file is loaded with ``json.load`` and walked the same way.
+"""
+
+import os
+import csv
+import json
+import textwrap
+
+import pandas as pd
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Path steps: every item of an array / every key of an object (captured); any other string is a literal key
+ITEMS = "[]"
+KEYS = "*"
+
+DEFAULT_CHUNK_SIZE = 5000
+
+_START = frozenset(("start_map", "start_array"))
+_END = frozenset(("end_map", "end_array"))
+
+
+def _skip(event, events):
+    """Consume the rest of a value whose first event was ``event``."""
+    if event not in _START:
+        return
+    depth = 1
+    for event, _ in events:
+        if event in _START:
+            depth += 1
+        elif event in _END:
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _build(event, value, events):
+    """Build the value whose first event was ``event`` as Python objects."""
+    builder = ijson.ObjectBuilder()
+    add = builder.event
+    add(event, value)
+    if event in _START:
+        depth = 1
+        for event, value in events:
+            add(event, value)
+            if event in _START:
+                depth += 1
+            elif event in _END:
+                depth -= 1
+                if depth == 0:
+                    break
+    return builder.value
+
+
+def _walk_events(event, value, events, steps, keys, on_scalar):
+    if not steps:
+        yield keys, _build(event, value, events)
+        return
+    step, rest = steps[0], steps[1:]
+    expected = "start_array" if step == ITEMS else "start_map"
+    if event != expected:
+        if on_scalar is not None and event not in _START:
+            on_scalar(keys, value)
+        _skip(event, events)
+        return
+    for event, value in events:
+        if event in _END:
+            return
+        if step == ITEMS:
+            yield from _walk_events(event, value, events, rest, keys, on_scalar)
+            continue
+        # map_key, then the first event of its value
+        key = value
+        event, value = next(events)
+        if step == KEYS:
+            yield from _walk_events(event, value, events, rest, keys + (key,), on_scalar)
+        elif key == step:
+            yield from _walk_events(event, value, events, rest, keys, on_scalar)
+        else:
+            _skip(event, events)
+
+
+def _walk_loaded(node, steps, keys, on_scalar):
+    if not steps:
+        yield keys, node
+        return
+    step, rest = steps[0], steps[1:]
+    if step == ITEMS and isinstance(node, list):
+        for item in node:
+            yield from _walk_loaded(item, rest, keys, on_scalar)
+    elif step != ITEMS and isinstance(node, dict):
+        for key, value in node.items():
+            if step == KEYS:
+                yield from _walk_loaded(value, rest, keys + (key,), on_scalar)
+            elif key == step:
+                yield from _walk_loaded(value, rest, keys, on_scalar)
+    elif on_scalar is not None and not isinstance(node, (dict, list)):
+        on_scalar(keys, node)
+
+
+def iter_path(source, steps, on_scalar=None):
+    """
+    Yield ``(keys, value)`` for every value at ``steps`` in a JSON document.
+
+    :param source: file path, or a file object opened in binary mode
+    :param steps: sequence of ``ITEMS``, ``KEYS`` or literal object keys,
+        e.g. ``["NRL", ITEMS, KEYS, ITEMS, KEYS, ITEMS]``
+    :param on_scalar: called as ``on_scalar(keys, value)`` for scalar values
+        met where an array or object was expected (e.g. a player's ``Name``
+        next to their per-year lists); such values are otherwise skipped
+    :return: generator of (tuple of the keys matched by ``KEYS``, value)
+    """
+    steps = tuple(steps)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            yield from iter_path(file, steps, on_scalar)
+        return
+    if not IJSON_AVAILABLE:
+        yield from _walk_loaded(json.load(source), steps, (), on_scalar)
+        return
+    events = iter(ijson.basic_parse(source, use_float=True))
+    for event, value in events:
+        yield from _walk_events(event, value, events, steps, (), on_scalar)
+
+
+def iter_season(source, comp, year=None):
+    """
+    Yield ``(year, round, record)`` from a ``{comp: [{year: [{round: [record, ...]}]}]}`` season file.
+
+    Files without the competition wrapper (``{year: [...]}``) are read too.
+    Year and round are the file's keys (strings).
+    """
+    found = False
+    for (year_key, round_key), record in iter_path(source, [comp, ITEMS, KEYS, ITEMS, KEYS, ITEMS]):
+        if year is None or year_key == str(year):
+            found = True
+            yield year_key, round_key, record
+    if found or not isinstance(source, (str, os.PathLike)):
+        return
+    for (year_key, round_key), record in iter_path(source, [KEYS, ITEMS, KEYS, ITEMS]):
+        if year_key != comp and (year is None or year_key == str(year)):
+            yield year_key, round_key, record
+
+
+class ChunkedCSVWriter:
+    """
+    Write dict records to a CSV, ``chunk_size`` rows at a time.
+
+    Records may have different keys: the header is every key seen, in
+    first-seen order, and missing values are left empty. The CSV is written
+    to a ``.part`` file and moved into place on ``close``; if new columns
+    appear after the first chunk, the rows written so far are padded to the
+    final header while the part file is copied, still one row at a time.
+    """
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.columns = []
+        self.rows = 0
+        self._buffer = []
+        self._file = None
+        self._header_columns = 0
+
+    @property
+    def _part_path(self):
+        return f"{self.path}.part"
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self._part_path, "w", newline="", encoding="utf-8")
+        known = set(self.columns)
+        for record in self._buffer:
+            for key in record:
+                if key not in known:
+                    known.add(key)
+                    self.columns.append(key)
+        if not self._header_columns and self.columns:
+            csv.writer(self._file).writerow(self.columns)
+            self._header_columns = len(self.columns)
+        writer = csv.DictWriter(self._file, fieldnames=self.columns, restval="")
+        writer.writerows(self._buffer)
+        self.rows += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        """Flush the last chunk and move the CSV into place; returns the number of rows written."""
+        self.flush()
+        self._file.close()
+        if len(self.columns) > self._header_columns:
+            self._widen_header()
+        os.replace(self._part_path, self.path)
+        return self.rows
+
+    def _widen_header(self):
+        widened = f"{self.path}.widened"
+        width = len(self.columns)
+        with open(self._part_path, "r", newline="", encoding="utf-8") as source, \
+                open(widened, "w", newline="", encoding="utf-8") as target:
+            reader, writer = csv.reader(source), csv.writer(target)
+            next(reader, None)
+            writer.writerow(self.columns)
+            for row in reader:
+                writer.writerow(row + [""] * (width - len(row)))
+        os.replace(widened, self._part_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._file is not None:
+            self._file.close()
+            os.remove(self._part_path)
+
+
+class JSONArrayWriter:
+    """Write records to a JSON array file one at a time (the layout ``json.dump(records, f, indent=2)`` produces)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(f"{path}.part", "w", encoding="utf-8")
+        self._file.write("[")
+
+    def write(self, record):
+        self._file.write(",\n" if self.rows else "\n")
+        self._file.write(textwrap.indent(json.dumps(record, indent=2), "  "))
+        self.rows += 1
+
+    def close(self):
+        self._file.write("\n]" if self.rows else "]")
+        self._file.close()
+        os.replace(f"{self.path}.part", self.path)
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            os.remove(f"{self.path}.part")
+
+
+def records_to_frame(records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Build a DataFrame from a record iterator, converting ``chunk_size`` dicts at a time."""
+    frames, chunk = [], []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            frames.append(pd.DataFrame(chunk))
+            chunk = []
+    if chunk or not frames:
+        frames.append(pd.DataFrame(chunk))
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
@@ -0,0 +1,127 @@
+"""
+Aho-Corasick multi-keyword matcher.
+
+Compiles a keyword list (optionally grouped by theme) into one automaton so
+a document is scanned once for every keyword, instead of once per keyword.
+Matching is case-insensitive substring matching, the same as
+``kw.lower() in text.lower()``.
+
+The C automaton from ``pyahocorasick`` is used when it is installed,
+otherwise an equivalent pure-Python automaton is built.
+"""
+
+from collections import deque
+
+# Optional: C implementation of the automaton
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for a fixed set of keywords.
+
+    Parameters
+    ----------
+    keywords : dict or list
+        ``{theme: [keyword, ...]}`` or a plain list of keywords
+    default_group : str
+        Theme given to keywords passed as a plain list
+    """
+
+    def __init__(self, keywords, default_group=None):
+        groups = keywords if isinstance(keywords, dict) else {default_group: keywords}
+        # Trie as parallel lists: goto transitions, failure links, keywords ending at each node
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self.groups = {}
+        for group, words in groups.items():
+            for word in words:
+                word = word.lower()
+                if not word:
+                    continue
+                if word not in self.groups:
+                    self.groups[word] = []
+                    self._add(word)
+                if group not in self.groups[word]:
+                    self.groups[word].append(group)
+        self._build()
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self.groups:
+            self._automaton = ahocorasick.Automaton()
+            for word in self.groups:
+                self._automaton.add_word(word, word)
+            self._automaton.make_automaton()
+
+    def _add(self, word):
+        node = 0
+        for char in word:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        self._output[node].append(word)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _scan(self, text):
+        if self._automaton is not None:
+            for end, word in self._automaton.iter(text.lower()):
+                yield word, end - len(word) + 1
+            return
+        node = 0
+        for index, char in enumerate(text.lower()):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for word in self._output[node]:
+                yield word, index - len(word) + 1
+
+    def find_all(self, text):
+        """
+        Every keyword occurrence in ``text`` (non-overlapping per keyword, like ``str.count``).
+
+        :return: list of (keyword, [themes], start offset)
+        """
+        hits = []
+        next_free = {}
+        for word, start in self._scan(text or ""):
+            if start >= next_free.get(word, 0):
+                next_free[word] = start + len(word)
+                hits.append((word, self.groups[word], start))
+        return hits
+
+    def matches(self, text):
+        """True if any keyword occurs in ``text`` (stops at the first hit)."""
+        return next(self._scan(text or ""), None) is not None
+
+    def count(self, text):
+        """Total keyword occurrences, equal to ``sum(text.count(kw) for kw in keywords)``."""
+        return len(self.find_all(text))
+
+    def themes(self, text):
+        """Keywords found in ``text`` grouped by theme: ``{theme: [keyword, ...]}``."""
+        found = {}
+        for word, groups, _ in self.find_all(text):
+            for group in groups:
+                if word not in found.setdefault(group, []):
+                    found[group].append(word)
+        return found
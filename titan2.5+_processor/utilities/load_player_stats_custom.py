@@ -1,6 +1,13 @@
-import json
-import pandas as pd
 import re
+from itertools import groupby
+
+import pandas as pd
+
+try:
+    from utilities.json_stream import ITEMS, KEYS, iter_path, records_to_frame
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from json_stream import ITEMS, KEYS, iter_path, records_to_frame
 
 # === Jersey number → expected position mapping ===
 POSITION_BY_NUMBER = {
@@ -76,80 +83,76 @@ def infer_position_from_number(num_str):
     except:
         return "Unknown"
 
+def iter_player_records(filepath, year):
+    """Yield one record per player per match, streamed from a PlayerStats season file."""
+    # { "PlayerStats": [ { year: [ { round: [ { match_key: [ player, ... ] } ] } ] } ] }
+    steps = ["PlayerStats", ITEMS, str(year), ITEMS, KEYS, ITEMS, KEYS, ITEMS]
+    current_round = None
+    for (round_num, match_key), players in groupby(iter_path(filepath, steps), key=lambda item: item[0]):
+        if round_num != current_round:
+            print(f"[PROGRESS] Processing Year {year}, Round {round_num}.")
+            current_round = round_num
+        try:
+            match_parts = match_key.split("-")
+            home_team = match_parts[-3]
+            away_team = match_parts[-1]
+        except:
+            home_team = None
+            away_team = None
+        print(f"[DEBUG] MatchKey: {match_key}, Home: {home_team}, Away: {away_team}")
+        count = 0
+        for _, player in players:
+            jersey = player.get("Number")
+            inferred_team = infer_team(jersey, home_team, away_team)
+            inferred_pos = infer_position_from_number(jersey)
+            original_pos = player.get("Position")
+
+            # Normalise both sides
+            norm_original = EQUIVALENT_POSITIONS.get(original_pos, original_pos)
+            norm_inferred = EQUIVALENT_POSITIONS.get(inferred_pos, inferred_pos)
+
+            # Suppress warnings for interchange range (14–17)
+            try:
+                jersey_num = int(jersey)
+                suppress_warning = jersey_num in [14, 15, 16, 17]
+            except:
+                suppress_warning = False
+
+            if not suppress_warning and norm_original and norm_inferred and norm_original.lower() != norm_inferred.lower():
+                print(f"⚠️ Position mismatch: {player.get('Name')} — Jersey {jersey} marked as '{original_pos}', expected '{inferred_pos}'")
+
+            count += 1
+            yield {
+                "Year": year,
+                "Round": round_num,
+                "MatchKey": match_key,
+                "HomeTeam": home_team,
+                "AwayTeam": away_team,
+                "Player": player.get("Name"),
+                "Number": jersey,
+                "Team": inferred_team,
+                "Position": original_pos,
+                "PosFromNumber": inferred_pos,
+                "Tries": safe_number(player.get("Tries")),
+                "TryAssists": safe_number(player.get("Try Assists")),
+                "RunMetres": safe_number(player.get("All Run Metres")),
+                "Tackles": safe_number(player.get("Tackles Made")),
+                "Errors": safe_number(player.get("Errors")),
+                "Minutes": safe_minutes(player.get("Mins Played")),
+            }
+        print(f"[INFO] Processed {count} players for match {match_key}.")
+
 def load_player_stats_custom(filepath, year):
     print(f"⏳ [Custom Loader] Loading structured player stats from: {filepath}")
-    
+
+    # Players are streamed from the file and converted to a DataFrame in chunks
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            raw = json.load(f)
-        print(f"[INFO] Successfully loaded JSON file: {filepath}")
+        df = records_to_frame(iter_player_records(filepath, year))
+        print(f"[INFO] Successfully streamed JSON file: {filepath}")
     except Exception as e:
         print(f"❌ Error reading file: {e}")
         return pd.DataFrame()
 
-    player_records = []
-    root = raw.get("PlayerStats", [])
-    print(f"[INFO] Found {len(root)} year entries in PlayerStats root.")
-
-    for year_entry in root:
-        if not isinstance(year_entry, dict):
-            print(f"[WARN] Skipping non-dict year entry: {year_entry}")
-            continue
-        for round_group in year_entry.get(str(year), []):
-            for round_num, match_blocks in round_group.items():
-                print(f"[PROGRESS] Processing Year {year}, Round {round_num}, {len(match_blocks)} matches.")
-                for match_dict in match_blocks:
-                    for match_key, players in match_dict.items():
-                        try:
-                            match_parts = match_key.split("-")
-                            home_team = match_parts[-3]
-                            away_team = match_parts[-1]
-                        except:
-                            home_team = None
-                            away_team = None
-                        print(f"[DEBUG] MatchKey: {match_key}, Home: {home_team}, Away: {away_team}, Players: {len(players)}")
-                        for player in players:
-                            jersey = player.get("Number")
-                            inferred_team = infer_team(jersey, home_team, away_team)
-                            inferred_pos = infer_position_from_number(jersey)
-                            original_pos = player.get("Position")
-
-                            # Normalise both sides
-                            norm_original = EQUIVALENT_POSITIONS.get(original_pos, original_pos)
-                            norm_inferred = EQUIVALENT_POSITIONS.get(inferred_pos, inferred_pos)
-
-                            # Suppress warnings for interchange range (14–17)
-                            try:
-                                jersey_num = int(jersey)
-                                suppress_warning = jersey_num in [14, 15, 16, 17]
-                            except:
-                                suppress_warning = False
-
-                            if not suppress_warning and norm_original and norm_inferred and norm_original.lower() != norm_inferred.lower():
-                                print(f"⚠️ Position mismatch: {player.get('Name')} — Jersey {jersey} marked as '{original_pos}', expected '{inferred_pos}'")
-
-                            entry = {
-                                "Year": year,
-                                "Round": round_num,
-                                "MatchKey": match_key,
-                                "HomeTeam": home_team,
-                                "AwayTeam": away_team,
-                                "Player": player.get("Name"),
-                                "Number": jersey,
-                                "Team": inferred_team,
-                                "Position": original_pos,
-                                "PosFromNumber": inferred_pos,
-                                "Tries": safe_number(player.get("Tries")),
-                                "TryAssists": safe_number(player.get("Try Assists")),
-                                "RunMetres": safe_number(player.get("All Run Metres")),
-                                "Tackles": safe_number(player.get("Tackles Made")),
-                                "Errors": safe_number(player.get("Errors")),
-                                "Minutes": safe_minutes(player.get("Mins Played")),
-                            }
-                            player_records.append(entry)
-                        print(f"[INFO] Processed {len(players)} players for match {match_key}.")
-
-    df = pd.DataFrame(player_records)
 
     if df.empty:
         print(f"⚠️ No valid players loaded from: {filepath}")
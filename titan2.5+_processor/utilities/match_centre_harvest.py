@@ -0,0 +1,177 @@
+"""
+Single-visit match-centre harvester.
+
+Visits each match-centre page once and extracts both the detailed team stats
+(``match_data_detailed_select``) and the player rows (``player_data_select``)
+from the same payload or parsed document, writing both
+``{type}_detailed_match_data_{year}.json`` and
+``{type}_player_statistics_{year}.json`` in their existing layouts.
+
+Each completed match is appended to an NDJSON checkpoint log; the log is
+compacted into both files once every round is done, and ``--resume`` skips
+matches already logged by an interrupted run.
+
+In incremental mode the existing year files are loaded and only completed
+fixtures that are missing or incomplete are fetched and merged in place.
+"""
+
+import os
+import sys
+import json
+import logging
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import WebDriverException
+
+from utilities.driver_pool import DriverPool, DEFAULT_RECYCLE_AFTER, discard_driver
+from utilities.match_centre_http import fetch_match_centre_json, parse_detailed_match, parse_player_stats
+from utilities.get_detailed_match_data import parse_detailed_match_soup, HTML_PARSER
+from utilities.player_data_select import extract_player_rows
+from utilities import harvest_manifest as manifest_utils
+from utilities.checkpoint_log import CheckpointLog
+
+sys.path.append("..")
+import ENVIRONMENT_VARIABLES as EV
+
+
+def fetch_match_centre(driver, url, home_team, away_team):
+    """
+    Load one match centre and return (detailed match data, player rows).
+
+    The embedded JSON is read over HTTP first; the page is only rendered with
+    ``driver`` if either payload is missing, and then parsed once for both.
+    """
+    payload = fetch_match_centre_json(url)
+    match_data = parse_detailed_match(payload, home_team, away_team)
+    players_info = parse_player_stats(payload)
+    if match_data and players_info:
+        return match_data, players_info
+    logging.info(f"No embedded match data, falling back to Selenium: {url}")
+    driver.get(url)
+    soup = BeautifulSoup(driver.page_source, HTML_PARSER)
+    return (match_data or parse_detailed_match_soup(soup, home_team, away_team),
+            players_info or extract_player_rows(soup))
+
+
+def harvest_match_centre(SELECT_YEAR, SELECT_ROUNDS, SELECTION_TYPE, WORKERS=None, RECYCLE_AFTER=DEFAULT_RECYCLE_AFTER, INCREMENTAL=False, RESUME=False):
+    """
+    Fetches detailed match data and player statistics for a year in one pass.
+    Args:
+        SELECT_YEAR (int): The year to fetch.
+        SELECT_ROUNDS (int): Number of rounds to fetch.
+        SELECTION_TYPE (str): Competition type (e.g., 'NRL', 'NRLW').
+        WORKERS (int): Number of concurrent drivers (default: CPU count).
+        RECYCLE_AFTER (int): Pages each driver serves before it is restarted.
+        INCREMENTAL (bool): Only fetch completed matches missing or incomplete on disk.
+        RESUME (bool): Skip matches already in the checkpoint log from an interrupted run.
+    """
+    data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', SELECTION_TYPE, str(SELECT_YEAR)))
+    os.makedirs(data_dir, exist_ok=True)
+    JSON_FILE_PATH = os.path.join(data_dir, f"{SELECTION_TYPE}_data_{SELECT_YEAR}.json")
+    DETAILED_FILE_PATH = os.path.join(data_dir, f"{SELECTION_TYPE}_detailed_match_data_{SELECT_YEAR}.json")
+    PLAYER_FILE_PATH = os.path.join(data_dir, f"{SELECTION_TYPE}_player_statistics_{SELECT_YEAR}.json")
+    CHECKPOINT_PATH = os.path.join(data_dir, f"{SELECTION_TYPE}_match_centre_{SELECT_YEAR}.ndjson")
+    selection_mapping = {
+        'NRLW': EV.NRLW_WEBSITE,
+        'KNOCKON': EV.KNOCKON_WEBSITE,
+        'HOSTPLUS': EV.HOSTPLUS_WEBSITE
+    }
+    WEBSITE = selection_mapping.get(SELECTION_TYPE, EV.NRL_WEBSITE)
+    try:
+        with open(JSON_FILE_PATH, "r") as file:
+            data = json.load(file)[f"{SELECTION_TYPE}"]
+        year_rounds = data[0][str(SELECT_YEAR)]
+    except (FileNotFoundError, KeyError, IndexError, json.JSONDecodeError) as e:
+        logging.error(f"Error loading JSON data: {e}")
+        sys.exit(1)
+
+    checkpoint = CheckpointLog(CHECKPOINT_PATH, resume=RESUME)
+
+    def fetch_match(driver, game, round_num, order):
+        h_team, a_team = game["Home"], game["Away"]
+        home_slug, away_slug = [x.lower().replace(" ", "-") for x in [h_team, a_team]]
+        url = f"{WEBSITE}{SELECT_YEAR}/round-{round_num + 1}/{home_slug}-v-{away_slug}/"
+        logging.info(f"Fetching: {url}")
+        for attempt in range(2):
+            try:
+                match_data, players_info = fetch_match_centre(driver, url, home_slug, away_slug)
+                checkpoint.append(round_num + 1, order, manifest_utils.detailed_key(game), {
+                    "detailed": match_data if "match" in match_data else None,
+                    "player_key": manifest_utils.player_key(SELECT_YEAR, round_num + 1, game),
+                    "players": players_info
+                })
+                return
+            except WebDriverException as ex:
+                # Crashed browser: retry (and later matches) on a fresh one
+                logging.warning(f"Attempt {attempt + 1} failed for {h_team} vs {a_team}: {ex}")
+                discard_driver(driver)
+            except Exception as ex:
+                logging.warning(f"Attempt {attempt + 1} failed for {h_team} vs {a_team}: {ex}")
+        logging.error(f"Giving up on {h_team} vs {a_team}")
+
+    if INCREMENTAL:
+        detailed_rounds = manifest_utils.load_detailed_rounds(DETAILED_FILE_PATH, SELECTION_TYPE)
+        player_stats = manifest_utils.load_player_stats(PLAYER_FILE_PATH, SELECT_YEAR)
+        manifest = manifest_utils.build_manifest(detailed_rounds, player_stats, SELECT_YEAR)
+        logging.info(f"Incremental mode: {sum(manifest.values())} complete entries already on disk.")
+    else:
+        detailed_rounds = []
+        player_stats = {"PlayerStats": [{str(SELECT_YEAR): []}]}
+
+    def wanted(game, round_num):
+        return (manifest_utils.fixture_completed(game)
+                and manifest_utils.needs_harvest(manifest, SELECT_YEAR, round_num + 1, game))
+
+    with DriverPool(size=WORKERS, recycle_after=RECYCLE_AFTER) as pool:
+        # Queue every match up front so workers stay busy across round boundaries
+        round_jobs = []
+        for round_num in range(SELECT_ROUNDS):
+            try:
+                round_data = year_rounds[round_num][str(round_num + 1)]
+                games = [(order, game) for order, game in enumerate(round_data)
+                         if (round_num + 1, manifest_utils.detailed_key(game)) not in checkpoint
+                         and (not INCREMENTAL or wanted(game, round_num))]
+                if games or not INCREMENTAL:
+                    round_jobs.append((round_num, [pool.submit(fetch_match, game, round_num, order) for order, game in games]))
+            except Exception as ex:
+                logging.error(f"Error processing round {round_num + 1}: {ex}")
+        if INCREMENTAL:
+            logging.info(f"Incremental mode: fetching {sum(len(f) for _, f in round_jobs)} matches.")
+        for round_num, futures in round_jobs:
+            try:
+                for future in futures:
+                    future.result()
+                logging.info(f"✅ Round {round_num + 1} data checkpointed.")
+            except Exception as ex:
+                logging.error(f"Error processing round {round_num + 1}: {ex}")
+
+    # Compact the log into both nested layouts, merging over what was loaded
+    round_numbers = [] if INCREMENTAL else [round_num + 1 for round_num, _ in round_jobs]
+    for round_number, matches in checkpoint.rounds(round_numbers):
+        records = [(key, record) for match in matches for key, record in match.items()]
+        manifest_utils.merge_detailed(detailed_rounds, round_number, [
+            {key: record["detailed"]} for key, record in records if record["detailed"]
+        ])
+        manifest_utils.merge_players(player_stats, SELECT_YEAR, round_number, [
+            {record["player_key"]: record["players"]} for _, record in records
+        ])
+    checkpoint.finalize({
+        DETAILED_FILE_PATH: {f"{SELECTION_TYPE}": detailed_rounds},
+        PLAYER_FILE_PATH: player_stats
+    })
+    logging.info(f"Detailed match data saved to {DETAILED_FILE_PATH}")
+    logging.info(f"Player statistics saved to {PLAYER_FILE_PATH}")
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+    parser = argparse.ArgumentParser(description="NRL Match Centre Harvester (detailed match data + player statistics)")
+    parser.add_argument('--year', type=int, required=True)
+    parser.add_argument('--rounds', type=int, required=True)
+    parser.add_argument('--type', type=str, default='NRL')
+    parser.add_argument('--workers', type=int, default=None, help='Number of concurrent headless drivers (default: CPU count)')
+    parser.add_argument('--recycle-after', type=int, default=DEFAULT_RECYCLE_AFTER, help='Pages each driver serves before it is restarted')
+    parser.add_argument('--incremental', action='store_true', help='Only fetch completed matches missing or incomplete in the existing year files')
+    parser.add_argument('--resume', action='store_true', help='Skip matches already in the checkpoint log from an interrupted run')
+    args = parser.parse_args()
+    harvest_match_centre(args.year, args.rounds, args.type, args.workers, args.recycle_after, args.incremental, args.resume)
@@ -0,0 +1,249 @@
+"""
+HTTP-first fetcher for NRL match-centre pages.
+
+The match centre embeds its data as JSON in the ``q-data`` attribute of
+``#vue-match-centre`` (the same way the draw page embeds ``#vue-draw``, which
+``get_nrl_data`` already reads). Fetching that JSON over a pooled
+``PoliteSession`` avoids rendering the page in Chrome. Requests go
+through the shared on-disk HTTP cache and finished matches are pinned.
+
+The parsers return ``None`` when the payload is missing or incomplete so the
+callers can fall back to Selenium.
+"""
+
+import re
+import sys
+import json
+import threading
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+from utilities.http_cache import CachedSession, FINAL_MATCH_STATE
+from utilities.polite_client import PoliteSession
+
+sys.path.append("..")
+import ENVIRONMENT_VARIABLES as EV
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+}
+
+# Connections kept open per host (matches a full driver pool hitting nrl.com)
+POOL_SIZE = 16
+REQUEST_TIMEOUT = 20
+
+# Summary (scoring) keys in the payload -> keys used by the detailed match data
+SUMMARY_KEYS = {
+    'tries': 'tries',
+    'conversions': 'conversions',
+    'penaltyGoals': 'penalty_goals',
+    'sinBins': 'sin_bins',
+    'onePointFieldGoals': '1_point_field_goals',
+    'twoPointFieldGoals': '2_point_field_goals',
+    'halfTimeScore': 'half_time',
+}
+
+# Donut stat titles (normalised) -> keys used by the detailed match data
+DONUT_KEYS = {
+    'completion_rate': 'Completion Rate',
+    'average_play_the_ball_speed': 'Average_Play_Ball_Speed',
+    'kick_defusal': 'Kick_Defusal',
+    'effective_tackle': 'Effective_Tackle',
+}
+
+# Player stat labels whose payload key is not simply the camelCased label
+PLAYER_STAT_KEYS = {
+    "Mins Played": "minutesPlayed",
+    "1 Point Field Goals": "onePointFieldGoals",
+    "2 Point Field Goals": "twoPointFieldGoals",
+    "40/20": "fortyTwentyKicks",
+    "20/40": "twentyFortyKicks",
+    "Play The Ball": "playTheBallTotal",
+    "Average Play The Ball Speed": "playTheBallAverageSpeed",
+    "Bomb Kicks": "bombKicks",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared, connection-pooled (and cached) session used for match-centre requests."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = PoliteSession(pool_size=POOL_SIZE)
+            session.headers.update(HEADERS)
+            _session = CachedSession(session=session)
+    return _session
+
+
+def extract_q_data(html, element_id="vue-match-centre"):
+    """Return the JSON embedded in the ``q-data`` attribute of ``#element_id``, or None."""
+    # Only the data element is built into the tree
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("div", id=element_id))
+    tag = soup.find("div", {"id": element_id})
+    if not tag or not tag.get("q-data"):
+        return None
+    try:
+        # BeautifulSoup has already decoded &quot; entities in the attribute
+        return json.loads(tag["q-data"])
+    except ValueError:
+        return None
+
+
+def fetch_match_centre_json(url, session=None):
+    """
+    Fetch the match-centre data for ``url`` without a browser.
+
+    Tries the page's backing ``/data`` endpoint first, then the embedded
+    ``q-data`` JSON of the HTML page.
+
+    :return: dict payload, or None if neither source could be read
+    """
+    session = session or get_session()
+    data_url = f"{url.rstrip('/')}/data"
+    payload = None
+    try:
+        response = session.get(data_url, headers={"Accept": "application/json"}, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 200 and "json" in response.headers.get("Content-Type", ""):
+            payload, source_url = response.json(), data_url
+    except (requests.RequestException, ValueError):
+        pass
+    if payload is None:
+        try:
+            response = session.get(url, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as ex:
+            print(f"HTTP fetch failed for {url}: {ex}")
+            return None
+        if response.status_code != 200:
+            print(f"HTTP fetch failed for {url} (status {response.status_code})")
+            return None
+        payload, source_url = extract_q_data(response.text), url
+    if isinstance(payload, dict) and payload.get("matchState") == FINAL_MATCH_STATE and hasattr(session, "pin"):
+        # Finished matches never change, so their pages never expire from the cache
+        session.pin(source_url)
+    return payload
+
+
+def _normalise_title(title):
+    return re.sub(r"[^a-z0-9]+", "_", str(title).lower()).strip("_")
+
+
+def _value(value):
+    # Values are either bare numbers/strings or {"value": ...}
+    if isinstance(value, dict):
+        value = value.get("value", value.get("summary"))
+    return -1 if value is None else str(value)
+
+
+def _iter_stats(node):
+    """Yield (title, home value, away value) for every team stat in the payload."""
+    if isinstance(node, dict):
+        if "title" in node and "homeValue" in node and "awayValue" in node:
+            yield node["title"], node["homeValue"], node["awayValue"]
+            return
+        for child in node.values():
+            yield from _iter_stats(child)
+    elif isinstance(node, list):
+        for child in node:
+            yield from _iter_stats(child)
+
+
+def _player_names(payload):
+    names = {}
+    for side in ("homeTeam", "awayTeam"):
+        for player in payload.get(side, {}).get("players", []):
+            names[player.get("playerId")] = f"{player.get('firstName', '')} {player.get('lastName', '')}".strip()
+    return names
+
+
+def _first_try(payload, home_team, away_team):
+    home_id = payload.get("homeTeam", {}).get("teamId")
+    tries = [e for e in payload.get("timeline", []) if str(e.get("type", "")).lower() == "try" and e.get("gameSeconds") is not None]
+    if not tries:
+        return None, None, None
+    first = min(tries, key=lambda e: e["gameSeconds"])
+    minute = f"{-(-int(first['gameSeconds']) // 60)}'"
+    team = home_team if first.get("teamId") == home_id else away_team
+    return _player_names(payload).get(first.get("playerId")), minute, team
+
+
+def parse_detailed_match(payload, home_team, away_team):
+    """
+    Build the ``get_detailed_nrl_data`` structure from a match-centre payload.
+
+    :return: {'match': ..., 'home': ..., 'away': ...} or None if the payload has no team stats
+    """
+    from utilities.get_detailed_match_data import BARS_DATA, DONUT_DATA, DONUT_DATA_2
+
+    if not isinstance(payload, dict):
+        return None
+    home_stats = {**BARS_DATA, **DONUT_DATA, **DONUT_DATA_2}
+    away_stats = dict(home_stats)
+    found = 0
+    for title, home_value, away_value in _iter_stats(payload.get("stats", payload)):
+        key = _normalise_title(title)
+        key = DONUT_KEYS.get(key, key)
+        if key in home_stats:
+            home_stats[key], away_stats[key] = _value(home_value), _value(away_value)
+            found += 1
+    if not found:
+        return None
+
+    for side, stats in (("homeTeam", home_stats), ("awayTeam", away_stats)):
+        team = payload.get(side, {})
+        scoring = team.get("scoring", {})
+        for source_key, key in SUMMARY_KEYS.items():
+            if source_key in scoring:
+                stats[key] = _value(scoring[source_key])
+            elif source_key in team:
+                stats[key] = _value(team[source_key])
+
+    officials = payload.get("officials", [])
+    ref_names = [f"{o.get('firstName', '')} {o.get('lastName', '')}".strip() for o in officials]
+    ref_positions = [o.get("position", "") for o in officials]
+    first_scorer, first_minute, first_team = _first_try(payload, home_team, away_team)
+
+    match_data = {
+        'overall_first_try_scorer': first_scorer,
+        'overall_first_try_minute': first_minute,
+        'overall_first_try_round': first_team,
+        'ref_names': ref_names, 'ref_positions': ref_positions,
+        'main_ref': ref_names[0] if ref_names else None,
+        'ground_condition': payload.get("groundConditions"),
+        'weather_condition': payload.get("weather")
+    }
+    return {'match': match_data, 'home': home_stats, 'away': away_stats}
+
+
+def _camel_case(label):
+    words = re.sub(r"[^A-Za-z0-9 ]+", " ", label).split()
+    return words[0].lower() + "".join(w[:1].upper() + w[1:] for w in words[1:]) if words else ""
+
+
+def parse_player_stats(payload):
+    """
+    Build the ``player_data_select`` rows (Name + EV.PLAYER_LABELS) from a match-centre payload.
+
+    :return: list of player dicts, or None if the payload has no player stats
+    """
+    if not isinstance(payload, dict):
+        return None
+    player_stats = payload.get("stats", {}).get("players", {})
+    players_info = []
+    for side in ("homeTeam", "awayTeam"):
+        roster = {p.get("playerId"): p for p in payload.get(side, {}).get("players", [])}
+        for stats in player_stats.get(side, []):
+            player = roster.get(stats.get("playerId"), {})
+            player_info = {"Name": f"{player.get('firstName', '')} {player.get('lastName', '')}".strip()}
+            for label in EV.PLAYER_LABELS:
+                if label == "Number":
+                    value = player.get("number")
+                elif label == "Position":
+                    value = player.get("position")
+                else:
+                    value = stats.get(PLAYER_STAT_KEYS.get(label, _camel_case(label)))
+                player_info[label] = "na" if value is None else str(value)
+            players_info.append(player_info)
+    return players_info or None
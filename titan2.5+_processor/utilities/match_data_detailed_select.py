@@ -4,25 +4,34 @@ import logging
 import pandas as pd
 import numpy as np
 from utilities.get_detailed_match_data import get_detailed_nrl_data
-from utilities.set_up_driver import set_up_driver
+from utilities.driver_pool import DriverPool, DEFAULT_RECYCLE_AFTER, discard_driver
+from selenium.common.exceptions import WebDriverException
+from utilities.checkpoint_log import CheckpointLog
 import sys
 
 sys.path.append("..")
 import ENVIRONMENT_VARIABLES as EV
 
-def match_data_detailed_select(SELECT_YEAR, SELECT_ROUNDS, SELECTION_TYPE):
+def match_data_detailed_select(SELECT_YEAR, SELECT_ROUNDS, SELECTION_TYPE, WORKERS=None, RECYCLE_AFTER=DEFAULT_RECYCLE_AFTER, RESUME=False):
     """
     Fetches detailed NRL match data for a given year and number of rounds.
+    Matches are fetched in parallel across a pool of headless drivers, each
+    completed match is appended to an NDJSON checkpoint log, and the log is
+    compacted into the nested JSON file in fixture order at the end.
     Args:
         SELECT_YEAR (int): The year to fetch.
         SELECT_ROUNDS (int): Number of rounds to fetch.
         SELECTION_TYPE (str): Competition type (e.g., 'NRL', 'NRLW').
+        WORKERS (int): Number of concurrent drivers (default: CPU count).
+        RECYCLE_AFTER (int): Pages each driver serves before it is restarted.
+        RESUME (bool): Skip matches already in the checkpoint log from an interrupted run.
     """
     VARIABLES = ["Year", "Win", "Defense", "Attack", "Margin", "Home", "Versus", "Round"]
     data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', SELECTION_TYPE, str(SELECT_YEAR)))
     os.makedirs(data_dir, exist_ok=True)
     JSON_FILE_PATH = os.path.join(data_dir, f"{SELECTION_TYPE}_data_{SELECT_YEAR}.json")
     OUTPUT_FILE_PATH = os.path.join(data_dir, f"{SELECTION_TYPE}_detailed_match_data_{SELECT_YEAR}.json")
+    CHECKPOINT_PATH = os.path.join(data_dir, f"{SELECTION_TYPE}_detailed_match_data_{SELECT_YEAR}.ndjson")
     selection_mapping = {
         'NRLW': (EV.NRLW_TEAMS, EV.NRLW_WEBSITE),
         'KNOCKON': (EV.KNOCKON_TEAMS, EV.KNOCKON_WEBSITE),
@@ -43,7 +52,8 @@ def match_data_detailed_select(SELECT_YEAR, SELECT_ROUNDS, SELECTION_TYPE):
         logging.error(f"Error accessing year data: {e}")
         sys.exit(1)
     df = pd.DataFrame(columns=[f"{team} {variable}" for team in TEAMS for variable in VARIABLES])
-    def fetch_match_data(driver, game, round_num):
+    checkpoint = CheckpointLog(CHECKPOINT_PATH, resume=RESUME)
+    def fetch_match_data(driver, game, round_num, order):
         h_team, a_team = game["Home"], game["Away"]
         game_data = None
         for attempt in range(2):
@@ -54,28 +64,39 @@ def match_data_detailed_select(SELECT_YEAR, SELECT_ROUNDS, SELECTION_TYPE):
                     driver=driver, nrl_website=WEBSITE
                 )
                 if "match" in game_data:
+                    checkpoint.append(round_num + 1, order, f"{h_team} v {a_team}", game_data)
                     return {f"{h_team} v {a_team}": game_data}
+            except WebDriverException as ex:
+                # Crashed browser: retry (and later matches) on a fresh one
+                logging.warning(f"Attempt {attempt + 1} failed for {h_team} vs {a_team}: {ex}")
+                discard_driver(driver)
             except Exception as ex:
                 logging.warning(f"Attempt {attempt + 1} failed for {h_team} vs {a_team}: {ex}")
         return None
-    driver = set_up_driver()
-    match_json_datas = []
-    for round_num in range(SELECT_ROUNDS):
-        try:
-            round_data = years_arr[SELECT_YEAR][round_num][str(round_num + 1)]
-            round_data_scores = []
-            for game in round_data:
-                match_data = fetch_match_data(driver, game, round_num)
-                if match_data:
-                    round_data_scores.append(match_data)
-            match_json_datas.append({round_num + 1: round_data_scores})
-            with open(OUTPUT_FILE_PATH, "w") as file:
-                json.dump({f"{SELECTION_TYPE}": match_json_datas}, file, indent=4)
-            logging.info(f"✅ Round {round_num + 1} data saved.")
-        except Exception as ex:
-            logging.error(f"Error processing round {round_num + 1}: {ex}")
-    driver.quit()
-    logging.info(f"Final player statistics saved to {OUTPUT_FILE_PATH}")
+    with DriverPool(size=WORKERS, recycle_after=RECYCLE_AFTER) as pool:
+        # Queue every match up front so workers stay busy across round boundaries
+        round_jobs = []
+        for round_num in range(SELECT_ROUNDS):
+            try:
+                round_data = years_arr[SELECT_YEAR][round_num][str(round_num + 1)]
+                round_jobs.append((round_num, [
+                    pool.submit(fetch_match_data, game, round_num, order)
+                    for order, game in enumerate(round_data)
+                    if (round_num + 1, f"{game['Home']} v {game['Away']}") not in checkpoint
+                ]))
+            except Exception as ex:
+                logging.error(f"Error processing round {round_num + 1}: {ex}")
+        for round_num, futures in round_jobs:
+            try:
+                for future in futures:
+                    future.result()
+                logging.info(f"✅ Round {round_num + 1} data checkpointed.")
+            except Exception as ex:
+                logging.error(f"Error processing round {round_num + 1}: {ex}")
+    # Compact the log into the nested layout the flatteners read
+    match_json_datas = [{round_number: matches} for round_number, matches in checkpoint.rounds([r + 1 for r, _ in round_jobs])]
+    checkpoint.finalize({OUTPUT_FILE_PATH: {f"{SELECTION_TYPE}": match_json_datas}})
+    logging.info(f"Final detailed match data saved to {OUTPUT_FILE_PATH}")
 
 if __name__ == "__main__":
     import argparse
@@ -84,5 +105,8 @@ if __name__ == "__main__":
     parser.add_argument('--year', type=int, required=True)
     parser.add_argument('--rounds', type=int, required=True)
     parser.add_argument('--type', type=str, default='NRL')
+    parser.add_argument('--workers', type=int, default=None, help='Number of concurrent headless drivers (default: CPU count)')
+    parser.add_argument('--recycle-after', type=int, default=DEFAULT_RECYCLE_AFTER, help='Pages each driver serves before it is restarted')
+    parser.add_argument('--resume', action='store_true', help='Skip matches already in the checkpoint log from an interrupted run')
     args = parser.parse_args()
-    match_data_detailed_select(args.year, args.rounds, args.type)
+    match_data_detailed_select(args.year, args.rounds, args.type, args.workers, args.recycle_after, args.resume)
@@ -0,0 +1,118 @@
+"""
+Near-duplicate collapsing for the social/news sweep.
+
+The same story is syndicated across news sites and reposted on social
+media. Each post gets a MinHash signature of its word shingles, and
+locality-sensitive hashing over bands of the signature finds candidate
+pairs: only posts sharing a band bucket are compared, so clustering is
+near-linear in the number of posts instead of comparing every pair.
+Candidates whose estimated Jaccard similarity reaches ``threshold`` are
+clustered, and each cluster is replaced by one representative carrying how
+many posts and which sources it stands for.
+"""
+
+import re
+import hashlib
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16
+
+# Estimated shingle Jaccard similarity at which two posts are the same story
+DEFAULT_THRESHOLD = 0.5
+
+SHINGLE_SIZE = 3
+
+TEXT_FIELDS = ('title', 'headline', 'text', 'summary')
+
+_URL = re.compile(r'https?://\S+')
+_WORD = re.compile(r'[a-z0-9]+')
+
+# Universal hashing (a * h + b) mod p for the MinHash permutations; with h, a, b < p < 2**31
+# every a * h + b stays below 2**62, so the uint64 arithmetic never wraps
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+
+
+def post_text(post):
+    """All the text of a post, whichever scraper produced it."""
+    return ' '.join(str(post.get(field) or '') for field in TEXT_FIELDS).strip()
+
+
+def shingles(text):
+    """Distinct word ``SHINGLE_SIZE``-grams of ``text`` (its words if it is shorter)."""
+    words = _WORD.findall(_URL.sub(' ', text.lower()))
+    if len(words) < SHINGLE_SIZE:
+        return set(words)
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set):
+    """MinHash signature (``NUM_PERM`` values) of a non-empty shingle set."""
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'big') for s in shingle_set),
+        dtype=np.uint64, count=len(shingle_set)
+    )
+    return ((np.outer(hashes % _PRIME, _A) + _B) % _PRIME).min(axis=0)
+
+
+def cluster(signatures, threshold=DEFAULT_THRESHOLD, bands=BANDS):
+    """
+    Group signatures whose estimated Jaccard similarity reaches ``threshold`` (transitively).
+
+    :return: list of clusters, each a list of indexes into ``signatures`` in input order
+    """
+    parent = list(range(len(signatures)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = NUM_PERM // bands
+    buckets = {}
+    for i, signature in enumerate(signatures):
+        for band in range(bands):
+            key = (band, signature[band * rows:(band + 1) * rows].tobytes())
+            for j in buckets.setdefault(key, []):
+                if find(i) != find(j) and np.mean(signature == signatures[j]) >= threshold:
+                    parent[find(i)] = find(j)
+            buckets[key].append(i)
+
+    groups = {}
+    for i in range(len(signatures)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values())
+
+
+def collapse_near_duplicates(posts, threshold=DEFAULT_THRESHOLD):
+    """
+    Replace each cluster of near-identical posts by one representative.
+
+    The representative is the post with the most text; it gains
+    ``duplicate_count`` (posts in the cluster) and ``sources`` (distinct
+    sources that carried it). Posts without any text are kept as they are.
+
+    :return: list of representative posts in first-seen order
+    """
+    texts = [post_text(post) for post in posts]
+    shingle_sets = [shingles(text) for text in texts]
+    indexed = [i for i in range(len(posts)) if shingle_sets[i]]
+    signatures = [minhash(shingle_sets[i]) for i in indexed]
+    clusters = [[indexed[k] for k in group] for group in cluster(signatures, threshold)]
+    clusters += [[i] for i in range(len(posts)) if not shingle_sets[i]]
+
+    collapsed = []
+    for group in sorted(clusters):
+        representative = max(group, key=lambda i: (len(texts[i]), -i))
+        sources = []
+        for i in group:
+            source = posts[i].get('source', '')
+            if source not in sources:
+                sources.append(source)
+        collapsed.append({**posts[representative], 'duplicate_count': len(group), 'sources': sources})
+    return collapsed
@@ -0,0 +1,193 @@
+"""
+Lazily loaded, batched NLP scoring for social/news posts.
+
+Sentiment (VADER, falling back to TextBlob) and named entities (spaCy) are
+only loaded the first time a batch is scored, so importing the sweep costs
+nothing when NLP is never used. Entities are extracted with ``nlp.pipe``
+over the whole batch with the pipes NER does not need disabled, and large
+batches are spread over several processes.
+
+Results are cached in SQLite keyed by a hash of the post text and the
+backends that produced them, so re-sweeping the same posts costs nothing.
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+import logging
+import threading
+from importlib.util import find_spec
+
+SPACY_AVAILABLE = find_spec("spacy") is not None
+VADER_AVAILABLE = find_spec("vaderSentiment") is not None
+TEXTBLOB_AVAILABLE = find_spec("textblob") is not None
+
+SPACY_MODEL = "en_core_web_sm"
+
+# Pipes entity recognition does not need
+SPACY_DISABLE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+DEFAULT_BATCH_SIZE = 64
+
+# Batches at least this large are spread over several processes
+MULTIPROCESS_THRESHOLD = 500
+MAX_PROCESSES = 4
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "TITAN_NLP_CACHE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'nlp_cache'))
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    key TEXT PRIMARY KEY,
+    sentiment REAL NOT NULL,
+    entities TEXT NOT NULL
+);
+"""
+
+
+def content_hash(text, backend):
+    return hashlib.sha256(f"{backend}\0{text}".encode("utf-8")).hexdigest()
+
+
+class NLPService:
+    """
+    Scores batches of texts for sentiment and entities.
+
+    Attributes
+    ----------
+    cache_dir : str
+        Directory holding ``nlp_cache.sqlite`` (None disables the cache)
+    batch_size : int
+        Texts per ``nlp.pipe`` batch
+    n_process : int
+        spaCy worker processes (default: several for large batches, else one)
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, batch_size=DEFAULT_BATCH_SIZE, n_process=None):
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._nlp = None
+        self._sentiment = None
+        self._db = None
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if VADER_AVAILABLE:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                self._sentiment = ("vader", SentimentIntensityAnalyzer())
+            elif TEXTBLOB_AVAILABLE:
+                from textblob import TextBlob
+                self._sentiment = ("textblob", TextBlob)
+            if SPACY_AVAILABLE:
+                import spacy
+                try:
+                    self._nlp = spacy.load(SPACY_MODEL, disable=SPACY_DISABLE)
+                except OSError:
+                    print(f"[WARN] spaCy model '{SPACY_MODEL}' not installed, skipping entity recognition.")
+            if self.cache_dir:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self._db = sqlite3.connect(os.path.join(self.cache_dir, "nlp_cache.sqlite"), check_same_thread=False)
+                self._db.executescript(_SCHEMA)
+
+    @property
+    def backend(self):
+        """Identifies the models behind a score, so cached scores from other backends are not reused."""
+        self._load()
+        sentiment = self._sentiment[0] if self._sentiment else "none"
+        entities = f"spacy:{SPACY_MODEL}:{self._nlp.meta.get('version', '')}" if self._nlp is not None else "none"
+        return f"{sentiment}|{entities}"
+
+    def _polarity(self, text):
+        if self._sentiment is None:
+            return 0
+        name, analyzer = self._sentiment
+        if name == "vader":
+            return analyzer.polarity_scores(text)['compound']
+        return analyzer(text).sentiment.polarity
+
+    def _entities(self, texts):
+        if self._nlp is None:
+            return [[] for _ in texts]
+        n_process = self.n_process
+        if n_process is None:
+            n_process = min(os.cpu_count() or 1, MAX_PROCESSES) if len(texts) >= MULTIPROCESS_THRESHOLD else 1
+        docs = self._nlp.pipe(texts, batch_size=self.batch_size, n_process=n_process)
+        return [[(ent.text, ent.label_) for ent in doc.ents] for doc in docs]
+
+    def _cached(self, keys):
+        if self._db is None:
+            return {}
+        found = {}
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, sentiment, entities FROM scores WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, sentiment, entities in rows:
+                    found[key] = {'sentiment': sentiment, 'entities': [tuple(e) for e in json.loads(entities)]}
+        return found
+
+    def _store(self, scored):
+        if self._db is None:
+            return
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?)",
+                [(key, score['sentiment'], json.dumps(score['entities'])) for key, score in scored.items()]
+            )
+
+    def score(self, texts):
+        """
+        Sentiment and entities for each text.
+
+        :param texts: list of str
+        :return: list of {'sentiment': float, 'entities': [(text, label), ...]} in input order
+        """
+        backend = self.backend
+        keys = [content_hash(text, backend) for text in texts]
+        results = self._cached(list(set(keys)))
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in results:
+                missing.setdefault(key, text)
+        if missing:
+            missing_texts = list(missing.values())
+            entities = self._entities(missing_texts)
+            scored = {
+                key: {'sentiment': self._polarity(text), 'entities': ents}
+                for key, text, ents in zip(missing, missing_texts, entities)
+            }
+            self._store(scored)
+            results.update(scored)
+        logging.info(f"NLP scored {len(missing)} new of {len(texts)} texts (rest from cache).")
+        return [results[key] for key in keys]
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_nlp_service():
+    """Return the process-wide ``NLPService`` (models load on first use)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = NLPService()
+    return _service
@@ -1,20 +1,24 @@
 import pandas as pd
 import os
+import argparse
 from colorama import Fore, Style, init
+
+try:
+    from utilities.nrl_dataset import (DEFAULT_COMP, PYARROW_AVAILABLE, drop_season, ensure_current, mark_current,
+                                       read_table, season_path, seasons, table_source, write_table)
+    from utilities.build_manifest import BuildManifest, partition_hashes, partition_key
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from nrl_dataset import (DEFAULT_COMP, PYARROW_AVAILABLE, drop_season, ensure_current, mark_current,
+                             read_table, season_path, seasons, table_source, write_table)
+    from build_manifest import BuildManifest, partition_hashes, partition_key
 init(autoreset=True)
 
 # This script normalises the flattened NRL match data for ML and reporting.
 # It reads all_matches_2019_2025.csv, cleans/standardises columns, and outputs normalised_all_matches_2019_2025.csv.
+# Only seasons whose match partitions changed since the last run (per the build manifest) are normalised again.
 
-def main():
-    input_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'outputs', 'all_matches_2019_2025.csv'))
-    output_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'outputs', 'normalised_all_matches_2019_2025.csv'))
-    if not os.path.exists(input_path):
-        print(Fore.RED + f"[ERROR] Input file not found: {input_path}" + Style.RESET_ALL)
-        return
-    print(Fore.CYAN + f"[INFO] Loading: {input_path}" + Style.RESET_ALL)
-    df = pd.read_csv(input_path)
-
+def normalise(df):
     # Example normalisation: lower-case column names, fill missing values, strip whitespace
     df.columns = [c.strip().lower().replace(' ', '_') for c in df.columns]
     df = df.applymap(lambda x: x.strip() if isinstance(x, str) else x)
@@ -24,10 +28,58 @@ def main():
     for col in df.columns:
         if any(s in col for s in ['score', 'round', 'year', 'margin']):
             df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    return df
+
+def main(force=False, comp=DEFAULT_COMP):
+    input_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'outputs', 'all_matches_2019_2025.csv'))
+    output_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'outputs', 'normalised_all_matches_2019_2025.csv'))
+    if not os.path.exists(input_path):
+        print(Fore.RED + f"[ERROR] Input file not found: {input_path}" + Style.RESET_ALL)
+        return
+    if not PYARROW_AVAILABLE:
+        print(Fore.CYAN + f"[INFO] Loading: {input_path}" + Style.RESET_ALL)
+        df = normalise(pd.read_csv(input_path))
+        print(Fore.GREEN + f"[SUCCESS] Normalised data shape: {df.shape}" + Style.RESET_ALL)
+        df.to_csv(output_path, index=False)
+        print(Fore.GREEN + f"[SUCCESS] Normalised data saved to {output_path}" + Style.RESET_ALL)
+        return
+
+    matches_root = ensure_current("matches", input_path)
+    # Seasons written for another CSV (or before sources were recorded) are not reused
+    force = force or table_source("normalised_matches", comp) != output_path
+    manifest = BuildManifest()
+    years = seasons("matches", comp, matches_root)
+    hashes = partition_hashes(manifest, "matches", comp, years, matches_root)
+    inputs = {year: {partition_key("matches", comp, year): hashes[partition_key("matches", comp, year)]}
+              for year in years}
+    changed = [year for year in years if force or not manifest.is_current(
+        "normalise", partition_key("normalised_matches", comp, year), inputs[year],
+        [season_path("normalised_matches", comp, year)])]
+    removed = [year for year in seasons("normalised_matches", comp) if year not in years]
+    if not changed and not removed and os.path.exists(output_path):
+        print(Fore.GREEN + f"[INFO] No match seasons changed, keeping {output_path}" + Style.RESET_ALL)
+        return
+    print(Fore.CYAN + f"[INFO] Normalising seasons {changed} from {input_path}, reusing {len(years) - len(changed)} unchanged" + Style.RESET_ALL)
+    for year in changed + removed:
+        drop_season("normalised_matches", comp, year)
+    if changed:
+        df = normalise(read_table("matches", years=changed, comp=comp, root=matches_root))
+        write_table("normalised_matches", df, comp=comp, replace=False, source_csv=output_path)
 
+    # Every season read back from the dataset, so reused and fresh seasons have the same types
+    df = read_table("normalised_matches", years=years, comp=comp).sort_values(['year', 'round'], kind='stable', ignore_index=True)
     print(Fore.GREEN + f"[SUCCESS] Normalised data shape: {df.shape}" + Style.RESET_ALL)
     df.to_csv(output_path, index=False)
+    mark_current("normalised_matches", source_csv=output_path, comp=comp)
+    for year in changed:
+        manifest.record("normalise", partition_key("normalised_matches", comp, year), inputs[year],
+                        [season_path("normalised_matches", comp, year)])
+    for year in removed:
+        manifest.forget("normalise", partition_key("normalised_matches", comp, year))
+    manifest.save()
     print(Fore.GREEN + f"[SUCCESS] Normalised data saved to {output_path}" + Style.RESET_ALL)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Normalise the flattened NRL match data.")
+    parser.add_argument('--force', action='store_true', help='Normalise every season, even if unchanged since the last run')
+    main(parser.parse_args().force)
@@ -0,0 +1,367 @@
+"""
+Columnar Parquet store for the flattened NRL tables.
+
+Each table in ``TABLES`` is a Hive-partitioned Parquet dataset under
+``data/dataset/<table>/``, one directory per competition, year and round:
+
+    data/dataset/matches/comp=NRL/Year=2024/Round=7/part-0.parquet
+
+Columns are cast to a fixed schema on write (the declared types in
+``TABLES``, other columns typed from the DataFrame), saved alongside as
+``_common_metadata``, so every partition reads back with the same types.
+``read_table`` loads only the requested columns, and year/round/comp
+filters prune whole partition directories before any file is opened;
+other ``filters`` are checked against Parquet row-group statistics:
+
+    read_table("matches", columns=["HomeTeam", "HomeScore"], years=range(2023, 2026))
+
+The flatten stages write the tables next to their CSVs and record that
+CSV's path in the table's metadata. Consumers pass the CSV they used to
+read as ``source_csv``: the table is read when it was written from that
+CSV, otherwise the CSV is imported into a dataset of its own under
+``data/dataset/_sources/`` (keyed on its path), so CSVs with different
+layouts or filters never overwrite one another. A table missing or older
+than its CSV is imported first, and without pyarrow ``read_table`` falls
+back to reading the CSV.
+"""
+
+import os
+import hashlib
+import shutil
+import logging
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DATASET_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'dataset'))
+
+DEFAULT_COMP = "NRL"
+COMP_COLUMN = "comp"
+
+# Schema metadata key prefix of the CSV each competition was written next to or imported from
+SOURCE_KEY = "source_csv"
+SOURCES_DIR = "_sources"
+
+
+def _source_key(comp):
+    return f"{SOURCE_KEY}.{comp}".encode()
+
+# Schema of every partition; partition directories are pruned without reading them
+SCHEMA_FILE = "_common_metadata"
+
+
+def _match_types(year, round_, home, away, home_score, away_score, venue, date, url):
+    return {year: "int16", round_: "int16", home: "string", away: "string", home_score: "int16",
+            away_score: "int16", venue: "string", date: "string", url: "string"}
+
+
+# Table -> year and round columns (the partition keys after the competition) and declared column types
+TABLES = {
+    "matches": {
+        "year": "Year", "round": "Round",
+        "types": _match_types("Year", "Round", "HomeTeam", "AwayTeam", "HomeScore", "AwayScore", "Venue", "Date",
+                              "MatchCentreURL"),
+    },
+    "normalised_matches": {
+        "year": "year", "round": "round",
+        "types": _match_types("year", "round", "hometeam", "awayteam", "homescore", "awayscore", "venue", "date",
+                              "matchcentreurl"),
+    },
+    # One row per team per match
+    "detailed_matches": {
+        "year": "Year", "round": "Round",
+        "types": {"Year": "int16", "Round": "int16", "HomeTeam": "string", "AwayTeam": "string", "Side": "string",
+                  "MatchKey": "string"},
+    },
+    # One row per match as harvested, with the match/home/away sections as text
+    "detailed_raw": {
+        "year": "Year", "round": "Round",
+        "types": {"Year": "int16", "Round": "int16", "MatchKey": "string", "match": "string", "home": "string",
+                  "away": "string"},
+    },
+    "players": {
+        "year": "Year", "round": "Round",
+        "types": {"Year": "int16", "Round": "int16", "MatchKey": "string", "Name": "string", "Number": "string",
+                  "Position": "string", "Team": "string"},
+    },
+}
+
+
+def table_path(name, root=DATASET_ROOT):
+    if name not in TABLES:
+        raise KeyError(f"Unknown table '{name}', expected one of {sorted(TABLES)}")
+    return os.path.join(root, name)
+
+
+def exists(name, root=DATASET_ROOT):
+    return os.path.exists(os.path.join(table_path(name, root), SCHEMA_FILE))
+
+
+def season_path(name, comp, year, root=DATASET_ROOT):
+    """Directory holding every round partition of one competition season."""
+    return os.path.join(table_path(name, root), f"{COMP_COLUMN}={comp}", f"{TABLES[name]['year']}={year}")
+
+
+def seasons(name, comp=DEFAULT_COMP, root=DATASET_ROOT):
+    """Years with a partition directory for ``comp``, in order."""
+    comp_dir = os.path.join(table_path(name, root), f"{COMP_COLUMN}={comp}")
+    if not os.path.isdir(comp_dir):
+        return []
+    prefix = f"{TABLES[name]['year']}="
+    return sorted(int(entry[len(prefix):]) for entry in os.listdir(comp_dir)
+                  if entry.startswith(prefix) and entry[len(prefix):].lstrip("-").isdigit())
+
+
+def drop_season(name, comp, year, root=DATASET_ROOT):
+    """Remove a season's partitions, so rounds missing from its rewrite do not linger."""
+    path = season_path(name, comp, year, root)
+    if os.path.exists(path):
+        shutil.rmtree(path)
+
+
+def _partition_schema(name):
+    spec = TABLES[name]
+    return pa.schema([(COMP_COLUMN, pa.string()), (spec["year"], pa.int16()), (spec["round"], pa.int16())])
+
+
+def _arrow_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return pa.bool_()
+    if pd.api.types.is_integer_dtype(dtype):
+        return pa.int64()
+    if pd.api.types.is_float_dtype(dtype):
+        return pa.float64()
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return pa.from_numpy_dtype(dtype) if getattr(dtype, "tz", None) is None else pa.timestamp("ns", tz=str(dtype.tz))
+    return pa.string()
+
+
+def _column_array(series, arrow_type):
+    if pa.types.is_string(arrow_type):
+        series = series.where(series.isna(), series.astype(str))
+    elif pa.types.is_integer(arrow_type) and not pd.api.types.is_integer_dtype(series.dtype):
+        series = pd.to_numeric(series, errors="coerce").astype("Int64")
+    elif pa.types.is_floating(arrow_type) and not pd.api.types.is_float_dtype(series.dtype):
+        series = pd.to_numeric(series, errors="coerce")
+    return pa.array(series, type=arrow_type, from_pandas=True)
+
+
+def _round_from_match_key(df):
+    """Year and round from ``MatchKey`` values like ``2024-7-Storm-v-Broncos``."""
+    parts = df["MatchKey"].astype(str).str.extract(r"^(\d{4})-(\d+)-")
+    return pd.to_numeric(parts[0], errors="coerce"), pd.to_numeric(parts[1], errors="coerce")
+
+
+def to_arrow(name, df, comp=DEFAULT_COMP, schema=None):
+    """
+    Cast ``df`` to the table's schema as a ``pyarrow.Table``.
+
+    ``schema`` (the stored schema when appending partitions) wins, then the
+    declared types, then types inferred from the DataFrame's dtypes.
+    Missing partition columns are filled in (year/round from ``MatchKey``).
+    """
+    spec = TABLES[name]
+    df = df.copy()
+    if COMP_COLUMN not in df.columns:
+        df[COMP_COLUMN] = comp
+    if (spec["year"] not in df.columns or spec["round"] not in df.columns) and "MatchKey" in df.columns:
+        year, round_ = _round_from_match_key(df)
+        df[spec["year"]] = df[spec["year"]] if spec["year"] in df.columns else year
+        df[spec["round"]] = df[spec["round"]] if spec["round"] in df.columns else round_
+    for column in (spec["year"], spec["round"]):
+        if column not in df.columns:
+            df[column] = None
+    stored = {field.name: field.type for field in schema} if schema is not None else {}
+    fields, arrays = [], []
+    for column in df.columns:
+        column = str(column)
+        if column in stored:
+            arrow_type = stored[column]
+        elif column in spec["types"] or column == COMP_COLUMN:
+            arrow_type = pa.type_for_alias(spec["types"].get(column, "string"))
+        else:
+            arrow_type = _arrow_type(df[column].dtype)
+        fields.append(pa.field(column, arrow_type))
+        arrays.append(_column_array(df[column], arrow_type))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def _merge_schemas(old, new):
+    """``old`` with any columns only in ``new`` appended."""
+    merged = old
+    for field in new:
+        if old.get_field_index(field.name) == -1:
+            merged = merged.append(field)
+    return merged
+
+
+def _with_source(schema, comp, source_csv):
+    return schema.with_metadata({**(schema.metadata or {}), _source_key(comp): os.path.abspath(source_csv).encode()})
+
+
+def write_table(name, df, comp=DEFAULT_COMP, replace=True, root=DATASET_ROOT, source_csv=None):
+    """
+    Write ``df`` as the table's Parquet partitions.
+
+    :param replace: replace the whole table (default), or only the
+        comp/year/round partitions present in ``df`` (appending a season)
+    :param source_csv: CSV written with the same rows, recorded so readers
+        of that CSV read this table (kept from the stored schema if None)
+    """
+    if not PYARROW_AVAILABLE:
+        logging.warning(f"pyarrow is not installed, the {name} dataset was not written.")
+        return None
+    path = table_path(name, root)
+    existing = read_schema(name, root) if not replace and exists(name, root) else None
+    table = to_arrow(name, df, comp, existing)
+    schema = table.schema if existing is None else _merge_schemas(existing, table.schema)
+    if source_csv is not None:
+        schema = _with_source(schema, comp, source_csv)
+    target = f"{path}.tmp-{os.getpid()}" if replace else path
+    if replace and os.path.exists(target):
+        shutil.rmtree(target)
+    ds.write_dataset(
+        table, target, format="parquet",
+        partitioning=ds.partitioning(_partition_schema(name), flavor="hive"),
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+    )
+    pq.write_metadata(schema, os.path.join(target, SCHEMA_FILE))
+    if replace:
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(target, path)
+    logging.info(f"Wrote {table.num_rows} rows to the {name} dataset at {path}")
+    return path
+
+
+def read_schema(name, root=DATASET_ROOT):
+    return pq.read_schema(os.path.join(table_path(name, root), SCHEMA_FILE))
+
+
+def table_source(name, comp=DEFAULT_COMP, root=DATASET_ROOT):
+    """Path of the CSV the competition's rows were written from, or None."""
+    if not exists(name, root):
+        return None
+    source = (read_schema(name, root).metadata or {}).get(_source_key(comp))
+    return source.decode() if source is not None else None
+
+
+def source_root(name, source_csv, comp=DEFAULT_COMP, root=DATASET_ROOT):
+    """Dataset root holding the table as written from ``source_csv``: ``root`` if it was, else one keyed on the CSV."""
+    source_csv = os.path.abspath(source_csv)
+    if table_source(name, comp, root) == source_csv:
+        return root
+    return os.path.join(root, SOURCES_DIR, hashlib.sha1(source_csv.encode()).hexdigest()[:12])
+
+
+def is_stale(name, source_csv, comp=DEFAULT_COMP, root=DATASET_ROOT):
+    """True if the table is missing, was written from another CSV, or ``source_csv`` was written after it."""
+    if table_source(name, comp, root) != os.path.abspath(source_csv):
+        return True
+    built_at = os.path.getmtime(os.path.join(table_path(name, root), SCHEMA_FILE))
+    return os.path.exists(source_csv) and os.path.getmtime(source_csv) > built_at
+
+
+def mark_current(name, root=DATASET_ROOT, source_csv=None, comp=DEFAULT_COMP):
+    """Mark the table as newer than a CSV that was just written from it (recorded as its source if given)."""
+    path = os.path.join(table_path(name, root), SCHEMA_FILE)
+    if source_csv is not None and table_source(name, comp, root) != os.path.abspath(source_csv):
+        pq.write_metadata(_with_source(read_schema(name, root), comp, source_csv), path)
+    else:
+        os.utime(path)
+
+
+def import_csv(name, source_csv, comp=DEFAULT_COMP, root=DATASET_ROOT):
+    """(Re)build a table from its CSV."""
+    print(f"[INFO] Importing {source_csv} into the {name} dataset...")
+    return write_table(name, pd.read_csv(source_csv, low_memory=False), comp=comp, root=root, source_csv=source_csv)
+
+
+def ensure_current(name, source_csv, root=DATASET_ROOT):
+    """
+    Import ``source_csv`` if its table is missing or older than it.
+
+    :return: the dataset root to read the table from (``root`` when the
+        table there was written from ``source_csv`` or the CSV is missing)
+    """
+    if not PYARROW_AVAILABLE or not os.path.exists(source_csv):
+        return root
+    root = source_root(name, source_csv, root=root)
+    if is_stale(name, source_csv, root=root):
+        import_csv(name, source_csv, root=root)
+    return root
+
+
+def _as_list(values):
+    if values is None:
+        return None
+    if isinstance(values, (int, str)):
+        return [values]
+    return list(values)
+
+
+def _filter_expression(name, years, rounds, comp, filters):
+    spec = TABLES[name]
+    expression = None
+    for column, values in ((spec["year"], _as_list(years)), (spec["round"], _as_list(rounds)),
+                           (COMP_COLUMN, _as_list(comp))):
+        if values is not None:
+            condition = pc.field(column).isin(values)
+            expression = condition if expression is None else expression & condition
+    if filters is not None:
+        condition = filters if isinstance(filters, pc.Expression) else pq.filters_to_expression(filters)
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _read_csv(name, source_csv, columns, years, rounds, filters):
+    """Fallback read without pyarrow: the CSV, filtered with pandas."""
+    spec = TABLES[name]
+    if filters is not None:
+        raise ImportError("pyarrow is required for read_table filters")
+    wanted = None if columns is None else set(columns) | {spec["year"], spec["round"]}
+    df = pd.read_csv(source_csv, usecols=lambda column: wanted is None or column in wanted, low_memory=False)
+    for column, values in ((spec["year"], _as_list(years)), (spec["round"], _as_list(rounds))):
+        if values is not None:
+            df = df[pd.to_numeric(df[column], errors="coerce").isin(values)]
+    return df.reset_index(drop=True) if columns is None else df[list(columns)].reset_index(drop=True)
+
+
+def read_table(name, columns=None, years=None, rounds=None, comp=DEFAULT_COMP, filters=None, source_csv=None,
+               root=DATASET_ROOT):
+    """
+    Load a table, reading only the requested columns and partitions.
+
+    :param columns: columns to load (default all; ``comp`` only when asked for)
+    :param years: year or years to load
+    :param rounds: round or rounds to load
+    :param comp: competition or competitions to load (None for every one)
+    :param filters: extra row filter, a ``pyarrow.compute`` expression or
+        pandas-style ``[("HomeScore", ">", 30)]`` tuples
+    :param source_csv: CSV the table is imported from when missing or stale
+    :return: DataFrame
+    """
+    if not PYARROW_AVAILABLE:
+        if source_csv is None:
+            raise ImportError(f"pyarrow is required to read the {name} dataset without a source CSV")
+        return _read_csv(name, source_csv, columns, years, rounds, filters)
+    if source_csv is not None:
+        root = ensure_current(name, source_csv, root)
+    if not exists(name, root):
+        raise FileNotFoundError(f"No {name} dataset at {table_path(name, root)}")
+    schema = read_schema(name, root)
+    dataset = ds.dataset(table_path(name, root), schema=schema, format="parquet",
+                         partitioning=ds.partitioning(_partition_schema(name), flavor="hive"))
+    if columns is None:
+        columns = [field for field in schema.names if field != COMP_COLUMN]
+    table = dataset.to_table(columns=list(columns), filter=_filter_expression(name, years, rounds, comp, filters))
+    return table.to_pandas()
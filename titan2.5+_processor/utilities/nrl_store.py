@@ -0,0 +1,531 @@
+"""
+Embedded analytical store of the flattened NRL data.
+
+The flatten stage builds a local database from the match, detailed-match
+and player tables, with one row per entity and integer keys:
+
+- ``teams`` / ``players``: ``team_id`` / ``player_id`` and ``name``;
+- ``matches``: one row per match (``match_id``, ``comp``, ``year``,
+  ``round``, home/away team ids and scores, venue, kickoff);
+- ``team_games``: one row per team per match (points for/against, margin,
+  and the team stats of the detailed match data);
+- ``player_games``: one row per player per match (``team_id``,
+  ``player_id``, number, position and stats);
+- ``officials``: one row per official per match;
+- ``weather``: conditions per match, with the cached hourly weather
+  nearest kickoff when ``weather_history`` has it.
+
+Game tables are indexed on (year, round, team_id) and ``player_id``, so
+lookups and joins run in the engine instead of as DataFrame scans:
+
+    store = get_store()
+    store.team_players("Storm", 2024, 7)
+    store.recent_form("Storm", 2024, 7, window=3)
+    store.query("SELECT year, AVG(margin) FROM team_games GROUP BY year")
+
+DuckDB is used when it is installed, SQLite otherwise (same tables and
+SQL for everything in the API). Ids are assigned when the store is built;
+players are identified by name.
+"""
+
+import os
+import re
+import ast
+import sqlite3
+import logging
+import argparse
+import threading
+
+import pandas as pd
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+try:
+    from utilities.nrl_dataset import DEFAULT_COMP, exists, read_table
+    from utilities.weather_history import DEFAULT_CACHE_PATH as WEATHER_CACHE_PATH, WEATHER_COLUMNS, HourlyWeatherCache
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from nrl_dataset import DEFAULT_COMP, exists, read_table
+    from weather_history import DEFAULT_CACHE_PATH as WEATHER_CACHE_PATH, WEATHER_COLUMNS, HourlyWeatherCache
+
+STORE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'store'))
+STORE_FILES = {"duckdb": "nrl.duckdb", "sqlite": "nrl.sqlite"}
+
+# Table -> indexed column groups
+INDEXES = {
+    "teams": [("team_id",), ("name",)],
+    "players": [("player_id",), ("name",)],
+    "matches": [("match_id",), ("year", "round", "home_team_id"), ("year", "round", "away_team_id")],
+    "team_games": [("year", "round", "team_id"), ("match_id",)],
+    "player_games": [("year", "round", "team_id"), ("player_id",), ("match_id",)],
+    "officials": [("match_id",), ("name",)],
+    "weather": [("match_id",)],
+}
+
+_MATCH_KEYS = ["comp", "year", "round", "home_team", "away_team"]
+_PLAYER_KEY = re.compile(r"^(\d{4})-(\d+)-(.+)-v-(.+)$")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+# Value the scraper writes for a stat it did not collect
+NOT_COLLECTED = -1
+
+# A season whose mean of a stat is outside this factor of the median season mean is reported
+SEASON_MEAN_TOLERANCE = 2.0
+
+
+def default_engine():
+    return "duckdb" if DUCKDB_AVAILABLE else "sqlite"
+
+
+def default_path(engine=None):
+    return os.path.join(STORE_DIR, STORE_FILES[engine or default_engine()])
+
+
+def store_exists(path=None, engine=None):
+    return os.path.exists(path or default_path(engine))
+
+
+# ---------------------------------------------------------------------------
+# Building the tables
+# ---------------------------------------------------------------------------
+
+def _column_name(label):
+    return re.sub(r"[^0-9a-z]+", "_", str(label).strip().lower()).strip("_")
+
+
+def _stat_value(value):
+    """
+    Number from a harvested stat: ``1,870`` -> 1870, ``78%`` -> 78, ``26:17`` -> 26.28 minutes, ``8/10`` -> 8.
+
+    The scraper's ``-1`` "not collected" marker becomes None (NULL), so it
+    does not drag down aggregates.
+    """
+    if value is not None and not isinstance(value, (int, float)):
+        text = str(value).replace(",", "").strip()
+        if re.fullmatch(r"\d+:\d{2}", text):
+            minutes, seconds = text.split(":")
+            return round(int(minutes) + int(seconds) / 60, 2)
+        number = _NUMBER.match(text)
+        value = float(number.group()) if number else None
+    return None if value == NOT_COLLECTED else value
+
+
+def _as_dict(value):
+    """A detailed match section: a dict, or its text form once read back from CSV or Parquet."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str) and value.startswith("{"):
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return {}
+    return {}
+
+
+def _ints(values):
+    return pd.to_numeric(values, errors="coerce").astype("Int64")
+
+
+def _match_frame(matches, comp):
+    return pd.DataFrame({
+        "comp": comp,
+        "year": _ints(matches["Year"]),
+        "round": _ints(matches["Round"]),
+        "home_team": matches["HomeTeam"].astype("string"),
+        "away_team": matches["AwayTeam"].astype("string"),
+        "home_score": _ints(matches["HomeScore"]),
+        "away_score": _ints(matches["AwayScore"]),
+        "venue": matches.get("Venue", pd.Series(index=matches.index, dtype="string")).astype("string"),
+        "kickoff": matches.get("Date", pd.Series(index=matches.index, dtype="string")).astype("string"),
+        "match_centre_url": matches.get("MatchCentreURL", pd.Series(index=matches.index, dtype="string")).astype("string"),
+    })
+
+
+def _detailed_frame(detailed, comp):
+    """Detailed rows keyed like the matches (``MatchKey`` is ``"Home v Away"``) with their parsed sections."""
+    teams = detailed["MatchKey"].astype(str).str.split(" v ", n=1, expand=True).reindex(columns=[0, 1])
+    return pd.DataFrame({
+        "comp": comp,
+        "year": _ints(detailed["Year"]),
+        "round": _ints(detailed["Round"]),
+        "home_team": teams[0].astype("string"),
+        "away_team": teams[1].astype("string"),
+        "match": [_as_dict(value) for value in detailed.get("match", pd.Series(index=detailed.index))],
+        "home": [_as_dict(value) for value in detailed.get("home", pd.Series(index=detailed.index))],
+        "away": [_as_dict(value) for value in detailed.get("away", pd.Series(index=detailed.index))],
+    })
+
+
+def _player_frame(players, comp):
+    """Player rows keyed like the matches, with the team each played for."""
+    key = players["MatchKey"].astype(str).str.extract(_PLAYER_KEY)
+    frame = pd.DataFrame({
+        "comp": comp,
+        "year": _ints(players["Year"]),
+        "round": _ints(players["Round"]),
+        "home_team": key[2].astype("string"),
+        "away_team": key[3].astype("string"),
+        "player": players["Name"].astype("string"),
+        "number": players.get("Number", pd.Series(index=players.index, dtype="string")).astype("string"),
+        "position": players.get("Position", pd.Series(index=players.index, dtype="string")).astype("string"),
+    })
+    if "Team" in players.columns:
+        frame["team"] = players["Team"].astype("string")
+    else:
+        # Match centre rows list the home side, then the away side
+        order = players.groupby("MatchKey", sort=False).cumcount()
+        size = players.groupby("MatchKey", sort=False)["MatchKey"].transform("size")
+        frame["team"] = frame["home_team"].where(order < size // 2, frame["away_team"])
+    fixed = {"Year", "Round", "MatchKey", "Name", "Number", "Position", "Team"}
+    for column in players.columns:
+        if column not in fixed:
+            frame[_column_name(column)] = pd.to_numeric(players[column], errors="coerce")
+    return frame
+
+
+def _slug(name):
+    """Team name as spelt in player match keys (``Sea Eagles`` -> ``sea-eagles``)."""
+    return str(name).strip().replace(" ", "-").lower()
+
+
+def _ids(names, id_column):
+    names = sorted({name for name in names if isinstance(name, str) and name})
+    return pd.DataFrame({id_column: range(1, len(names) + 1), "name": pd.array(names, dtype="string")})
+
+
+def _hourly_weather(weather):
+    """Cached hourly weather nearest each kickoff (nothing is fetched)."""
+    if not os.path.exists(WEATHER_CACHE_PATH) or weather.empty:
+        return weather
+    cache = HourlyWeatherCache(WEATHER_CACHE_PATH)
+    try:
+        hourly = cache.frame(weather["venue"].dropna().unique()).rename(columns={"Venue": "venue"}).sort_values("time")
+    finally:
+        cache.close()
+    kickoff = pd.to_datetime(weather["kickoff"], utc=True, errors="coerce").astype("datetime64[ns, UTC]")
+    known = weather.assign(kickoff_utc=kickoff)[kickoff.notna() & weather["venue"].notna()]
+    if hourly.empty or known.empty:
+        return weather
+    joined = pd.merge_asof(
+        known.reset_index().sort_values("kickoff_utc"), hourly, left_on="kickoff_utc", right_on="time", by="venue",
+        direction="nearest", tolerance=pd.Timedelta(minutes=30)
+    ).set_index("index")
+    for column in WEATHER_COLUMNS.values():
+        weather[column] = joined[column].reindex(weather.index)
+    return weather
+
+
+def build_tables(sources):
+    """
+    Normalised store tables from the flattened tables.
+
+    :param sources: dict of comp -> dict with ``matches`` and optionally
+        ``detailed_raw`` and ``players`` DataFrames (flattened columns)
+    :return: dict of table name -> DataFrame
+    """
+    match_frames, detailed_frames, player_frames = [], [], []
+    for comp, frames in sources.items():
+        match_frames.append(_match_frame(frames["matches"], comp))
+        if frames.get("detailed_raw") is not None and not frames["detailed_raw"].empty:
+            detailed_frames.append(_detailed_frame(frames["detailed_raw"], comp))
+        if frames.get("players") is not None and not frames["players"].empty:
+            player_frames.append(_player_frame(frames["players"], comp))
+    matches = pd.concat(match_frames, ignore_index=True)
+    matches = matches[matches["year"].notna() & matches["round"].notna()].drop_duplicates(_MATCH_KEYS)
+    matches = matches.sort_values(["comp", "year", "round"], kind="stable", ignore_index=True)
+    matches.insert(0, "match_id", range(1, len(matches) + 1))
+    detailed = pd.concat(detailed_frames, ignore_index=True) if detailed_frames else None
+    player_rows = pd.concat(player_frames, ignore_index=True) if player_frames else None
+
+    teams = _ids(pd.concat([matches["home_team"], matches["away_team"]]), "team_id")
+    team_id = dict(zip(teams["name"], teams["team_id"]))
+    for side in ("home", "away"):
+        matches.insert(matches.columns.get_loc(f"{side}_team"), f"{side}_team_id", matches[f"{side}_team"].map(team_id).astype("Int64"))
+
+    # Two team games per match; detailed team stats joined by side
+    sides = []
+    for side, opponent, is_home in (("home", "away", 1), ("away", "home", 0)):
+        sides.append(pd.DataFrame({
+            "match_id": matches["match_id"], "comp": matches["comp"], "year": matches["year"], "round": matches["round"],
+            "team_id": matches[f"{side}_team_id"], "opponent_id": matches[f"{opponent}_team_id"], "is_home": is_home,
+            "points_for": matches[f"{side}_score"], "points_against": matches[f"{opponent}_score"],
+        }))
+    team_games = pd.concat(sides, ignore_index=True)
+    team_games["margin"] = team_games["points_for"] - team_games["points_against"]
+    officials = pd.DataFrame(columns=["match_id", "year", "round", "role", "name"])
+    weather = matches[["match_id", "comp", "year", "round", "venue", "kickoff"]].copy()
+    if detailed is not None:
+        detailed = detailed.merge(matches[_MATCH_KEYS + ["match_id"]], on=_MATCH_KEYS, how="inner")
+        stats = []
+        for side, is_home in (("home", 1), ("away", 0)):
+            side_stats = pd.DataFrame([{_column_name(k): _stat_value(v) for k, v in section.items()}
+                                       for section in detailed[side]], index=detailed.index)
+            stats.append(side_stats.assign(match_id=detailed["match_id"].values, is_home=is_home))
+        team_stats = pd.concat(stats, ignore_index=True)
+        team_stats = team_stats.drop(columns=[c for c in team_stats.columns if c in team_games.columns and c not in ("match_id", "is_home")])
+        team_games = team_games.merge(team_stats, on=["match_id", "is_home"], how="left")
+
+        meta = detailed[["match_id", "year", "round"]].assign(
+            weather_condition=[section.get("weather_condition") for section in detailed["match"]],
+            ground_condition=[section.get("ground_condition") for section in detailed["match"]],
+            names=[section.get("ref_names") or [] for section in detailed["match"]],
+            roles=[section.get("ref_positions") or [] for section in detailed["match"]],
+        )
+        pairs = meta[["match_id", "year", "round"]].assign(
+            official=[list(zip(roles + [None] * (len(names) - len(roles)), names))
+                      for names, roles in zip(meta["names"], meta["roles"])]
+        ).explode("official").dropna(subset=["official"])
+        officials = pairs[["match_id", "year", "round"]].assign(
+            role=[role for role, _ in pairs["official"]], name=[name for _, name in pairs["official"]]
+        ).reset_index(drop=True)
+        weather = weather.merge(meta[["match_id", "weather_condition", "ground_condition"]], on="match_id", how="left")
+    team_games = team_games.sort_values(["year", "round", "match_id", "is_home"], ascending=[True, True, True, False],
+                                        ignore_index=True)
+
+    players = _ids(player_rows["player"] if player_rows is not None else [], "player_id")
+    if player_rows is not None:
+        # Player match keys spell team names with hyphens ("2024-1-Sea-Eagles-v-Wests-Tigers")
+        names = {_slug(name): name for name in teams["name"]}
+        for column in ("home_team", "away_team", "team"):
+            player_rows[column] = pd.array([names.get(_slug(value), value) if isinstance(value, str) else value
+                                            for value in player_rows[column]], dtype="string")
+        joined = player_rows.merge(matches[_MATCH_KEYS + ["match_id"]], on=_MATCH_KEYS, how="inner")
+        if len(joined) < len(player_rows):
+            unmatched = player_rows.merge(matches[_MATCH_KEYS], on=_MATCH_KEYS, how="left", indicator=True)
+            unmatched = unmatched[unmatched["_merge"] == "left_only"]
+            example = unmatched.iloc[0]
+            print(f"[WARN] {len(unmatched)} player rows match no fixture and were left out "
+                  f"(e.g. {example['year']} round {example['round']} {example['home_team']} v {example['away_team']})")
+        player_rows = joined
+        unknown = player_rows["team"].notna() & ~player_rows["team"].isin(team_id)
+        if unknown.any():
+            print(f"[WARN] {unknown.sum()} player rows have a team that is in no fixture: "
+                  f"{sorted(player_rows.loc[unknown, 'team'].unique())[:5]}")
+        player_rows["team_id"] = player_rows["team"].map(team_id).astype("Int64")
+        player_rows["player_id"] = player_rows["player"].map(dict(zip(players["name"], players["player_id"]))).astype("Int64")
+        keys = ["match_id", "comp", "year", "round", "team_id", "player_id", "number", "position"]
+        player_games = player_rows[keys + [c for c in player_rows.columns if c not in keys + _MATCH_KEYS + ["player", "team"]]]
+    else:
+        player_games = pd.DataFrame(columns=["match_id", "comp", "year", "round", "team_id", "player_id", "number", "position"])
+
+    matches = matches.drop(columns=["home_team", "away_team"])
+    return {
+        "teams": teams, "players": players, "matches": matches, "team_games": team_games,
+        "player_games": player_games, "officials": officials, "weather": _hourly_weather(weather),
+    }
+
+
+def season_mean_outliers(team_games, tolerance=SEASON_MEAN_TOLERANCE):
+    """
+    Team stats whose mean in some season is off from the median season mean by more than ``tolerance`` times.
+
+    Catches markers or unit changes leaking into a season (e.g. uncollected
+    stats stored as -1). Returns (column, year, season mean, median) tuples.
+    """
+    # Scores are left out: a season in progress holds its unplayed fixtures at 0-0
+    keys = {"match_id", "comp", "year", "round", "team_id", "opponent_id", "is_home", "points_for", "points_against",
+            "margin"}
+    stats = [column for column in team_games.columns
+             if column not in keys and pd.api.types.is_numeric_dtype(team_games[column])]
+    means = team_games.groupby("year")[stats].mean()
+    outliers = []
+    for column in stats:
+        median = means[column].median()
+        if pd.isna(median) or median <= 0:
+            continue
+        for year, mean in means[column].dropna().items():
+            if not median / tolerance <= mean <= median * tolerance:
+                outliers.append((column, year, mean, median))
+    return outliers
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class NRLStore:
+    """
+    Connection to the embedded store with a small query API.
+
+    Attributes
+    ----------
+    engine : str
+        "duckdb" or "sqlite"
+    path : str
+        Database file
+    """
+
+    def __init__(self, path=None, engine=None):
+        self.engine = engine or default_engine()
+        self.path = path or default_path(self.engine)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        if self.engine == "duckdb":
+            self._db = duckdb.connect(self.path)
+        else:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+
+    def query(self, sql, params=()):
+        """Run ``sql`` (``?`` placeholders) and return the result as a DataFrame."""
+        with self._lock:
+            if self.engine == "duckdb":
+                return self._db.execute(sql, list(params)).df()
+            return pd.read_sql_query(sql, self._db, params=list(params))
+
+    def write(self, tables):
+        """Replace the given tables and create their indexes."""
+        with self._lock:
+            for name, df in tables.items():
+                self._db.execute(f'DROP TABLE IF EXISTS "{name}"')
+                if self.engine == "duckdb":
+                    self._db.register("_frame", df)
+                    self._db.execute(f'CREATE TABLE "{name}" AS SELECT * FROM _frame')
+                    self._db.unregister("_frame")
+                else:
+                    df.to_sql(name, self._db, index=False)
+                for columns in INDEXES.get(name, []):
+                    index = f"idx_{name}_{'_'.join(columns)}"
+                    self._db.execute(f'CREATE INDEX "{index}" ON "{name}" ({", ".join(columns)})')
+            if self.engine == "sqlite":
+                self._db.commit()
+
+    def tables(self):
+        sql = ("SELECT table_name AS name FROM information_schema.tables" if self.engine == "duckdb"
+               else "SELECT name FROM sqlite_master WHERE type = 'table'")
+        return sorted(self.query(sql)["name"])
+
+    def columns(self, table):
+        return list(self.query(f'SELECT * FROM "{table}" LIMIT 0').columns)
+
+    def team_games(self, team=None, year=None, round_num=None):
+        """Team games with team and opponent names, optionally for one team, year and round."""
+        sql = ("SELECT t.name AS team, o.name AS opponent, g.* FROM team_games g "
+               "JOIN teams t ON t.team_id = g.team_id JOIN teams o ON o.team_id = g.opponent_id WHERE 1 = 1")
+        params = []
+        for clause, value in (("t.name = ?", team), ("g.year = ?", year), ("g.round = ?", round_num)):
+            if value is not None:
+                sql += f" AND {clause}"
+                params.append(value)
+        return self.query(sql + " ORDER BY g.year, g.round, g.match_id", params)
+
+    def team_players(self, team, year, round_num):
+        """Every player who played for ``team`` in a round, with their stats."""
+        return self.query(
+            "SELECT p.name AS player, pg.* FROM player_games pg JOIN players p ON p.player_id = pg.player_id "
+            "WHERE pg.year = ? AND pg.round = ? AND pg.team_id = (SELECT team_id FROM teams WHERE name = ?)",
+            (year, round_num, team)
+        )
+
+    def recent_form(self, team, year, round_num, window=3):
+        """Mean points scored by ``team`` in its last ``window`` games of ``year`` before ``round_num`` (None if none)."""
+        result = self.query(
+            "SELECT AVG(points_for) AS form FROM (SELECT g.points_for FROM team_games g JOIN teams t ON t.team_id = g.team_id "
+            "WHERE t.name = ? AND g.year = ? AND g.round < ? ORDER BY g.round DESC, g.match_id DESC LIMIT ?)",
+            (team, year, round_num, window)
+        )
+        form = result["form"].iloc[0]
+        return None if pd.isna(form) else float(form)
+
+    def opponent_form(self, year=None):
+        """Per year, round and team: win rate and mean margin over the team's games earlier that year."""
+        sql = ("SELECT r.year, r.round, t.name AS team, "
+               "AVG(CASE WHEN g.points_for > g.points_against THEN 1.0 ELSE 0.0 END) AS win_rate, "
+               "AVG(g.margin) AS avg_margin, COUNT(*) AS games "
+               "FROM (SELECT DISTINCT year, round FROM team_games) r "
+               "JOIN team_games g ON g.year = r.year AND g.round < r.round JOIN teams t ON t.team_id = g.team_id")
+        params = []
+        if year is not None:
+            sql += " WHERE r.year = ?"
+            params.append(year)
+        return self.query(sql + " GROUP BY r.year, r.round, t.name ORDER BY r.year, r.round, t.name", params)
+
+    def team_player_totals(self, stats=None):
+        """Player stats summed per year, round and team (``stats`` default: every numeric stat column)."""
+        keys = {"match_id", "comp", "year", "round", "team_id", "player_id", "number", "position"}
+        stats = [column for column in self.columns("player_games") if column not in keys] if stats is None else list(stats)
+        sums = "".join(f', SUM("{column}") AS "{column}"' for column in stats)
+        return self.query(
+            f"SELECT pg.year, pg.round, t.name AS team{sums} FROM player_games pg JOIN teams t ON t.team_id = pg.team_id "
+            "GROUP BY pg.year, pg.round, t.name ORDER BY pg.year, pg.round, t.name"
+        )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def write_store(tables, path=None, engine=None):
+    """Build the store in a temporary file and move it into place; returns the path."""
+    engine = engine or default_engine()
+    path = path or default_path(engine)
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    for leftover in (temp_path, f"{temp_path}.wal"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    store = NRLStore(temp_path, engine)
+    try:
+        store.write(tables)
+    finally:
+        store.close()
+    os.replace(temp_path, path)
+    return path
+
+
+def build_store(years=None, comps=(DEFAULT_COMP,), path=None, engine=None, **dataset_kwargs):
+    """(Re)build the store from the Parquet dataset's matches, detailed matches and players."""
+    global _store
+    sources = {}
+    for comp in comps:
+        frames = {}
+        for name in ("matches", "detailed_raw", "players"):
+            if exists(name, **dataset_kwargs):
+                frames[name] = read_table(name, years=years, comp=comp, **dataset_kwargs)
+        if frames.get("matches") is not None and not frames["matches"].empty:
+            sources[comp] = frames
+    if not sources:
+        print("[WARN] No flattened matches in the dataset, the store was not built.")
+        return None
+    tables = build_tables(sources)
+    for column, year, mean, median in season_mean_outliers(tables["team_games"]):
+        print(f"[WARN] {column}: {year} mean {mean:.1f} is far from the median season mean {median:.1f}")
+    with _store_lock:
+        if _store is not None and _store.path == (path or default_path(engine)):
+            _store.close()
+            _store = None
+    path = write_store(tables, path, engine)
+    logging.info(f"Store built at {path}: " + ", ".join(f"{name} {len(df)}" for name, df in tables.items()))
+    print(f"[SUCCESS] Store built at {path} ({len(tables['matches'])} matches, {len(tables['player_games'])} player games)")
+    return path
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide ``NRLStore`` (default engine and path)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = NRLStore()
+    return _store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the embedded NRL store")
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the store from the Parquet dataset')
+    parser.add_argument('--type', type=str, default=DEFAULT_COMP, help='Competition type(s), comma separated')
+    parser.add_argument('--engine', choices=sorted(STORE_FILES), default=None, help='Default: duckdb if installed')
+    parser.add_argument('--sql', type=str, default=None, help='Query to run and print')
+    args = parser.parse_args()
+    if args.rebuild:
+        build_store(comps=[comp for comp in args.type.split(',') if comp], engine=args.engine)
+    if args.sql:
+        store = NRLStore(engine=args.engine)
+        with pd.option_context('display.max_rows', 100, 'display.width', 200):
+            print(store.query(args.sql))
+        store.close()
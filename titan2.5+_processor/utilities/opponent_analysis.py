@@ -5,6 +5,12 @@ Opponent Analysis and Adaptation
 import pandas as pd
 import os
 
+try:
+    from utilities.nrl_dataset import read_table
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from nrl_dataset import read_table
+
 def main():
     # Output to the main outputs directory at the project root
     outputs_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'outputs'))
@@ -13,7 +19,8 @@ def main():
     if not os.path.exists(matches_path):
         print(f"[ERROR] Could not find {matches_path}")
         return
-    df = pd.read_csv(matches_path)
+    df = read_table("normalised_matches", columns=['year', 'round', 'hometeam', 'awayteam', 'homescore', 'awayscore'],
+                    source_csv=matches_path)
     # Example: Calculate opponent win rates and average margin for each team per round
     features = []
     for year in sorted(df['year'].unique()):
@@ -0,0 +1,355 @@
+"""
+Record-and-replay archive of fetched pages for offline scraper runs.
+
+Set ``TITAN_PAGE_ARCHIVE_MODE=record`` to store every page the scrapers
+fetch (URL, headers, zlib-compressed body) in a local SQLite archive, and
+``TITAN_PAGE_ARCHIVE_MODE=replay`` to serve them back to the same code paths
+without touching the network or starting Chrome. ``TITAN_PAGE_ARCHIVE``
+overrides the archive location.
+
+Plain HTTP goes through ``wrap_session`` (used by the shared HTTP cache),
+Selenium through ``open_driver`` / ``set_up_driver``. Rendered pages are
+stored per URL and per click made since the page was loaded, so flows that
+click a tab or a "next page" button replay the same sequence of documents.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import argparse
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+MODE_ENV = "TITAN_PAGE_ARCHIVE_MODE"
+PATH_ENV = "TITAN_PAGE_ARCHIVE"
+DEFAULT_ARCHIVE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'page_archive', 'pages.sqlite'))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (kind, url, step)
+);
+"""
+
+
+def mode():
+    """'record', 'replay' or None."""
+    value = os.environ.get(MODE_ENV, "").strip().lower()
+    return value if value in ("record", "replay") else None
+
+
+def active():
+    return mode() is not None
+
+
+def replaying():
+    return mode() == "replay"
+
+
+class PageArchive:
+    """
+    SQLite store of pages keyed by (kind, url, step).
+
+    ``kind`` is ``http`` for plain responses and ``rendered`` for Selenium
+    page sources; ``step`` counts the clicks made since the page was loaded.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get(PATH_ENV, DEFAULT_ARCHIVE_PATH)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def put(self, kind, url, body, status=200, headers=None, step=0):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, url, step, status, json.dumps(dict(headers or {})), zlib.compress(body), time.time())
+            )
+
+    def get(self, kind, url, step=0):
+        """Return (status, headers, body bytes) or None if the page was never recorded."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body FROM pages WHERE kind = ? AND url = ? AND step = ?", (kind, url, step)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), zlib.decompress(row[2])
+
+    def has(self, kind, url, step=0):
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM pages WHERE kind = ? AND url = ? AND step = ?", (kind, url, step)
+            ).fetchone() is not None
+
+    def pages(self, kind, url_contains=""):
+        """Yield (url, step, body bytes) for every recorded page of ``kind``."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url, step, body FROM pages WHERE kind = ? AND url LIKE ? ORDER BY url, step",
+                (kind, f"%{url_contains}%")
+            ).fetchall()
+        for url, step, body in rows:
+            yield url, step, zlib.decompress(body)
+
+    def summary(self):
+        """Pages and compressed bytes per (kind, host)."""
+        counts = {}
+        with self._lock:
+            rows = self._db.execute("SELECT kind, url, LENGTH(body) FROM pages").fetchall()
+        for kind, url, size in rows:
+            key = (kind, urlsplit(url).hostname)
+            pages, total = counts.get(key, (0, 0))
+            counts[key] = (pages + 1, total + size)
+        return counts
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """Return the process-wide archive."""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive()
+    return _archive
+
+
+# ---------------------------------------------------------------------------
+# Plain HTTP
+# ---------------------------------------------------------------------------
+
+class ArchiveSession:
+    """Wraps a ``requests.Session``: records its GETs, or serves them from the archive."""
+
+    def __init__(self, session, archive=None):
+        self.session = session
+        self.archive = archive or get_archive()
+        self.headers = session.headers
+
+    def get(self, url, params=None, **kwargs):
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        if replaying():
+            recorded = self.archive.get("http", full_url)
+            response = requests.Response()
+            response.url = full_url
+            if recorded is None:
+                response.status_code, response._content = 404, b""
+            else:
+                response.status_code, headers, response._content = recorded
+                response.headers.update(headers)
+            response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+            return response
+        response = self.session.get(full_url, **kwargs)
+        headers = {k: v for k, v in response.headers.items()
+                   if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+        self.archive.put("http", full_url, response.content, response.status_code, headers)
+        return response
+
+    def mount(self, prefix, adapter):
+        self.session.mount(prefix, adapter)
+
+    def close(self):
+        self.session.close()
+
+
+def wrap_session(session):
+    """Return ``session`` wrapped for record/replay when an archive mode is set."""
+    return ArchiveSession(session) if active() else session
+
+
+# ---------------------------------------------------------------------------
+# Selenium
+# ---------------------------------------------------------------------------
+
+def _is_click(script):
+    return "click()" in script.replace(" ", "")
+
+
+class RecordingDriver:
+    """Proxy around a real WebDriver that stores every page source it serves."""
+
+    def __init__(self, driver, archive=None):
+        self._driver = driver
+        self._archive = archive or get_archive()
+        self._url = None
+        self._clicks = 0
+
+    def get(self, url):
+        self._driver.get(url)
+        self._url, self._clicks = url, 0
+        self._archive.put("rendered", url, self._driver.page_source)
+
+    @property
+    def page_source(self):
+        source = self._driver.page_source
+        if self._url:
+            self._archive.put("rendered", self._url, source, step=self._clicks)
+        return source
+
+    def execute_script(self, script, *args):
+        result = self._driver.execute_script(script, *args)
+        if _is_click(script):
+            self._clicks += 1
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class ReplayElement:
+    """Read-only stand-in for a ``WebElement`` backed by a parsed tag."""
+
+    def __init__(self, driver, tag):
+        self._driver = driver
+        self._tag = tag
+
+    @property
+    def text(self):
+        return self._tag.get_text(" ", strip=True)
+
+    @property
+    def tag_name(self):
+        return self._tag.name
+
+    def get_attribute(self, name):
+        value = self._tag.get(name)
+        return " ".join(value) if isinstance(value, list) else value
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return self._tag.get("disabled") is None and self._tag.get("aria-disabled") != "true"
+
+    def click(self):
+        self._driver._advance()
+
+    def find_element(self, by, value):
+        return self._driver._find(self._tag, by, value)[0]
+
+    def find_elements(self, by, value):
+        return self._driver._find(self._tag, by, value, required=False)
+
+
+class ReplayDriver:
+    """
+    Stand-in for a Chrome WebDriver that serves recorded page sources.
+
+    Supports ``get``, ``page_source``, ``current_url``, CSS/ID/class/tag
+    ``find_element(s)``, click via ``execute_script`` or ``element.click()``
+    (which moves to the next recorded document) and ``quit``.
+    """
+
+    def __init__(self, archive=None):
+        self._archive = archive or get_archive()
+        self._url = None
+        self._clicks = 0
+        self._soup = None
+        self.current_url = None
+
+    def get(self, url):
+        from selenium.common.exceptions import WebDriverException
+
+        if not self._archive.has("rendered", url):
+            raise WebDriverException(f"Page not in archive: {url}")
+        self._url, self._clicks, self._soup = url, 0, None
+        self.current_url = url
+
+    @property
+    def page_source(self):
+        recorded = self._archive.get("rendered", self._url, self._clicks) if self._url else None
+        return recorded[2].decode("utf-8") if recorded else "<html></html>"
+
+    def _document(self):
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.page_source, "html.parser")
+        return self._soup
+
+    def _advance(self):
+        from selenium.common.exceptions import WebDriverException
+
+        # Only move to documents that were recorded after a click
+        if not self._archive.has("rendered", self._url, self._clicks + 1):
+            raise WebDriverException("No recorded page after this click")
+        self._clicks += 1
+        self._soup = None
+
+    def _find(self, root, by, value, required=True):
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import NoSuchElementException
+
+        selectors = {
+            By.CSS_SELECTOR: value,
+            By.ID: f"#{value}",
+            By.CLASS_NAME: f".{value}",
+            By.TAG_NAME: value,
+            By.NAME: f'[name="{value}"]',
+        }
+        if by not in selectors:
+            raise NotImplementedError(f"Replay does not support locating by {by}")
+        tags = root.select(selectors[by])
+        if required and not tags:
+            raise NoSuchElementException(f"{by}={value} not in recorded page")
+        return [ReplayElement(self, tag) for tag in tags]
+
+    def find_element(self, by, value):
+        return self._find(self._document(), by, value)[0]
+
+    def find_elements(self, by, value):
+        return self._find(self._document(), by, value, required=False)
+
+    def execute_script(self, script, *args):
+        if _is_click(script):
+            self._advance()
+        return None
+
+    def quit(self):
+        self._url, self._soup = None, None
+
+    close = quit
+
+
+def open_driver(factory):
+    """
+    Start a WebDriver from ``factory`` honouring the archive mode.
+
+    Replay returns a ``ReplayDriver`` without launching Chrome; record wraps
+    the real driver so every page it serves is stored.
+    """
+    if replaying():
+        return ReplayDriver()
+    driver = factory()
+    return RecordingDriver(driver) if mode() == "record" else driver
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the recorded page archive")
+    parser.add_argument('--path', type=str, default=None, help=f'Archive path (default: ${PATH_ENV} or {DEFAULT_ARCHIVE_PATH})')
+    args = parser.parse_args()
+    archive = PageArchive(args.path)
+    summary = archive.summary()
+    if not summary:
+        print(f"[INFO] Archive {archive.path} is empty.")
+        sys.exit(0)
+    print(f"[INFO] Archive {archive.path}")
+    for (kind, host), (pages, size) in sorted(summary.items()):
+        print(f"{kind:<10}{host or '':<40}{pages:>7} pages {size / 1024:>10.1f} KiB")
@@ -7,12 +7,37 @@ import json
 import sys
 import os
 from utilities.set_up_driver import set_up_driver
+from utilities.match_centre_http import fetch_match_centre_json, parse_player_stats
+from utilities.checkpoint_log import CheckpointLog
+from utilities.scrape_metrics import host_of, timed
 
 sys.path.append("..")
 import ENVIRONMENT_VARIABLES as EV
 
 
-def player_data_select(SELECT_YEAR, SELECT_ROUND, SELECTION_TYPE):
+def extract_player_rows(soup):
+    """Extract one dict per player row (Name + EV.PLAYER_LABELS) from a rendered match-centre page."""
+    rows = soup.find_all("tr", class_="table-tbody__tr")
+    players_info = []
+
+    for row in rows:
+        player_info = {}
+        player_name_elem = row.find("a", class_="table__content-link")
+
+        if player_name_elem:
+            player_info["Name"] = player_name_elem.get_text(strip=True, separator=" ")
+
+        statistics = row.find_all("td", class_="table__cell table-tbody__td")
+
+        for i, label in enumerate(EV.PLAYER_LABELS):
+            player_info[label] = statistics[i].get_text(strip=True) if i < len(statistics) else "na"
+
+        players_info.append(player_info)
+
+    return players_info
+
+
+def player_data_select(SELECT_YEAR, SELECT_ROUND, SELECTION_TYPE, RESUME=False):
     # ============================================
     # ============================================
     # Do not edit below (unless modifying code)
@@ -40,8 +65,9 @@ def player_data_select(SELECT_YEAR, SELECT_ROUND, SELECTION_TYPE):
     # Define file path for player statistics
     player_stats_file = f"../data/{SELECTION_TYPE}/{SELECT_YEAR}/{SELECTION_TYPE}_player_statistics_{SELECT_YEAR}.json"
 
-    # **RESET FILE EACH RUN**: Overwrite file with an empty structure
-    player_stats = {"PlayerStats": [{str(SELECT_YEAR): []}]}
+    # **Each completed match is appended to a checkpoint log** (reset each run unless resuming)
+    checkpoint = CheckpointLog(f"../data/{SELECTION_TYPE}/{SELECT_YEAR}/{SELECTION_TYPE}_player_statistics_{SELECT_YEAR}.ndjson", resume=RESUME)
+    rounds_processed = []
 
     # Load NRL match data
     with open(f"../data/{SELECTION_TYPE}/{SELECT_YEAR}/{SELECTION_TYPE}_data_{SELECT_YEAR}.json", "r") as file:
@@ -51,62 +77,62 @@ def player_data_select(SELECT_YEAR, SELECT_ROUND, SELECTION_TYPE):
     # Store match data for the selected year
     years_arr = {year: data[years_overall.index(year)][str(year)] for year in years}
 
-    # **Start WebDriver once and reuse it**
-    driver = set_up_driver()
+    # **WebDriver is only started if a match has to fall back to Selenium**
+    driver = None
 
     for year in years:
         try:
             for round in range(SELECT_ROUND):
                 round_data = years_arr[year][round][str(round + 1)]
-                round_results = []  # Store all matches for this round
+                rounds_processed.append(round + 1)
 
-                for game in round_data:
+                for order, game in enumerate(round_data):
                     h_team, a_team = [game[x].replace(" ", "-") for x in ["Home", "Away"]]
                     match_key = f"{year}-{round+1}-{h_team}-v-{a_team}"
+                    if (round + 1, match_key) in checkpoint:
+                        print(f"Skipping checkpointed match: {match_key}")
+                        continue
 
                     url = f"{WEBSITE}{year}/round-{round+1}/{h_team}-v-{a_team}/"
                     print(f"Fetching: {url}")
 
-                    # Use existing WebDriver (runs headless for speed)
-                    driver.get(url)
-                    soup = BeautifulSoup(driver.page_source, "html.parser")
-
-                    # Extract player data
-                    rows = soup.find_all("tr", class_="table-tbody__tr")
-                    players_info = []
-
-                    for row in rows:
-                        player_info = {}
-                        player_name_elem = row.find("a", class_="table__content-link")
+                    # Read the embedded match-centre JSON over plain HTTP first
+                    payload = fetch_match_centre_json(url)
+                    with timed("parse", stage="player_stats_json"):
+                        players_info = parse_player_stats(payload)
 
-                        if player_name_elem:
-                            player_info["Name"] = player_name_elem.get_text(strip=True, separator=" ")
+                    if not players_info:
+                        print(f"No embedded player data, falling back to Selenium: {url}")
+                        if driver is None:
+                            with timed("driver_start"):
+                                driver = set_up_driver()
 
-                        statistics = row.find_all("td", class_="table__cell table-tbody__td")
+                        # Use existing WebDriver (runs headless for speed)
+                        with timed("render", host=host_of(url), url=url):
+                            driver.get(url)
+                        with timed("parse", stage="player_stats_html"):
+                            soup = BeautifulSoup(driver.page_source, "html.parser")
 
-                        for i, label in enumerate(EV.PLAYER_LABELS):
-                            player_info[label] = statistics[i].get_text(strip=True) if i < len(statistics) else "na"
+                            # Extract player data
+                            players_info = extract_player_rows(soup)
 
-                        players_info.append(player_info)
-
-                    # Store match data for this round
-                    round_results.append({match_key: players_info})
+                    # **Append the match to the log immediately (fsynced)**
+                    checkpoint.append(round + 1, order, match_key, players_info)
                     print(f"Processed match: {match_key}")
 
-                # **Add round data under the correct year**
-                year_index = 0  # Since there's only one year in PlayerStats list
-                player_stats["PlayerStats"][year_index][str(year)].append({str(round): round_results})
-
-                # **Write to file immediately after each round**
-                with open(player_stats_file, "w") as file:
-                    json.dump(player_stats, file, indent=4)
-
-                print(f"✅ Round {round+1} data saved.")
+                print(f"✅ Round {round+1} data checkpointed.")
 
         except Exception as ex:
             print(f"Error: {ex}")
 
     # **Close WebDriver after all matches are processed**
-    driver.quit()
+    if driver is not None:
+        driver.quit()
+
+    # **Compact the log into the nested layout (rounds keyed from 0)**
+    player_stats = {"PlayerStats": [{str(SELECT_YEAR): [
+        {str(round_number - 1): matches} for round_number, matches in checkpoint.rounds(rounds_processed)
+    ]}]}
+    checkpoint.finalize({player_stats_file: player_stats})
 
     print(f"Final player statistics saved to {player_stats_file}")
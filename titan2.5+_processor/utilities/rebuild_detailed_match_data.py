@@ -1,7 +1,12 @@
 import os
-import json
 import logging
 
+try:
+    from utilities.json_stream import ITEMS, KEYS, JSONArrayWriter, iter_path
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from json_stream import ITEMS, KEYS, JSONArrayWriter, iter_path
+
 def safe_int(val, context=None, issues=None, field=None):
     try:
         if isinstance(val, int):
@@ -57,67 +62,57 @@ def safe_ratio(val, context=None, issues=None, field=None):
             issues.append(f"{field}: {val} (ratio conversion error: {e})")
         return 0.0
 
+def flatten_match(year, round_key, matchup, content):
+    match_data = {}
+    data_issues = []
+    try:
+        match_meta = content.get("match", {})
+        home_stats = content.get("home", {})
+        away_stats = content.get("away", {})
+        match_data["Round"] = f"Round {round_key}"
+        match_data["MatchName"] = matchup
+        match_data["MatchID"] = f"{year}-{round_key}-{matchup.replace(' ', '')}"
+        match_data["Date"] = f"{year}-01-01"  # Placeholder
+        match_data["main_ref"] = match_meta.get("main_ref")
+        match_data["weather_condition"] = match_meta.get("weather_condition")
+        match_data["ground_condition"] = match_meta.get("ground_condition")
+        avg_pb = home_stats.get("Average_Play_Ball_Speed", "0")
+        match_data["Average_PlayBall_Speed"] = safe_float(avg_pb if isinstance(avg_pb, str) else str(avg_pb), context=matchup, issues=data_issues, field="Average_Play_Ball_Speed")
+        match_data["kicking_metres"] = {
+            "home": safe_int(home_stats.get("kicking_metres"), context=matchup, issues=data_issues, field="home_kicking_metres"),
+            "away": safe_int(away_stats.get("kicking_metres"), context=matchup, issues=data_issues, field="away_kicking_metres")
+        }
+        match_data["errors"] = {
+            "home": safe_int(home_stats.get("errors"), context=matchup, issues=data_issues, field="home_errors"),
+            "away": safe_int(away_stats.get("errors"), context=matchup, issues=data_issues, field="away_errors")
+        }
+        match_data["penalties_conceded"] = {
+            "home": safe_int(home_stats.get("penalties_conceded"), context=matchup, issues=data_issues, field="home_penalties_conceded"),
+            "away": safe_int(away_stats.get("penalties_conceded"), context=matchup, issues=data_issues, field="away_penalties_conceded")
+        }
+        match_data["sin_bins"] = {
+            "home": safe_int(home_stats.get("sin_bins"), context=matchup, issues=data_issues, field="home_sin_bins"),
+            "away": safe_int(away_stats.get("sin_bins"), context=matchup, issues=data_issues, field="away_sin_bins")
+        }
+        if data_issues:
+            match_data["data_issues"] = data_issues
+            logging.warning(f"⚠️ Data issues in match {matchup}: {data_issues}")
+    except Exception as e:
+        logging.error(f"❌ Failed to process match: {matchup} — {e}")
+        match_data["data_issues"] = [f"Exception: {e}"]
+    return match_data
+
 def extract_flat_matches(year, source_path, dest_path):
     logging.info(f"\n🧩 Rebuilding detailed match data for {year}...")
+    # Stream { "NRL": [ { round: [ { matchup: content } ] } ] } one match at a time into the output array
     try:
-        with open(source_path, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        with JSONArrayWriter(dest_path) as writer:
+            for (round_key, matchup), content in iter_path(source_path, ["NRL", ITEMS, KEYS, ITEMS, KEYS]):
+                writer.write(flatten_match(year, round_key, matchup, content))
     except Exception as e:
-        logging.error(f"❌ Failed to load {source_path}: {e}")
+        logging.error(f"❌ Failed to rebuild {source_path}: {e}")
         return
-    base = raw.get("NRL", [])
-    matches = []
-    for round_block in base:
-        for round_key, round_matches in round_block.items():
-            for match_wrapper in round_matches:
-                for matchup, content in match_wrapper.items():
-                    match_data = {}
-                    data_issues = []
-                    try:
-                        match_meta = content.get("match", {})
-                        home_stats = content.get("home", {})
-                        away_stats = content.get("away", {})
-                        match_data["Round"] = f"Round {round_key}"
-                        match_data["MatchName"] = matchup
-                        match_data["MatchID"] = f"{year}-{round_key}-{matchup.replace(' ', '')}"
-                        match_data["Date"] = f"{year}-01-01"  # Placeholder
-                        match_data["main_ref"] = match_meta.get("main_ref")
-                        match_data["weather_condition"] = match_meta.get("weather_condition")
-                        match_data["ground_condition"] = match_meta.get("ground_condition")
-                        avg_pb = home_stats.get("Average_Play_Ball_Speed", "0")
-                        match_data["Average_PlayBall_Speed"] = safe_float(avg_pb if isinstance(avg_pb, str) else str(avg_pb), context=matchup, issues=data_issues, field="Average_Play_Ball_Speed")
-                        match_data["kicking_metres"] = {
-                            "home": safe_int(home_stats.get("kicking_metres"), context=matchup, issues=data_issues, field="home_kicking_metres"),
-                            "away": safe_int(away_stats.get("kicking_metres"), context=matchup, issues=data_issues, field="away_kicking_metres")
-                        }
-                        match_data["errors"] = {
-                            "home": safe_int(home_stats.get("errors"), context=matchup, issues=data_issues, field="home_errors"),
-                            "away": safe_int(away_stats.get("errors"), context=matchup, issues=data_issues, field="away_errors")
-                        }
-                        match_data["penalties_conceded"] = {
-                            "home": safe_int(home_stats.get("penalties_conceded"), context=matchup, issues=data_issues, field="home_penalties_conceded"),
-                            "away": safe_int(away_stats.get("penalties_conceded"), context=matchup, issues=data_issues, field="away_penalties_conceded")
-                        }
-                        match_data["sin_bins"] = {
-                            "home": safe_int(home_stats.get("sin_bins"), context=matchup, issues=data_issues, field="home_sin_bins"),
-                            "away": safe_int(away_stats.get("sin_bins"), context=matchup, issues=data_issues, field="away_sin_bins")
-                        }
-                        if data_issues:
-                            match_data["data_issues"] = data_issues
-                            logging.warning(f"⚠️ Data issues in match {matchup}: {data_issues}")
-                        matches.append(match_data)
-                    except Exception as e:
-                        logging.error(f"❌ Failed to process match: {matchup} — {e}")
-                        match_data["data_issues"] = [f"Exception: {e}"]
-                        matches.append(match_data)
-                        continue
-    logging.info(f"✅ Extracted {len(matches)} detailed matches for {year}")
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    try:
-        with open(dest_path, "w", encoding="utf-8") as out_f:
-            json.dump(matches, out_f, indent=2)
-    except Exception as e:
-        logging.error(f"Failed to save {dest_path}: {e}")
+    logging.info(f"✅ Extracted {writer.rows} detailed matches for {year}")
 
 def rebuild_all_detailed():
     SOURCE_BASE = "C:/Users/slangston1/TITAN/titan2.5+_processor/nrl"
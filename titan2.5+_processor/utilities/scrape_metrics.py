@@ -0,0 +1,206 @@
+"""
+Throughput telemetry for the scrapers.
+
+Fetch and parse layers append one JSON line per event to a metrics file
+(``data/metrics/scrape_metrics.ndjson``; ``TITAN_SCRAPE_METRICS`` overrides
+the path, ``off`` disables recording):
+
+- ``http``: one per request made through ``PoliteSession`` (DNS, connect,
+  time to first byte, download and total seconds, bytes, status, retries)
+  or served by the HTTP cache (``cache: true``);
+- ``render``: a page loaded in a WebDriver;
+- ``parse``: a parse step, by ``stage``;
+- ``driver_start`` / ``driver_restart``: Chrome launches and recycles.
+
+Run this module to print p50/p95 latency per host, parse times and pages
+per minute:
+
+    python utilities/scrape_metrics.py --since 24
+"""
+
+import os
+import math
+import sys
+import json
+import time
+import argparse
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+METRICS_ENV = "TITAN_SCRAPE_METRICS"
+DEFAULT_METRICS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'metrics', 'scrape_metrics.ndjson'))
+
+
+def host_of(url):
+    return urlsplit(url).hostname or ""
+
+
+class MetricsLog:
+    """Thread-safe append-only NDJSON event log."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def record(self, kind, **fields):
+        line = json.dumps({"ts": time.time(), "kind": kind, **fields}) + "\n"
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, "a", buffering=1)
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """Return the process-wide ``MetricsLog``, or None when recording is off."""
+    global _metrics
+    path = os.environ.get(METRICS_ENV, DEFAULT_METRICS_PATH)
+    if path.strip().lower() == "off":
+        return None
+    with _metrics_lock:
+        if _metrics is None or _metrics.path != path:
+            _metrics = MetricsLog(path)
+    return _metrics
+
+
+def record(kind, **fields):
+    """Record one event (no-op when recording is off)."""
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.record(kind, **fields)
+
+
+@contextmanager
+def timed(kind, **fields):
+    """
+    Record ``kind`` with its ``duration_s`` when the block exits.
+
+    The yielded dict can be updated inside the block to add fields; an
+    exception is recorded as ``error`` and re-raised.
+    """
+    event = dict(fields)
+    start = time.perf_counter()
+    try:
+        yield event
+    except Exception as ex:
+        event["error"] = type(ex).__name__
+        raise
+    finally:
+        event["duration_s"] = round(time.perf_counter() - start, 6)
+        record(kind, **event)
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def load_events(path, since_hours=None):
+    cutoff = time.time() - since_hours * 3600 if since_hours else 0
+    events = []
+    with open(path, "r") as file:
+        for line in file:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event.get("ts", 0) >= cutoff:
+                events.append(event)
+    return events
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of ``values`` (q in 0-100)."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+def _p50_p95(values):
+    return f"{percentile(values, 50) * 1000:>8.0f}{percentile(values, 95) * 1000:>8.0f}"
+
+
+def summarize(events):
+    """Group events for the report: per-host HTTP/render stats, per-stage parse times, driver counts."""
+    hosts = {}
+    for event in events:
+        if event["kind"] not in ("http", "render"):
+            continue
+        stats = hosts.setdefault(event.get("host", ""), {
+            "requests": 0, "cache_hits": 0, "total": [], "ttfb": [], "render": [],
+            "bytes": 0, "retries": 0, "errors": 0, "pages": 0, "first": event["ts"], "last": event["ts"],
+        })
+        stats["first"] = min(stats["first"], event["ts"])
+        stats["last"] = max(stats["last"], event["ts"])
+        if event.get("error") or (event.get("status") or 200) >= 400:
+            stats["errors"] += 1
+        else:
+            stats["pages"] += 1
+        if event["kind"] == "render":
+            stats["render"].append(event["duration_s"])
+            continue
+        stats["requests"] += 1
+        if event.get("cache"):
+            stats["cache_hits"] += 1
+            continue
+        stats["total"].append(event.get("total_s", 0))
+        if event.get("ttfb_s") is not None:
+            stats["ttfb"].append(event["ttfb_s"])
+        stats["bytes"] += event.get("bytes", 0)
+        stats["retries"] += event.get("retries", 0)
+    parse = {}
+    for event in events:
+        if event["kind"] == "parse":
+            parse.setdefault(event.get("stage", ""), []).append(event["duration_s"])
+    drivers = {kind: [e for e in events if e["kind"] == kind] for kind in ("driver_start", "driver_restart")}
+    return hosts, parse, drivers
+
+
+def print_report(events):
+    hosts, parse, drivers = summarize(events)
+    span = (max(e["ts"] for e in events) - min(e["ts"] for e in events)) / 60 if events else 0
+    print(f"[INFO] {len(events)} events over {span:.1f} minutes")
+
+    print(f"\n{'host':<32}{'reqs':>6}{'cached':>7}{'p50 ms':>8}{'p95 ms':>8}{'ttfb50':>8}{'ttfb95':>8}"
+          f"{'rnd50':>8}{'rnd95':>8}{'MB':>8}{'retry':>6}{'err':>5}{'pg/min':>8}")
+    for host, stats in sorted(hosts.items(), key=lambda item: -item[1]["pages"]):
+        minutes = max((stats["last"] - stats["first"]) / 60, 1 / 60)
+        print(f"{host[:31]:<32}{stats['requests']:>6}{stats['cache_hits']:>7}{_p50_p95(stats['total'])}"
+              f"{_p50_p95(stats['ttfb'])}{_p50_p95(stats['render'])}{stats['bytes'] / 1e6:>8.1f}"
+              f"{stats['retries']:>6}{stats['errors']:>5}{stats['pages'] / minutes:>8.1f}")
+
+    if parse:
+        print(f"\n{'parse stage':<40}{'count':>6}{'p50 ms':>8}{'p95 ms':>8}")
+        for stage, durations in sorted(parse.items()):
+            print(f"{stage:<40}{len(durations):>6}{_p50_p95(durations)}")
+
+    starts = [e["duration_s"] for e in drivers["driver_start"]]
+    print(f"\nDriver starts: {len(starts)}" + (f" (p50 {percentile(starts, 50):.1f}s)" if starts else "")
+          + f", restarts: {len(drivers['driver_restart'])}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarise scraper throughput metrics")
+    parser.add_argument('--path', type=str, default=os.environ.get(METRICS_ENV, DEFAULT_METRICS_PATH))
+    parser.add_argument('--since', type=float, default=None, help='Only events from the last N hours')
+    args = parser.parse_args()
+    if not os.path.exists(args.path):
+        print(f"[INFO] No metrics recorded yet at {args.path}.")
+        sys.exit(0)
+    events = load_events(args.path, args.since)
+    if not events:
+        print("[INFO] No events in the selected window.")
+        sys.exit(0)
+    print_report(events)
@@ -5,11 +5,16 @@ This module provides a function to set up the Chrome Web Driver with specific op
 for automated web scraping tasks related to Scalping.
 """
 
+import threading
 import chromedriver_autoinstaller
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 
-chromedriver_autoinstaller.install()
+from utilities.page_archive import open_driver
+
+# chromedriver is installed once, the first time Chrome is actually launched
+_chromedriver_installed = False
+_install_lock = threading.Lock()
 
 
 def set_up_driver():
@@ -17,8 +22,21 @@ def set_up_driver():
 
     This function sets up the Chrome Web Driver with specified options.
     
+    When a page archive mode is set the driver records every page it
+    serves, or is replaced by a replay stand-in that never starts Chrome.
+
     :return: WebDriver object for Chrome
     """
+    return open_driver(_launch_chrome)
+
+
+def _launch_chrome():
+    global _chromedriver_installed
+    with _install_lock:
+        if not _chromedriver_installed:
+            chromedriver_autoinstaller.install()
+            _chromedriver_installed = True
+
     options = Options()
     # Ignore annoying messages from the NRL website 
     options.add_argument('--ignore-certificate-errors')
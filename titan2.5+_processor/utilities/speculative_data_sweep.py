@@ -35,16 +35,32 @@ import argparse
 import json
 import re
 import asyncio
+import time
+from functools import lru_cache
 from random import randint
-import requests
+from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from bs4 import BeautifulSoup
-
-# Optional: For sentiment analysis
 try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
+    from utilities.http_cache import cached_get
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from http_cache import cached_get
+try:
+    from utilities.keyword_matcher import KeywordMatcher
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from keyword_matcher import KeywordMatcher
+try:
+    from utilities.nlp_service import get_nlp_service
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from nlp_service import get_nlp_service
+try:
+    from utilities.near_duplicates import collapse_near_duplicates
 except ImportError:
-    TEXTBLOB_AVAILABLE = False
+    # Run directly as a script from the utilities folder
+    from near_duplicates import collapse_near_duplicates
 
 # Optional: For Reddit API
 try:
@@ -53,20 +69,7 @@ try:
 except ImportError:
     REDDIT_AVAILABLE = False
 
-# Optional: For spaCy and VADER
-try:
-    import spacy
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    SPACY_AVAILABLE = True
-    VADER_AVAILABLE = True
-    nlp = spacy.load('en_core_web_sm')
-    vader_analyzer = SentimentIntensityAnalyzer()
-except ImportError:
-    SPACY_AVAILABLE = False
-    VADER_AVAILABLE = False
-    nlp = None
-    vader_analyzer = None
-
+# Sentiment (VADER / TextBlob) and spaCy entities load on first use, see nlp_service
 # TikTok API integration
 try:
     from TikTokApi import TikTokApi
@@ -128,6 +131,32 @@ TIER2_KEYWORDS = {
 # Flatten all keywords for use in sweeps
 ALL_TIER2_KEYWORDS = [kw for group in TIER2_KEYWORDS.values() for kw in group]
 
+@lru_cache(maxsize=8)
+def _compile_tier2_matcher(keywords):
+    tier2 = {}
+    for theme, words in TIER2_KEYWORDS.items():
+        for kw in words:
+            tier2.setdefault(kw.lower(), theme)
+    themes = {}
+    for kw in keywords:
+        themes.setdefault(tier2.get(kw.lower(), 'team'), []).append(kw)
+    return KeywordMatcher(themes)
+
+def tier2_matcher(keywords):
+    """Compiled matcher for exactly the sweep keywords, tagged with their Tier-2 theme (team names get 'team')."""
+    return _compile_tier2_matcher(tuple(keywords))
+
+# News sweep deadlines (seconds): per source, and for the whole sweep
+NEWS_SOURCE_TIMEOUT = 20
+NEWS_SWEEP_BUDGET = 45
+
+# Stealth Twitter sweep: concurrent search pages in one browser, and the budget (seconds) for all keywords
+TWITTER_CONCURRENCY = 4
+TWITTER_SWEEP_BUDGET = 300
+TWITTER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+# Browser cookies/local storage kept between sweeps
+TWITTER_STATE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'twitter_storage_state.json'))
+
 # Helper: Get time window for scraping
 def get_time_window(game_datetime):
     end_time = game_datetime
@@ -142,23 +171,12 @@ def progress_print(msg):
     print(f"[PROGRESS] {msg}")
 
 # Stealth Twitter scraping using Playwright
-async def scrape_twitter_stealth_async(keyword, max_results=10, headless=True, cookies_path=None):
-    from playwright.async_api import async_playwright
+async def search_twitter_page(context, keyword, max_results=10):
+    """Scrape one live Twitter search in a new page of the shared browser context."""
     results = []
-    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-    url = f"https://twitter.com/search?q={keyword}&src=typed_query&f=live"
-    debug_print(f"Launching browser for Twitter search: {keyword}")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless)
-        context = await browser.new_context(
-            user_agent=user_agent,
-            viewport={"width": 1280, "height": 800},
-            java_script_enabled=True
-        )
-        if cookies_path and os.path.exists(cookies_path):
-            cookies = json.load(open(cookies_path, 'r'))
-            await context.add_cookies(cookies)
-        page = await context.new_page()
+    url = f"https://twitter.com/search?q={quote_plus(keyword)}&src=typed_query&f=live"
+    page = await context.new_page()
+    try:
         await page.goto(url)
         debug_print(f"Navigated to Twitter search page for '{keyword}'")
         await page.wait_for_timeout(randint(2000, 4000))
@@ -195,21 +213,74 @@ async def scrape_twitter_stealth_async(keyword, max_results=10, headless=True, c
                 debug_print("No more tweets loaded after scrolling.")
                 break
             last_height = new_height
-        await browser.close()
-        debug_print(f"Finished scraping Twitter for '{keyword}', total tweets: {len(results)}")
+    finally:
+        await page.close()
+    debug_print(f"Finished scraping Twitter for '{keyword}', total tweets: {len(results)}")
     return results[:max_results]
 
+async def scrape_twitter_stealth_async(keywords, max_results=10, headless=True, cookies_path=None,
+                                       concurrency=TWITTER_CONCURRENCY, budget=TWITTER_SWEEP_BUDGET,
+                                       state_path=TWITTER_STATE_PATH):
+    """
+    Search every keyword in one browser and context, ``concurrency`` pages at a time.
+
+    Cookies and local storage are loaded from ``state_path`` (or ``cookies_path``)
+    and saved back after the sweep. Searches still running when ``budget``
+    seconds have passed are cancelled.
+
+    :return: dict of keyword -> tweets for the searches that completed
+    """
+    from playwright.async_api import async_playwright
+    semaphore = asyncio.Semaphore(concurrency)
+    found = {}
+
+    async def search(keyword):
+        async with semaphore:
+            try:
+                found[keyword] = await search_twitter_page(context, keyword, max_results)
+            except Exception as e:
+                print(f"[ERROR] Stealth Twitter scraping failed for '{keyword}': {e}")
+
+    debug_print(f"Launching browser for {len(keywords)} Twitter searches")
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            context = await browser.new_context(
+                user_agent=TWITTER_USER_AGENT,
+                viewport={"width": 1280, "height": 800},
+                java_script_enabled=True,
+                storage_state=state_path if state_path and os.path.exists(state_path) else None
+            )
+            if cookies_path and os.path.exists(cookies_path):
+                with open(cookies_path, 'r') as f:
+                    await context.add_cookies(json.load(f))
+            tasks = [asyncio.ensure_future(search(kw)) for kw in keywords]
+            done, pending = await asyncio.wait(tasks, timeout=budget)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if pending:
+                print(f"[WARN] Twitter sweep budget of {budget}s reached, skipped {len(pending)} of {len(keywords)} keywords.")
+            if state_path:
+                os.makedirs(os.path.dirname(state_path), exist_ok=True)
+                await context.storage_state(path=state_path)
+        finally:
+            await browser.close()
+    return found
+
 def scrape_twitter_stealth(keywords, max_results=10):
     all_results = []
+    try:
+        found = asyncio.run(scrape_twitter_stealth_async(list(keywords), max_results=max_results))
+    except Exception as e:
+        print(f"[ERROR] Stealth Twitter scraping failed: {e}")
+        return all_results
     for kw in keywords:
-        try:
-            tweets = asyncio.run(scrape_twitter_stealth_async(kw, max_results=max_results))
-            for t in tweets:
-                t['source'] = 'twitter_stealth'
-                t['keyword'] = kw
-            all_results.extend(tweets)
-        except Exception as e:
-            print(f"[ERROR] Stealth Twitter scraping failed for '{kw}': {e}")
+        tweets = found.get(kw, [])
+        for t in tweets:
+            t['source'] = 'twitter_stealth'
+            t['keyword'] = kw
+        all_results.extend(tweets)
     return all_results
 
 # Reddit scraping using PRAW
@@ -222,13 +293,14 @@ def scrape_reddit(keywords, start_time, end_time, limit=100):
     reddit = praw.Reddit(client_id='YOUR_CLIENT_ID',
                          client_secret='YOUR_CLIENT_SECRET',
                          user_agent='nrl_speculative_sweep')
+    matcher = tier2_matcher(keywords)
     results = []
     for submission in reddit.subreddit('nrl').new(limit=limit):
         created = datetime.datetime.utcfromtimestamp(submission.created_utc)
         if not (start_time <= created <= end_time):
             continue
         text = submission.title + ' ' + submission.selftext
-        if any(kw.lower() in text.lower() for kw in keywords):
+        if matcher.matches(text):
             results.append({
                 'source': 'reddit',
                 'title': submission.title,
@@ -307,9 +379,10 @@ def scrape_nrl_com_news(keywords, max_results=20):
     """
     url = "https://www.nrl.com/news/"
     try:
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        response = cached_get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=NEWS_SOURCE_TIMEOUT)
         soup = BeautifulSoup(response.text, "html.parser")
         articles = []
+        matcher = tier2_matcher(keywords)
         for item in soup.select(".news-list__item"):
             headline_elem = item.select_one(".news-list__headline")
             if not headline_elem:
@@ -319,7 +392,7 @@ def scrape_nrl_com_news(keywords, max_results=20):
             link = "https://www.nrl.com" + link_elem["href"] if link_elem else ""
             summary_elem = item.select_one(".news-list__summary")
             summary = summary_elem.text.strip() if summary_elem else ""
-            if any(kw.lower() in headline.lower() or kw.lower() in summary.lower() for kw in keywords):
+            if matcher.matches(headline) or matcher.matches(summary):
                 articles.append({
                     "source": "nrl.com",
                     "headline": headline,
@@ -340,9 +413,10 @@ def scrape_fox_league_news(keywords, max_results=20):
     """
     url = "https://www.foxsports.com.au/nrl"
     try:
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        response = cached_get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=NEWS_SOURCE_TIMEOUT)
         soup = BeautifulSoup(response.text, "html.parser")
         articles = []
+        matcher = tier2_matcher(keywords)
         for item in soup.select(".story-block"):
             headline_elem = item.select_one(".story-block__heading")
             if not headline_elem:
@@ -352,7 +426,7 @@ def scrape_fox_league_news(keywords, max_results=20):
             link = link_elem["href"] if link_elem else ""
             summary_elem = item.select_one(".story-block__standfirst")
             summary = summary_elem.text.strip() if summary_elem else ""
-            if any(kw.lower() in headline.lower() or kw.lower() in summary.lower() for kw in keywords):
+            if matcher.matches(headline) or matcher.matches(summary):
                 articles.append({
                     "source": "foxsports.com.au",
                     "headline": headline,
@@ -373,9 +447,10 @@ def scrape_news_com_au_nrl(keywords, max_results=20):
     """
     url = "https://www.news.com.au/sport/nrl"
     try:
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        response = cached_get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=NEWS_SOURCE_TIMEOUT)
         soup = BeautifulSoup(response.text, "html.parser")
         articles = []
+        matcher = tier2_matcher(keywords)
         for item in soup.select(".story-block"):
             headline_elem = item.select_one(".story-block__heading")
             if not headline_elem:
@@ -385,7 +460,7 @@ def scrape_news_com_au_nrl(keywords, max_results=20):
             link = link_elem["href"] if link_elem else ""
             summary_elem = item.select_one(".story-block__standfirst")
             summary = summary_elem.text.strip() if summary_elem else ""
-            if any(kw.lower() in headline.lower() or kw.lower() in summary.lower() for kw in keywords):
+            if matcher.matches(headline) or matcher.matches(summary):
                 articles.append({
                     "source": "news.com.au",
                     "headline": headline,
@@ -406,9 +481,10 @@ def scrape_wide_world_of_sports_nrl(keywords, max_results=20):
     """
     url = "https://wwos.nine.com.au/nrl"
     try:
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        response = cached_get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=NEWS_SOURCE_TIMEOUT)
         soup = BeautifulSoup(response.text, "html.parser")
         articles = []
+        matcher = tier2_matcher(keywords)
         for item in soup.select(".story-block, .card, .article-card"):
             headline_elem = item.select_one(".story-block__heading, .card__headline, .article-card__headline")
             if not headline_elem:
@@ -418,7 +494,7 @@ def scrape_wide_world_of_sports_nrl(keywords, max_results=20):
             link = link_elem["href"] if link_elem else ""
             summary_elem = item.select_one(".story-block__standfirst, .card__summary, .article-card__summary")
             summary = summary_elem.text.strip() if summary_elem else ""
-            if any(kw.lower() in headline.lower() or kw.lower() in summary.lower() for kw in keywords):
+            if matcher.matches(headline) or matcher.matches(summary):
                 articles.append({
                     "source": "Wide World of Sports",
                     "headline": headline,
@@ -439,9 +515,10 @@ def scrape_zero_tackle_news(keywords, max_results=20):
     """
     url = "https://www.zerotackle.com/nrl/news/"
     try:
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        response = cached_get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=NEWS_SOURCE_TIMEOUT)
         soup = BeautifulSoup(response.text, "html.parser")
         articles = []
+        matcher = tier2_matcher(keywords)
         for item in soup.select(".news-list__item, .news-card"):
             headline_elem = item.select_one(".news-list__title, .news-card__title")
             if not headline_elem:
@@ -451,7 +528,7 @@ def scrape_zero_tackle_news(keywords, max_results=20):
             link = link_elem["href"] if link_elem else ""
             summary_elem = item.select_one(".news-list__summary, .news-card__summary")
             summary = summary_elem.text.strip() if summary_elem else ""
-            if any(kw.lower() in headline.lower() or kw.lower() in summary.lower() for kw in keywords):
+            if matcher.matches(headline) or matcher.matches(summary):
                 articles.append({
                     "source": "Zero Tackle",
                     "headline": headline,
@@ -473,9 +550,10 @@ def scrape_daily_telegraph_nrl(keywords, max_results=20):
     """
     url = "https://www.dailytelegraph.com.au/sport/nrl"
     try:
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        response = cached_get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=NEWS_SOURCE_TIMEOUT)
         soup = BeautifulSoup(response.text, "html.parser")
         articles = []
+        matcher = tier2_matcher(keywords)
         for item in soup.select(".storyblock, .story-block"):
             headline_elem = item.select_one(".storyblock_title, .story-block__title")
             if not headline_elem:
@@ -485,7 +563,7 @@ def scrape_daily_telegraph_nrl(keywords, max_results=20):
             link = link_elem["href"] if link_elem else ""
             summary_elem = item.select_one(".storyblock_standfirst, .story-block__standfirst")
             summary = summary_elem.text.strip() if summary_elem else ""
-            if any(kw.lower() in headline.lower() or kw.lower() in summary.lower() for kw in keywords):
+            if matcher.matches(headline) or matcher.matches(summary):
                 articles.append({
                     "source": "Daily Telegraph",
                     "headline": headline,
@@ -521,20 +599,57 @@ def scrape_abc_nrl(keywords, max_results=20):
     # TODO: Implement actual scraping logic
     return []
 
-def gather_news_data(keywords):
-    nrl_news = scrape_nrl_com_news(keywords)
-    fox_news = scrape_fox_league_news(keywords)
-    newsau_news = scrape_news_com_au_nrl(keywords)
-    wwos_news = scrape_wide_world_of_sports_nrl(keywords)
-    zero_tackle_news = scrape_zero_tackle_news(keywords)
-    daily_telegraph_news = scrape_daily_telegraph_nrl(keywords)
+# (label, scraper) for every news source swept before a game
+NEWS_SOURCES = [
+    ("NRL.com", scrape_nrl_com_news),
+    ("Fox League", scrape_fox_league_news),
+    ("News.com.au", scrape_news_com_au_nrl),
+    ("WWOS", scrape_wide_world_of_sports_nrl),
+    ("Zero Tackle", scrape_zero_tackle_news),
+    ("Daily Telegraph", scrape_daily_telegraph_nrl),
     # Tier 2 outlets
-    athletic_news = scrape_the_athletic_nrl(keywords)
-    code_sports_news = scrape_code_sports_nrl(keywords)
-    abc_news = scrape_abc_nrl(keywords)
-    all_news = (nrl_news + fox_news + newsau_news + wwos_news + zero_tackle_news +
-                daily_telegraph_news + athletic_news + code_sports_news + abc_news)
-    print(f"[INFO] Gathered {len(nrl_news)} NRL.com, {len(fox_news)} Fox League, {len(newsau_news)} News.com.au, {len(wwos_news)} WWOS, {len(zero_tackle_news)} Zero Tackle, {len(daily_telegraph_news)} Daily Telegraph, {len(athletic_news)} The Athletic, {len(code_sports_news)} CODE Sports, {len(abc_news)} ABC news articles.")
+    ("The Athletic", scrape_the_athletic_nrl),
+    ("CODE Sports", scrape_code_sports_nrl),
+    ("ABC", scrape_abc_nrl),
+]
+
+def iter_news_data(keywords, source_timeout=NEWS_SOURCE_TIMEOUT, budget=NEWS_SWEEP_BUDGET):
+    """
+    Sweep every news source concurrently, yielding (label, articles) as each one finishes.
+    Sources still running after their deadline (or once the sweep budget is spent) are dropped.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(NEWS_SOURCES), thread_name_prefix="news-sweep")
+    started = time.monotonic()
+    deadline = started + min(source_timeout, budget)
+    pending = {executor.submit(scraper, keywords): label for label, scraper in NEWS_SOURCES}
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                label = pending.pop(future)
+                try:
+                    articles = future.result()
+                except Exception as e:
+                    print(f"[ERROR] {label} scraping failed: {e}")
+                    articles = []
+                progress_print(f"{label}: {len(articles)} articles after {time.monotonic() - started:.1f}s")
+                yield label, articles
+        for label in pending.values():
+            print(f"[WARN] {label} did not respond within {min(source_timeout, budget)}s, skipping.")
+    finally:
+        # Stragglers are abandoned; their own request timeouts end them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def gather_news_data(keywords):
+    counts = {label: 0 for label, _ in NEWS_SOURCES}
+    all_news = []
+    for label, articles in iter_news_data(keywords):
+        counts[label] = len(articles)
+        all_news += articles
+    print("[INFO] Gathered " + ", ".join(f"{count} {label}" for label, count in counts.items()) + " news articles.")
     return all_news
 
 # Facebook, Instagram, TikTok scraping placeholders
@@ -559,22 +674,16 @@ def gather_social_media_data(keywords, game_datetime):
 
 # --- Data Parsing and Validation ---
 def parse_and_validate_social_data(posts, keywords):
+    matcher = tier2_matcher(keywords)
+    texts = [(post.get('title', '') + ' ' + post.get('text', '')).lower() for post in posts]
+    # Sentiment and spaCy entities (optional, for future use) scored in one batch, cached by content
+    scores = get_nlp_service().score(texts) if texts else []
     valid_posts = []
-    for post in posts:
-        text = (post.get('title', '') + ' ' + post.get('text', '')).lower()
+    for post, text, score in zip(posts, texts, scores):
         # Simple keyword density
-        kw_count = sum(text.count(kw.lower()) for kw in keywords)
-        # Sentiment
-        sentiment = 0
-        if VADER_AVAILABLE:
-            sentiment = vader_analyzer.polarity_scores(text)['compound']
-        elif TEXTBLOB_AVAILABLE:
-            sentiment = TextBlob(text).sentiment.polarity
-        # spaCy for entity recognition (optional, for future use)
-        entities = []
-        if SPACY_AVAILABLE and nlp is not None:
-            doc = nlp(text)
-            entities = [(ent.text, ent.label_) for ent in doc.ents]
+        kw_count = matcher.count(text)
+        sentiment = score['sentiment']
+        entities = score['entities']
         # Simple source reliability check
         reliable = post.get('source', '') in ['reddit', 'twitter', 'twitter_stealth']
         # Flag if unreliable or low keyword density
@@ -582,6 +691,7 @@ def parse_and_validate_social_data(posts, keywords):
         valid_posts.append({
             **post,
             'keyword_count': kw_count,
+            'keyword_themes': matcher.themes(text),
             'sentiment': sentiment,
             'entities': entities,
             'reliable': reliable,
@@ -646,6 +756,10 @@ def main():
     else:
         game_datetime = datetime.now()
     posts = gather_social_media_data(keywords, game_datetime)
+    # The same story is syndicated across sites; score and count it once
+    unique_posts = collapse_near_duplicates(posts)
+    print(f"[INFO] Collapsed {len(posts)} posts into {len(unique_posts)} distinct stories.")
+    posts = unique_posts
     valid_posts = parse_and_validate_social_data(posts, keywords)
     sentiment = fetch_social_media_sentiment(teams, valid_posts)
     injuries = fetch_injury_reports()
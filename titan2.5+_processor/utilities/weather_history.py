@@ -0,0 +1,204 @@
+"""
+Hourly match-day weather for every fixture, past and upcoming.
+
+Fixtures are grouped by venue and by runs of nearby match days, and each
+group is fetched with a single hourly Open-Meteo request: the archive
+endpoint for history (fetched once, it never changes) and the BoM forecast
+endpoint for recent and upcoming days. Hours are stored in a local SQLite
+cache keyed by (venue, UTC hour), so only days not yet cached are
+requested, and fixtures are joined to the nearest cached hour with
+``pandas.merge_asof``. All times are UTC.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+try:
+    from utilities.http_cache import cached_get
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from http_cache import cached_get
+
+FORECAST_URL = "https://api.open-meteo.com/v1/bom"
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+
+# Open-Meteo hourly variable -> output column
+WEATHER_COLUMNS = {
+    "temperature_2m": "temperature_C",
+    "precipitation": "precipitation_mm",
+    "wind_speed_10m": "wind_speed_kmh",
+    "wind_direction_10m": "wind_direction_deg",
+    "relative_humidity_2m": "humidity_percent",
+}
+
+# The archive lags real time by a few days; newer days come from the forecast endpoint
+ARCHIVE_LAG_DAYS = 5
+# Upcoming fixtures further ahead than this have no forecast yet
+FORECAST_DAYS = 7
+# Seconds before cached forecast hours are fetched again (archive hours never are)
+FORECAST_TTL = 60 * 60
+# Match days closer than this share one request per venue (splits requests at the off-season)
+MAX_GAP_DAYS = 60
+WEATHER_WORKERS = 4
+
+DEFAULT_CACHE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'weather', 'hourly_weather.sqlite'))
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS hourly (
+    venue TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    {', '.join(f'{column} REAL' for column in WEATHER_COLUMNS.values())},
+    source TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (venue, hour)
+);
+"""
+
+
+class HourlyWeatherCache:
+    """SQLite store of hourly weather keyed by (venue, UTC hour as a unix timestamp)."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def covered_days(self, venue):
+        """Dates with all 24 hours cached for ``venue`` (archive hours, or forecast hours still fresh)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT date(hour, 'unixepoch') AS day FROM hourly "
+                "WHERE venue = ? AND (source = 'archive' OR fetched_at > ?) GROUP BY day HAVING COUNT(*) = 24",
+                (venue, time.time() - FORECAST_TTL)
+            ).fetchall()
+        return {datetime.strptime(day, "%Y-%m-%d").date() for (day,) in rows}
+
+    def store(self, venue, hourly, source):
+        """Store an Open-Meteo ``hourly`` block (times in UTC)."""
+        now = time.time()
+        hours = [int(datetime.fromisoformat(t).replace(tzinfo=timezone.utc).timestamp()) for t in hourly["time"]]
+        values = [hourly.get(variable, [None] * len(hours)) for variable in WEATHER_COLUMNS]
+        rows = [(venue, hour, *(column[i] for column in values), source, now) for i, hour in enumerate(hours)]
+        with self._lock, self._db:
+            self._db.executemany(f"INSERT OR REPLACE INTO hourly VALUES ({', '.join('?' * (len(WEATHER_COLUMNS) + 4))})", rows)
+
+    def frame(self, venues):
+        """Cached hours for ``venues`` as a DataFrame with ``Venue``, ``time`` (UTC) and the weather columns."""
+        venues = list(venues)
+        columns = ", ".join(WEATHER_COLUMNS.values())
+        with self._lock:
+            hourly = pd.read_sql_query(
+                f"SELECT venue AS Venue, hour, {columns} FROM hourly WHERE venue IN ({','.join('?' * len(venues))})",
+                self._db, params=venues
+            )
+        hourly["time"] = pd.to_datetime(hourly.pop("hour"), unit="s", utc=True).astype("datetime64[ns, UTC]")
+        return hourly
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _day_runs(days):
+    """Split sorted dates into (start, end) runs with gaps of at most ``MAX_GAP_DAYS``."""
+    runs = []
+    for day in sorted(days):
+        if runs and (day - runs[-1][1]).days <= MAX_GAP_DAYS:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return [tuple(run) for run in runs]
+
+
+def plan_requests(venue_days, cache, today=None):
+    """
+    One request per (venue, endpoint, run of match days) for the days not cached yet.
+
+    :param venue_days: dict of venue -> set of UTC match dates
+    :return: list of (venue, url, source, start date, end date)
+    """
+    today = today or datetime.now(timezone.utc).date()
+    archive_until = today - timedelta(days=ARCHIVE_LAG_DAYS)
+    plan = []
+    for venue, days in venue_days.items():
+        missing = set(days) - cache.covered_days(venue)
+        archived = {day for day in missing if day <= archive_until}
+        forecast = {day for day in missing if archive_until < day <= today + timedelta(days=FORECAST_DAYS)}
+        for url, source, group in ((ARCHIVE_URL, "archive", archived), (FORECAST_URL, "forecast", forecast)):
+            plan += [(venue, url, source, start, end) for start, end in _day_runs(group)]
+    return plan
+
+
+def fetch_weather(venue_days, coords, cache=None):
+    """
+    Fetch and cache the hourly weather for every (venue, date) not cached yet.
+
+    :param venue_days: dict of venue -> set of UTC match dates
+    :param coords: dict of venue -> (latitude, longitude)
+    """
+    cache = cache or HourlyWeatherCache()
+    plan = plan_requests(venue_days, cache)
+    print(f"[INFO] Fetching hourly weather with {len(plan)} requests for {len(venue_days)} venues.")
+
+    def fetch(request):
+        venue, url, source, start, end = request
+        latitude, longitude = coords[venue]
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "hourly": ",".join(WEATHER_COLUMNS),
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "timezone": "GMT",
+        }
+        try:
+            response = cached_get(url, params=params, permanent=source == "archive")
+            response.raise_for_status()
+            cache.store(venue, response.json()["hourly"], source)
+        except Exception as e:
+            print(f"[WARN] Weather fetch failed for {venue} {start} to {end}: {e}")
+
+    with ThreadPoolExecutor(max_workers=WEATHER_WORKERS) as executor:
+        list(executor.map(fetch, plan))
+    return cache
+
+
+def attach_weather(df, coords, kickoff_column="Date", venue_column="Venue", cache=None):
+    """
+    Add the weather columns to ``df`` from the hour nearest each kickoff.
+
+    Fixtures at venues without coordinates, with unparseable kickoffs or
+    beyond the forecast horizon get missing values.
+    """
+    df = df.copy()
+    kickoff = pd.to_datetime(df[kickoff_column], utc=True, errors="coerce")
+    horizon = pd.Timestamp.now(tz="UTC") + pd.Timedelta(days=FORECAST_DAYS)
+    known = kickoff.notna() & df[venue_column].isin(list(coords)) & (kickoff <= horizon)
+    matches = pd.DataFrame({"Venue": df.loc[known, venue_column], "kickoff": kickoff[known].astype("datetime64[ns, UTC]")})
+    for column in WEATHER_COLUMNS.values():
+        df[column] = float("nan")
+    if matches.empty:
+        return df
+
+    # The nearest hour of a late kickoff can fall on the next day
+    matches["day"] = matches["kickoff"].dt.round("h").dt.date
+    venue_days = matches.groupby("Venue")["day"].agg(set).to_dict()
+    cache = fetch_weather(venue_days, coords, cache)
+    hourly = cache.frame(venue_days).sort_values("time")
+
+    joined = pd.merge_asof(
+        matches.reset_index().sort_values("kickoff"), hourly,
+        left_on="kickoff", right_on="time", by="Venue", direction="nearest", tolerance=pd.Timedelta(minutes=30)
+    ).set_index("index")
+    df.loc[joined.index, list(WEATHER_COLUMNS.values())] = joined[list(WEATHER_COLUMNS.values())]
+    logging.info(f"Weather attached to {joined['temperature_C'].notna().sum()} of {len(df)} fixtures.")
+    return df
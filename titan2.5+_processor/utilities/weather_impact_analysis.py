@@ -1,11 +1,21 @@
 """
 Match and Weather Impact on Performance
 - Fetches comprehensive weather data from Open-Meteo BoM API and analyzes impact on match outcomes
+- Past fixtures are backfilled from the Open-Meteo archive (see weather_history)
 """
 import pandas as pd
-import requests
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
+try:
+    from utilities.http_cache import cached_get
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from http_cache import cached_get
+try:
+    from utilities.weather_history import attach_weather, WEATHER_COLUMNS
+except ImportError:
+    # Run directly as a script from the utilities folder
+    from weather_history import attach_weather, WEATHER_COLUMNS
 
 # Stadium coordinates mapping (add more as needed)
 STADIUM_COORDS = {
@@ -58,7 +68,12 @@ STADIUM_COORDS = {
     "Pratten Park (Sydney)": (-33.8894, 151.1389),
     "North Sydney Oval (Sydney)": (-33.8320, 151.2090),
     "Santos National Stadium (Port Moresby, PNG)": (-9.4438, 147.1803),
-    "HBF Park (Perth)": (-31.9439, 115.8605)
+    "HBF Park (Perth)": (-31.9439, 115.8605),
+    # Names used for the same grounds in the NRL.com draw data
+    "Go Media Stadium": (-36.8925, 174.7740),
+    "Industree Group Stadium": (-33.4333, 151.3422),
+    "Campbelltown Sports Stadium": (-34.0625, 150.8322),
+    "Sydney Cricket Ground": (-33.8917, 151.2247)
 }
 
 def get_nrl_game_weather(latitude, longitude, kickoff_time_iso, timezone="Australia/Sydney"):
@@ -74,10 +89,10 @@ def get_nrl_game_weather(latitude, longitude, kickoff_time_iso, timezone="Austra
     params = {
         "latitude": latitude,
         "longitude": longitude,
-        "hourly": "temperature_2m,precipitation,wind_speed_10m,wind_direction_10m,humidity_2m",
+        "hourly": "temperature_2m,precipitation,wind_speed_10m,wind_direction_10m,relative_humidity_2m",
         "timezone": timezone
     }
-    response = requests.get(url, params=params)
+    response = cached_get(url, params=params)
     response.raise_for_status()
     data = response.json()
     kickoff_hour = datetime.fromisoformat(kickoff_time_iso).strftime("%Y-%m-%dT%H:00")
@@ -88,7 +103,7 @@ def get_nrl_game_weather(latitude, longitude, kickoff_time_iso, timezone="Austra
             "precipitation_mm": data["hourly"]["precipitation"][index],
             "wind_speed_kmh": data["hourly"]["wind_speed_10m"][index],
             "wind_direction_deg": data["hourly"]["wind_direction_10m"][index],
-            "humidity_percent": data["hourly"]["humidity_2m"][index]
+            "humidity_percent": data["hourly"]["relative_humidity_2m"][index]
         }
     except ValueError:
         return {
@@ -106,40 +121,10 @@ def main():
     match_file = os.path.join(outputs_dir, 'all_matches_2019_2025.csv')
     output_file = os.path.join(outputs_dir, 'weather_impact_analysis.csv')
     df = pd.read_csv(match_file)
-    # Prepare columns for weather data
-    df['temperature_C'] = None
-    df['precipitation_mm'] = None
-    df['wind_speed_kmh'] = None
-    df['wind_direction_deg'] = None
-    df['humidity_percent'] = None
-    for idx, row in df.iterrows():
-        venue = row.get('Venue', None)
-        kickoff_time = row.get('Date', None)
-        if pd.isna(venue) or pd.isna(kickoff_time):
-            continue
-        coords = STADIUM_COORDS.get(venue)
-        if not coords:
-            continue
-        # Only fetch weather for matches within the next 7 days
-        try:
-            kickoff_dt = datetime.fromisoformat(kickoff_time.replace('Z', ''))
-            now = datetime.now()
-            if kickoff_dt.date() < now.date() or kickoff_dt > now + timedelta(days=7):
-                continue  # Skip past matches and those more than 7 days ahead
-        except Exception as e:
-            print(f"[WARN] Could not parse kickoff time '{kickoff_time}': {e}")
-            continue
-        try:
-            weather = get_nrl_game_weather(coords[0], coords[1], kickoff_time)
-            df.at[idx, 'temperature_C'] = weather['temperature_C']
-            df.at[idx, 'precipitation_mm'] = weather['precipitation_mm']
-            df.at[idx, 'wind_speed_kmh'] = weather['wind_speed_kmh']
-            df.at[idx, 'wind_direction_deg'] = weather['wind_direction_deg']
-            df.at[idx, 'humidity_percent'] = weather['humidity_percent']
-        except Exception as e:
-            print(f"[WARN] Weather fetch failed for {venue} at {kickoff_time}: {e}")
-    if df[['temperature_C', 'precipitation_mm', 'wind_speed_kmh', 'wind_direction_deg', 'humidity_percent']].isnull().all().all():
-        print("[WARN] No weather data fetched. No matches found in the next 7 days or API returned no data.")
+    # One hourly request per venue and run of match days, joined on the nearest hour
+    df = attach_weather(df, STADIUM_COORDS)
+    if df[list(WEATHER_COLUMNS.values())].isnull().all().all():
+        print("[WARN] No weather data fetched. No matches at known venues or API returned no data.")
     df.to_csv(output_file, index=False)
     print(f"[SUCCESS] Weather impact analysis saved to {output_file}")
 